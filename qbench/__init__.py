@@ -6,10 +6,18 @@ __email__ = "nwilliams@smithers.com"
 __description__ = "Python SDK for QBench LIMS API"
 
 from .api import QBenchAPI
+from .auth import TokenStore
+from .cache import DiskCache, ResponseCache
+from .circuit import CircuitBreaker
+from .pagination import AdaptivePageSize, PaginationCheckpoint
+from .retry import RetryPolicy
+from .throttle import AdaptiveConcurrency, TokenBucket
 from .exceptions import (
     QBenchAPIError, 
     QBenchAuthError, 
+    QBenchCircuitOpenError,
     QBenchConnectionError,
+    QBenchPaginationError,
     QBenchTimeoutError,
     QBenchValidationError
 )
@@ -42,9 +50,20 @@ def connect(base_url: str, api_key: str, api_secret: str, **kwargs) -> QBenchAPI
 # Export the main classes and functions
 __all__ = [
     "QBenchAPI",
+    "AdaptivePageSize",
+    "PaginationCheckpoint",
+    "ResponseCache",
+    "DiskCache",
+    "TokenStore",
+    "TokenBucket",
+    "AdaptiveConcurrency",
+    "RetryPolicy",
+    "CircuitBreaker",
     "QBenchAPIError", 
     "QBenchAuthError",
+    "QBenchCircuitOpenError",
     "QBenchConnectionError",
+    "QBenchPaginationError",
     "QBenchTimeoutError",
     "QBenchValidationError",
     "connect",
@@ -3,23 +3,116 @@
 import requests
 import aiohttp
 import asyncio
+import contextlib
+import contextvars
+import copy
+import functools
+import json
 import logging
+import multiprocessing
+import os
+import threading
 import time
-from typing import Optional, Dict, Any, Union, List
-from tenacity import retry, wait_exponential, stop_after_attempt, RetryError, retry_if_exception_type
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    Optional, Dict, Any, Union, List, AsyncIterator, Iterator, Deque, Tuple, 
+    Awaitable, Callable, cast
+)
 
-from .auth import QBenchAuth
+from .auth import QBenchAuth, TokenStore
+from .cache import CacheKey, DiskCache, ResponseCache
+from .circuit import CircuitBreaker
 from .exceptions import (
     QBenchAPIError, 
     QBenchConnectionError, 
     QBenchValidationError,
-    QBenchTimeoutError
+    QBenchTimeoutError,
+    QBenchPaginationError
 )
 from .endpoints import QBENCH_ENDPOINTS
+from .retry import RETRY_STATUS_CODES, RetryPolicy, parse_retry_after
+from .throttle import AdaptiveConcurrency, TokenBucket
+from .pagination import (
+    AdaptivePageSize, PaginationCheckpoint, split_id_range, split_page_range
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Page size used when neither the client nor the call sets one
+DEFAULT_PAGE_SIZE = 50
+
+# Longest URL get_many builds; proxies and servers commonly reject beyond ~2KB
+MAX_URL_LENGTH = 2000
+
+# Most IDs requested in one get_many chunk, whatever their length
+MAX_IDS_PER_REQUEST = 200
+
+
+# Retry policy overriding the client's for the call in progress (per task)
+_retry_override: contextvars.ContextVar[Optional[RetryPolicy]] = contextvars.ContextVar(
+    'qbench_retry_override', default=None
+)
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    """Return True for errors a retry of the same read may get past."""
+    if isinstance(exc, (QBenchTimeoutError, QBenchConnectionError)):
+        return True
+    return isinstance(exc, QBenchAPIError) and exc.status_code in RETRY_STATUS_CODES
+
+
+def _scan_shard(
+    client_config: Dict[str, Any], 
+    endpoint_key: str, 
+    use_v1: bool, 
+    path_params: Dict[str, Any], 
+    shard: Dict[str, Any], 
+    params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Fetch one shard of a partitioned scan; runs inside a worker process.
+    
+    The worker builds its own client, so it gets its own event loop,
+    connections and JSON decoding core.
+    
+    Args:
+        client_config: Keyword arguments to build the worker's QBenchAPI
+        endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+        use_v1: Whether to use v1 API
+        path_params: Parameters for URL formatting
+        shard: Shard description from `QBenchAPI._plan_shards`
+        params: Query parameters of the scan
+        
+    Returns:
+        List of the shard's entities
+    """
+    client = QBenchAPI(**client_config)
+    try:
+        checkpoint = None
+        if shard.get('checkpoint'):
+            checkpoint = PaginationCheckpoint.from_dict(shard['checkpoint'])
+        entities = cast(List[Dict[str, Any]], client._run_sync(client._get_entity_list(
+            endpoint_key, 
+            use_v1=use_v1, 
+            path_params=path_params, 
+            checkpoint=checkpoint,
+            **{**params, **shard.get('params', {})}
+        )))
+    finally:
+        client.close()
+
+    low, high = shard.get('id_bounds') or (None, None)
+    if low is None and high is None:
+        return entities
+    # Neighbouring shards overlap on their boundary ID; keep it in one only
+    return [
+        entity for entity in entities 
+        if (low is None or int(entity['id']) >= low) 
+        and (high is None or int(entity['id']) < high)
+    ]
+
 
 class QBenchAPI:
     """
@@ -34,8 +127,18 @@ class QBenchAPI:
         base_url: str, 
         api_key: str, 
         api_secret: str, 
-        concurrency_limit: int = 10,
-        timeout: int = 30
+        concurrency_limit: Union[int, str, AdaptiveConcurrency] = 10,
+        timeout: int = 30,
+        page_size: Union[int, str, AdaptivePageSize] = DEFAULT_PAGE_SIZE,
+        cache: Union[bool, ResponseCache, None] = None,
+        disk_cache: Union[str, DiskCache, None] = None,
+        coalesce: bool = True,
+        token_store: Union[str, TokenStore, None] = None,
+        auto_refresh: bool = False,
+        lazy_auth: bool = False,
+        rate_limit: Union[float, TokenBucket, None] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Union[bool, CircuitBreaker, None] = None
     ):
         """
         Initialize the QBenchAPI instance with authentication and base URLs.
@@ -44,290 +147,2243 @@ class QBenchAPI:
             base_url (str): The base URL of the QBench API.
             api_key (str): API key for authentication.
             api_secret (str): API secret for authentication.
-            concurrency_limit (int): Maximum number of concurrent requests.
+            concurrency_limit (int | str | AdaptiveConcurrency): Maximum number
+                of concurrent async requests. "auto" (or an AdaptiveConcurrency
+                instance) adjusts the limit while running: it grows while
+                latency is healthy and shrinks on 429s, 5xx responses,
+                timeouts and latency spikes. The adaptive limit gates async
+                requests only; sync calls are sent one at a time by their
+                caller's thread and bypass it. The aiohttp connection pool
+                and pagination windows are then sized to its ``max_limit``
+                so the limit has room to grow.
             timeout (int): Request timeout in seconds.
+            page_size (int | str | AdaptivePageSize): Entities per page for
+                paginated endpoints. "auto" (or an AdaptivePageSize instance)
+                probes the largest size the server accepts and tunes it from
+                observed page latency and payload size.
+            cache (bool | ResponseCache): Cache GET responses in memory.
+                True uses a ResponseCache with default TTL and size; pass
+                an instance to set per-endpoint TTLs.
+            disk_cache (str | DiskCache): Keep complete paginated results in
+                a SQLite file shared across processes, revalidated with
+                ``last_updated`` delta queries. A path uses a DiskCache that
+                caches every paginated endpoint.
+            coalesce (bool): Share one request between identical GETs that
+                are in flight at the same time on the same event loop.
+            token_store (str | TokenStore): Share access tokens with other
+                processes on this host through a SQLite file, so each token
+                is minted once rather than by every process.
+            auto_refresh (bool): Refresh the access token on a background
+                thread shortly before it expires, so no request waits for one.
+            lazy_auth (bool): Don't authenticate until the first request (or
+                `warmup`), so constructing the client costs no round trip.
+            rate_limit (float | TokenBucket): Most requests per second sent
+                by this client, sync and async alike. Pass a TokenBucket to
+                set the burst size or share one quota between clients.
+            retry_policy (RetryPolicy): When to retry failed requests. The
+                default retries timeouts, connection errors, 429 and 5xx
+                responses of idempotent methods up to 5 attempts, honouring
+                Retry-After. Calls can override it with ``retry=``.
+            circuit_breaker (bool | CircuitBreaker): Fail fast with
+                QBenchCircuitOpenError while the instance keeps failing
+                (timeouts, connection errors, 5xx), probing it again after a
+                recovery timeout. True uses one circuit for the instance;
+                pass a CircuitBreaker to tune it, keep circuits per endpoint
+                group or share it between clients.
             
         Raises:
-            QBenchAuthError: If authentication fails
+            QBenchAuthError: If authentication fails (unless lazy_auth)
+            QBenchValidationError: If concurrency_limit or page_size is not
+                an int, "auto" or an adaptive instance
         """
-        self._auth = QBenchAuth(base_url, api_key, api_secret)
+        self._auth = QBenchAuth(
+            base_url, api_key, api_secret, 
+            token_store=token_store, 
+            auto_refresh=auto_refresh,
+            lazy=lazy_auth
+        )
         self._base_url = f"{base_url.rstrip('/')}/qbench/api/v2"
         self._base_url_v1 = f"{base_url.rstrip('/')}/qbench/api/v1"
+        self._concurrency: Optional[AdaptiveConcurrency] = None
+        if isinstance(concurrency_limit, AdaptiveConcurrency):
+            self._concurrency = concurrency_limit
+        elif concurrency_limit == "auto":
+            self._concurrency = AdaptiveConcurrency()
+        if self._concurrency is not None:
+            # Windows and connection pools must leave the adaptive limit room to grow
+            concurrency_limit = self._concurrency.max_limit
+        elif not isinstance(concurrency_limit, int):
+            raise QBenchValidationError(
+                f"concurrency_limit must be an int, 'auto' or an AdaptiveConcurrency, "
+                f"got {concurrency_limit!r}"
+            )
         self._concurrency_limit = concurrency_limit
         self._timeout = timeout
+        self._page_tuner: Optional[AdaptivePageSize] = None
+        # Tunes calls passing page_size="auto" to a client with a fixed size
+        self._call_page_tuner: Optional[AdaptivePageSize] = None
+        if isinstance(page_size, AdaptivePageSize):
+            self._page_tuner = page_size
+            page_size = page_size.initial_size
+        elif page_size == "auto":
+            self._page_tuner = AdaptivePageSize()
+            page_size = self._page_tuner.initial_size
+        elif not isinstance(page_size, int) or page_size < 1:
+            raise QBenchValidationError(
+                f"page_size must be a positive integer or 'auto', got {page_size!r}"
+            )
+        self._page_size = page_size
+        if cache is True:
+            cache = ResponseCache()
+        self._cache = cache if isinstance(cache, ResponseCache) else None
+        # A DiskCache passed in may be shared, so only one opened here is closed here
+        self._owns_disk_cache = isinstance(disk_cache, str)
+        if isinstance(disk_cache, str):
+            disk_cache = DiskCache(disk_cache)
+        self._disk_cache: Optional[DiskCache] = disk_cache
+        self._coalesce = coalesce
+        if rate_limit is not None and not isinstance(rate_limit, TokenBucket):
+            rate_limit = TokenBucket(rate_limit)
+        self._rate_limiter: Optional[TokenBucket] = rate_limit
+        self._retry_policy = retry_policy or RetryPolicy()
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+        self._circuit_breaker = (
+            circuit_breaker if isinstance(circuit_breaker, CircuitBreaker) else None
+        )
+        # Identical GETs in flight, keyed by event loop and request
+        self._in_flight: Dict[Tuple[Any, ...], List[Any]] = {}
+
+        # Enough to rebuild an equivalent client in a worker process
+        self._client_config = {
+            'base_url': base_url, 
+            'api_key': api_key, 
+            'api_secret': api_secret, 
+            'concurrency_limit': (
+                "auto" if self._concurrency is not None else concurrency_limit
+            ), 
+            'timeout': timeout, 
+            'page_size': "auto" if self._page_tuner is not None else page_size,
+            'token_store': token_store,
+            'auto_refresh': auto_refresh,
+            'lazy_auth': lazy_auth,
+            'rate_limit': rate_limit.rate if rate_limit is not None else None,
+            'retry_policy': self._retry_policy,
+            'circuit_breaker': self._circuit_breaker
+        }
         
-        # Create reusable session with connection pooling
+        # Create reusable session with connection pooling; auth headers are
+        # set per request, so a lazy client makes no request here
         self._session = requests.Session()
-        self._session.headers.update(self._auth.get_headers())
         
         # Configure session for better performance
         adapter = requests.adapters.HTTPAdapter(
             pool_connections=10,
             pool_maxsize=20,
-            max_retries=0  # We handle retries with tenacity
+            max_retries=0  # We handle retries with RetryPolicy
         )
         self._session.mount("http://", adapter)
         self._session.mount("https://", adapter)
+
+        # Shared aiohttp sessions for async requests, opened lazily per event loop
+        self._async_sessions: Dict[
+            asyncio.AbstractEventLoop, aiohttp.ClientSession
+        ] = {}
+
+        # Long-lived event loop backing the synchronous facade, started lazily
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        
+        logger.info(f"QBench API client initialized for {base_url}")
+
+    def __del__(self):
+        """Clean up session on deletion."""
+        try:
+            self._stop_background_loop()
+        except Exception:
+            pass
+        if hasattr(self, '_auth'):
+            self._auth.close()
+        if hasattr(self, '_session'):
+            self._session.close()
+
+    def __enter__(self) -> "QBenchAPI":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "QBenchAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _get_async_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared aiohttp session, opening it on first use.
+        
+        The session (and its connection pool) is reused across calls so that
+        back-to-back list requests keep their connections alive. An aiohttp
+        session is bound to the event loop it was created on, so one session
+        is kept per loop.
+        
+        Returns:
+            aiohttp.ClientSession: The shared session for the running loop
+        """
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is not None and not session.closed:
+            return session
+
+        # Forget sessions whose loop has already gone away
+        stale_loops = [
+            loop_ for loop_ in list(self._async_sessions) if loop_.is_closed()
+        ]
+        for stale_loop in stale_loops:
+            self._async_sessions.pop(stale_loop, None)
+
+        connector = aiohttp.TCPConnector(limit=self._concurrency_limit)
+        timeout = aiohttp.ClientTimeout(total=self._timeout)
+        session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._async_sessions[loop] = session
+        return session
+
+    async def _close_async_session(self) -> None:
+        """Close the running loop's aiohttp session if one is open."""
+        session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+            logger.debug("QBench API async session closed")
+
+    def _get_background_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Return the event loop backing the synchronous facade.
+
+        The loop runs forever in a daemon thread so that sync calls don't pay
+        for creating an event loop (and aiohttp session) on every call.
+        """
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._run_background_loop, 
+                    args=(loop,), 
+                    name="qbench-event-loop", 
+                    daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                self._loop_thread = thread
+            return self._loop
+
+    @staticmethod
+    def _run_background_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def _run_sync(self, coro: Any) -> Any:
+        """
+        Run a coroutine on the background loop and block until it finishes.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_background_loop())
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. KeyboardInterrupt while waiting; don't leave it running
+            future.cancel()
+            raise
+
+    def _stop_background_loop(self) -> None:
+        """Close the background loop's session, stop the loop and join its thread."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = None
+            self._loop_thread = None
+        if loop is None or loop.is_closed():
+            return
+
+        session = self._async_sessions.pop(loop, None)
+        if thread is threading.current_thread():
+            # Closing from inside the loop; let it wind down on its own
+            if session is not None and not session.closed:
+                loop.create_task(session.close())
+            loop.call_soon(loop.stop)
+            return
+
+        if session is not None and not session.closed:
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    session.close(), loop
+                ).result(self._timeout)
+            except Exception as e:
+                logger.debug(f"Error closing background async session: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(self._timeout)
+            if thread.is_alive():
+                return
+        loop.close()
+
+    def _build_url(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool = False, 
+        path_params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Resolve an endpoint key to a full request URL.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            use_v1 (bool): If True, use the v1 API. Else use v2.
+            path_params (dict, optional): Parameters to replace in the endpoint
+
+        Returns:
+            str: The full URL for the endpoint.
+            
+        Raises:
+            QBenchValidationError: For invalid endpoint or parameters
+        """
+        if endpoint_key not in QBENCH_ENDPOINTS:
+            raise QBenchValidationError(f"Invalid API endpoint: {endpoint_key}")
+        
+        # Default to v2 unless explicitly set
+        version = "v1" if use_v1 else "v2"
+        base_url = self._base_url_v1 if use_v1 else self._base_url
+
+        # Get the correct endpoint format
+        endpoint = QBENCH_ENDPOINTS[endpoint_key].get(version)
+        if not endpoint:
+            raise QBenchValidationError(
+                f"Endpoint '{endpoint_key}' does not exist in version {version}"
+            )
+
+        # Format endpoint with path parameters if provided
+        if path_params:
+            try:
+                endpoint = endpoint.format(**path_params)
+            except KeyError as e:
+                raise QBenchValidationError(
+                    f"Missing required path parameter: {e}"
+                )
+
+        return f"{base_url}/{endpoint}"
+
+    @staticmethod
+    def _api_error(
+        method: str, 
+        url: str, 
+        status_code: Optional[int], 
+        error_data: Optional[Dict[str, Any]], 
+        reason: Any,
+        headers: Optional[Any] = None
+    ) -> QBenchAPIError:
+        """Map a failed HTTP response to a QBenchAPIError."""
+        retry_after = parse_retry_after(headers.get('Retry-After')) if headers else None
+        if status_code == 404:
+            return QBenchAPIError("Resource not found", status_code, error_data)
+        elif status_code == 429:
+            return QBenchAPIError(
+                "Rate limit exceeded", status_code, error_data, retry_after
+            )
+        return QBenchAPIError(
+            f"API request failed: {method.upper()} {url} - {reason}",
+            status_code, 
+            error_data,
+            retry_after
+        )
+
+    def _retry_policy_for(
+        self, 
+        override: Union[RetryPolicy, int, bool, None] = None
+    ) -> RetryPolicy:
+        """
+        Return the retry policy of a request.
+        
+        Args:
+            override: Per-call override (see `RetryPolicy.resolve`); without
+                one, the override of the dynamic method call in progress
+                applies, else the client's policy
+        """
+        if override is not None:
+            return self._retry_policy.resolve(override)
+        return _retry_override.get() or self._retry_policy
+
+    @staticmethod
+    def _encode_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Encode query parameters for both the sync and the async session.
+
+        ``None`` values are dropped and booleans are sent as ``True`` and
+        ``False``, as requests has always sent them; aiohttp would reject
+        both, so the two paths send the same query string.
+        """
+        if not params:
+            return {}
+        encoded = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = str(value)
+            encoded[key] = value
+        return encoded
+
+    def _make_request(
+        self, 
+        method: str, 
+        endpoint_key: str, 
+        use_v1: bool = False,
+        params: Optional[Dict[str, Any]] = None, 
+        data: Optional[Dict[str, Any]] = None,
+        path_params: Optional[Dict[str, Any]] = None,
+        retry: Union[RetryPolicy, int, bool, None] = None
+    ) -> Dict[str, Any]:
+        """
+        Make a synchronous request to the QBench API with retry logic.
+
+        Args:
+            method (str): HTTP method ('GET', 'POST', etc.).
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            use_v1 (bool): If True, use the v1 API. Else use v2.
+            params (dict, optional): URL parameters for the request.
+            data (dict, optional): JSON payload for the request.
+            path_params (dict, optional): Parameters to replace in the endpoint
+            retry (RetryPolicy | int | bool, optional): Per-call retry override
+
+        Returns:
+            dict: JSON response from the API.
+            
+        Raises:
+            QBenchValidationError: For invalid endpoint or parameters
+            QBenchAPIError: For API-related errors
+            QBenchConnectionError: For connection issues
+        """
+        url = self._build_url(endpoint_key, use_v1, path_params)
+        retrying = self._retry_policy_for(retry).retrying(
+            method, f"{method.upper()} {url}"
+        )
+
+        def attempt() -> Dict[str, Any]:
+            with self._circuit_guard(url):
+                return self._send_request(method, url, params, data)
+
+        return retrying(attempt)
+
+    def _send_request(
+        self, 
+        method: str, 
+        url: str, 
+        params: Optional[Dict[str, Any]], 
+        data: Optional[Dict[str, Any]],
+        retry_auth: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Make one attempt of a `_make_request` request.
+        
+        A 401 refreshes the token (concurrent 401s share one refresh of the
+        rejected token) and, unless ``retry_auth`` is False, repeats the
+        request once with the new token.
+        """
+        # Refresh auth headers if needed
+        access_token = self._auth.get_access_token()
+        self._session.headers.update(self._auth.bearer_headers(access_token))
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+
+        try:
+            logger.debug(f"Making {method} request to {url}")
+            response = self._session.request(
+                method, 
+                url, 
+                params=self._encode_params(params), 
+                json=data,
+                timeout=self._timeout
+            )
+            response.raise_for_status()
+            
+            # Handle empty responses
+            if response.status_code == 204:  # No Content
+                return {}
+                
+            try:
+                return cast(Dict[str, Any], response.json())
+            except ValueError:
+                # Response is not JSON
+                return {"status": "success", "data": response.text}
+                
+        except requests.exceptions.Timeout:
+            raise QBenchTimeoutError(f"Request timeout after {self._timeout} seconds")
+        except requests.exceptions.ConnectionError as e:
+            raise QBenchConnectionError(f"Connection error: {e}")
+        except requests.exceptions.HTTPError as e:
+            # A Response is falsy for error statuses, so compare against None
+            status_code = e.response.status_code if e.response is not None else None
+            try:
+                error_data = e.response.json() if e.response is not None else None
+            except ValueError:
+                error_data = None
+                
+            if status_code == 401:
+                if not retry_auth:
+                    raise QBenchAPIError(
+                        "Authentication failed", status_code, error_data
+                    )
+                try:
+                    self._auth.refresh(stale_token=access_token)
+                except Exception as refresh_error:
+                    raise QBenchAPIError(
+                        "Authentication failed", status_code, error_data
+                    ) from refresh_error
+                return self._send_request(method, url, params, data, retry_auth=False)
+            raise self._api_error(
+                method, url, status_code, error_data, e, 
+                e.response.headers if e.response is not None else None
+            )
+        except requests.exceptions.RequestException as e:
+            raise QBenchAPIError(f"Request failed: {e}")
+
+    async def _make_request_async(
+        self, 
+        method: str, 
+        endpoint_key: str, 
+        use_v1: bool = False,
+        params: Optional[Dict[str, Any]] = None, 
+        data: Optional[Dict[str, Any]] = None,
+        path_params: Optional[Dict[str, Any]] = None,
+        retry: Union[RetryPolicy, int, bool, None] = None
+    ) -> Dict[str, Any]:
+        """
+        Make an asynchronous request to the QBench API with retry logic.
+
+        Mirrors `_make_request` (same validation and error mapping) but runs
+        natively on the event loop over the shared aiohttp session, so many
+        concurrent calls don't need a thread each.
+
+        Args:
+            method (str): HTTP method ('GET', 'POST', etc.).
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            use_v1 (bool): If True, use the v1 API. Else use v2.
+            params (dict, optional): URL parameters for the request.
+            data (dict, optional): JSON payload for the request.
+            path_params (dict, optional): Parameters to replace in the endpoint
+            retry (RetryPolicy | int | bool, optional): Per-call retry override
+
+        Returns:
+            dict: JSON response from the API.
+            
+        Raises:
+            QBenchValidationError: For invalid endpoint or parameters
+            QBenchAPIError: For API-related errors
+            QBenchConnectionError: For connection issues
+        """
+        url = self._build_url(endpoint_key, use_v1, path_params)
+        retrying = self._retry_policy_for(retry).async_retrying(
+            method, f"{method.upper()} {url}"
+        )
+
+        async def attempt() -> Dict[str, Any]:
+            with self._circuit_guard(url):
+                return await self._send_request_async(method, url, params, data)
+
+        return await retrying(attempt)
+
+    async def _send_request_async(
+        self, 
+        method: str, 
+        url: str, 
+        params: Optional[Dict[str, Any]], 
+        data: Optional[Dict[str, Any]],
+        retry_auth: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Make one attempt of a `_make_request_async` request.
+        
+        A 401 refreshes the token (concurrent 401s share one refresh) and,
+        unless ``retry_auth`` is False, repeats the request once with it.
+        """
+        session = await self._get_async_session()
+        access_token = await self._auth.get_access_token_async(session)
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async()
+
+        async with self._request_slot():
+            try:
+                logger.debug(f"Making async {method} request to {url}")
+                async with session.request(
+                    method, 
+                    url, 
+                    params=self._encode_params(params), 
+                    json=data,
+                    headers=self._auth.bearer_headers(access_token)
+                ) as response:
+                    # Handle empty responses
+                    if response.status == 204:  # No Content
+                        return {}
+
+                    body = await response.read()
+                    
+                    if response.status >= 400:
+                        try:
+                            error_data = json.loads(body) if body else None
+                        except ValueError:
+                            error_data = None
+
+                        if response.status != 401:
+                            raise self._api_error(
+                                method, url, response.status, error_data, 
+                                response.reason, response.headers
+                            )
+                        if not retry_auth:
+                            raise QBenchAPIError(
+                                "Authentication failed", response.status, error_data
+                            )
+                        # Falls through to a retry, once this request's slot is free
+                    else:
+                        try:
+                            return cast(Dict[str, Any], json.loads(body))
+                        except ValueError:
+                            # Response is not JSON
+                            return {
+                                "status": "success", 
+                                "data": body.decode(errors='replace')
+                            }
+
+            except asyncio.TimeoutError:
+                raise QBenchTimeoutError(
+                    f"Request timeout after {self._timeout} seconds"
+                )
+            except aiohttp.ClientConnectionError as e:
+                raise QBenchConnectionError(f"Connection error: {e}")
+            except aiohttp.ClientError as e:
+                raise QBenchAPIError(f"Request failed: {e}")
+
+        # Only a 401 gets here
+        try:
+            await self._auth.refresh_async(access_token, session)
+        except Exception as refresh_error:
+            raise QBenchAPIError("Authentication failed", 401) from refresh_error
+        return await self._send_request_async(
+            method, url, params, data, retry_auth=False
+        )
+
+    async def _fetch_page(
+        self, 
+        session: aiohttp.ClientSession, 
+        url: str, 
+        page: int, 
+        params: Dict[str, Any],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        observe: Optional[Callable[[float, int], None]] = None,
+        retry: Union[RetryPolicy, int, bool, None] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch a single page of paginated data.
+        
+        Args:
+            session: aiohttp session
+            url: Base URL for the request
+            page: Page number to fetch
+            params: Additional URL parameters
+            page_size: Number of entities per page
+            observe: Optional callback receiving the page's latency in
+                seconds and its payload size in bytes
+            retry: Per-call retry override
+            
+        Returns:
+            Dict containing the page data
+        """
+        retrying = self._retry_policy_for(retry).async_retrying(
+            'GET', f"page {page} of {url}"
+        )
+
+        async def attempt() -> Dict[str, Any]:
+            with self._circuit_guard(url):
+                return await self._fetch_page_once(
+                    session, url, page, params, page_size, observe
+                )
+
+        return await retrying(attempt)
+
+    async def _fetch_page_once(
+        self, 
+        session: aiohttp.ClientSession, 
+        url: str, 
+        page: int, 
+        params: Dict[str, Any],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        observe: Optional[Callable[[float, int], None]] = None,
+        retry_auth: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Make one attempt of a `_fetch_page` request.
+        
+        A 401 is handled as in `_send_request_async`.
+        """
+        page_params = params.copy()
+        page_params.update({
+            'page_num': page,
+            'page_size': page_size
+        })
+        
+        access_token = await self._auth.get_access_token_async(session)
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async()
+        rejected = False
+        async with self._request_slot():
+            started = time.monotonic()
+            try:
+                async with session.get(
+                    url, 
+                    params=self._encode_params(page_params), 
+                    headers=self._auth.bearer_headers(access_token),
+                    timeout=self._timeout
+                ) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+            except asyncio.TimeoutError:
+                raise QBenchTimeoutError(f"Page {page} request timed out")
+            except aiohttp.ClientResponseError as e:
+                if e.status != 401 or not retry_auth:
+                    raise self._api_error(
+                        'GET', url, e.status, None, f"page {page}: {e.message}", 
+                        e.headers
+                    )
+                # Retried below, once this request's slot is free
+                rejected = True
+            except aiohttp.ClientError as e:
+                raise QBenchConnectionError(f"Error fetching page {page}: {e}")
+
+        if rejected:
+            try:
+                await self._auth.refresh_async(access_token, session)
+            except Exception as refresh_error:
+                raise QBenchAPIError(
+                    f"Authentication failed fetching page {page}", 401
+                ) from refresh_error
+            return await self._fetch_page_once(
+                session, url, page, params, page_size, observe, retry_auth=False
+            )
+
+        if observe is not None:
+            observe(time.monotonic() - started, len(body))
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            raise QBenchAPIError(f"Page {page} response is not valid JSON")
+        return data or {'data': []}
+
+    def _page_sizing(
+        self, 
+        page_size: Union[int, str, None]
+    ) -> Tuple[int, Optional[AdaptivePageSize]]:
+        """
+        Resolve a call-level page_size against the client's setting.
+        
+        Args:
+            page_size: An explicit size, "auto", or None for the client default
+            
+        A call-level "auto" on a client with a fixed size uses a tuner of
+        its own, shared by such calls only, so calls that leave page_size
+        unset keep the client's fixed size.
+        
+        Returns:
+            Tuple of the fixed page size and the tuner to use (None when fixed)
+        """
+        if page_size is None:
+            return self._page_size, self._page_tuner
+        if page_size == "auto":
+            if self._page_tuner is not None:
+                return self._page_size, self._page_tuner
+            if self._call_page_tuner is None:
+                self._call_page_tuner = AdaptivePageSize(initial_size=self._page_size)
+            return self._page_size, self._call_page_tuner
+        if isinstance(page_size, int) and page_size > 0:
+            return page_size, None
+        raise QBenchValidationError(
+            f"page_size must be a positive integer or 'auto', got {page_size!r}"
+        )
+
+    async def _fetch_page_limited(
+        self, 
+        limiter: Optional[asyncio.Semaphore], 
+        *args: Any,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Fetch a page, first taking a slot of a shared request budget if given.
+        
+        Args:
+            limiter: Semaphore shared by several scans, or None
+            *args: Arguments for `_fetch_page`
+            **kwargs: Keyword arguments for `_fetch_page`
+            
+        Returns:
+            Dict containing the page data
+        """
+        if limiter is None:
+            return await self._fetch_page(*args, **kwargs)
+        async with limiter:
+            return await self._fetch_page(*args, **kwargs)
+
+    async def _fetch_first_page(
+        self, 
+        session: aiohttp.ClientSession, 
+        url: str, 
+        endpoint_key: str, 
+        params: Dict[str, Any], 
+        page_size: int, 
+        tuner: Optional[AdaptivePageSize],
+        limiter: Optional[asyncio.Semaphore] = None,
+        retry: Union[RetryPolicy, int, bool, None] = None
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Fetch the first page of a scan, letting the tuner probe the page size.
+        
+        Args:
+            session: aiohttp session
+            url: Base URL for the request
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            params: Query parameters of the scan
+            page_size: Fixed page size, used when there is no tuner
+            tuner: Page size tuner, or None for a fixed size
+            limiter: Shared request budget to fetch under, if any
+            retry: Per-call retry override
+            
+        Returns:
+            Tuple of the first page and the page size the server honoured
+        """
+        if tuner is not None:
+            page_size = tuner.page_size(endpoint_key)
+
+        try:
+            page = await self._fetch_page_limited(
+                limiter, session, url, 1, params, page_size, retry=retry
+            )
+        except QBenchAPIError as e:
+            # The server may reject an oversized probe outright
+            if (
+                tuner is None 
+                or e.status_code not in (400, 422) 
+                or page_size <= tuner.initial_size
+            ):
+                raise
+            page_size = tuner.record_probe_rejected(endpoint_key)
+            page = await self._fetch_page_limited(
+                limiter, session, url, 1, params, page_size, retry=retry
+            )
+
+        if tuner is not None:
+            page_size = tuner.record_first_page(endpoint_key, page_size, page)
+        return page, page_size
+
+    async def _iter_pages(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool = False, 
+        page_limit: Optional[int] = None, 
+        path_params: Optional[Dict[str, Any]] = None, 
+        max_in_flight: Optional[int] = None,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        keyset: bool = False,
+        max_items: Optional[int] = None,
+        until: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        limiter: Optional[asyncio.Semaphore] = None,
+        retry: Union[RetryPolicy, int, bool, None] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield raw page responses of a paginated endpoint in page order.
+        
+        Page 1 is fetched first to learn ``total_pages``; later pages are
+        fetched concurrently through a sliding window of at most
+        ``max_in_flight`` requests. A page is only requested once there is
+        room in the window, so a slow consumer applies backpressure instead
+        of the whole result set piling up in memory. Pages still in flight
+        are cancelled if the consumer stops early.
+        
+        Each page is retried by `_fetch_page`; a page that still fails raises
+        QBenchPaginationError carrying the checkpoint, so the fetch can be
+        resumed without refetching completed pages.
+        
+        With ``max_items`` or ``until`` the scan stops as soon as either is
+        satisfied: the last page is cut short and pages still in flight are
+        cancelled. ``max_items`` also caps how many pages are requested at all.
+        
+        Args:
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            use_v1: Whether to use v1 API
+            page_limit: Maximum number of pages to fetch (None for all)
+            path_params: Parameters for URL formatting
+            max_in_flight: Max pages requested ahead of the consumer
+                (defaults to the client's concurrency limit)
+            checkpoint: Records completed pages; pass one from an earlier
+                failed fetch to resume it
+            keyset: Walk the collection by ID range instead of page number
+                (see `_iter_keyset_pages`)
+            max_items: Stop after this many entities
+            until: Stop after the first entity this returns True for; that
+                entity is included
+            limiter: Request budget shared with other scans (see `fan_out`);
+                ``max_in_flight`` still bounds this scan on its own
+            retry: Per-call retry override for the page requests
+            **kwargs: Additional query parameters. ``page_size`` may be an
+                int or "auto" and overrides the client's page size.
+            
+        Yields:
+            Dict containing each page's response
+            
+        Raises:
+            QBenchValidationError: If max_items is not a positive integer
+        """
+        url = self._build_url(endpoint_key, use_v1, path_params)
+        window = max(1, max_in_flight or self._concurrency_limit)
+        page_size, tuner = self._page_sizing(kwargs.pop('page_size', None))
+        if max_items is not None and (not isinstance(max_items, int) or max_items < 1):
+            raise QBenchValidationError(
+                f"max_items must be a positive integer, got {max_items!r}"
+            )
+
+        # Track progress even if the caller didn't ask to, so a failure can
+        # still be resumed from the checkpoint attached to the error
+        if checkpoint is None:
+            checkpoint = PaginationCheckpoint()
+        checkpoint.bind(
+            endpoint_key, 
+            {**(path_params or {}), **kwargs}, 
+            mode='keyset' if keyset else 'page'
+        )
+        
+        # Entities already collected by a resumed fetch count towards max_items
+        taken = len(checkpoint.entities())
+
+        def take(page: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+            """Cut a page short at max_items or until; report if satisfied."""
+            nonlocal taken
+            data = page.get('data') or []
+            stop = None
+            if until is not None:
+                stop = next(
+                    (index + 1 for index, entity in enumerate(data) if until(entity)), 
+                    None
+                )
+            if max_items is not None and taken + len(data[:stop]) >= max_items:
+                stop = max_items - taken
+            if stop is None:
+                taken += len(data)
+                return page, False
+            taken += len(data[:stop])
+            return {**page, 'data': data[:stop]}, True
+
+        # Reuse the client's pooled session so keep-alive connections survive
+        session = await self._get_async_session()
+
+        if keyset:
+            async for page in self._iter_keyset_pages(
+                session, url, endpoint_key, use_v1, page_limit, 
+                checkpoint, page_size, tuner, kwargs, take, limiter, retry
+            ):
+                yield page
+            return
+
+        observe_page = None
+        if checkpoint.started:
+            # Resuming: page offsets are only valid with the original size
+            page_size = checkpoint.page_size or page_size
+            logger.debug(f"Resuming {endpoint_key}: {checkpoint}")
+        else:
+            if tuner is None and max_items is not None:
+                # Don't transfer a full page to keep a handful of entities
+                page_size = min(page_size, max_items)
+
+            # Fetch first page to determine total pages
+            page_1_res, page_size = await self._fetch_first_page(
+                session, url, endpoint_key, kwargs, page_size, tuner, limiter, 
+                retry
+            )
+            if tuner is not None:
+                # Later pages must keep whatever size the server used for page 1
+                observe_page = functools.partial(tuner.observe, endpoint_key, page_size)
+
+            checkpoint.record_first_page(page_1_res, page_size)
+            page_1_res, done = take(page_1_res)
+            yield page_1_res
+            checkpoint.mark_done(1, page_1_res.get('data', []))
+            if done:
+                return
+
+        total_pages = checkpoint.total_pages or 1
+        pages_to_fetch = min(page_limit or total_pages, total_pages)
+        if max_items is not None:
+            pages_to_fetch = min(pages_to_fetch, -(-max_items // page_size))
+        remaining = deque(
+            page for page in range(1, pages_to_fetch + 1) 
+            if not checkpoint.is_done(page)
+        )
+        logger.debug(
+            f"Fetching {len(remaining)} more of {pages_to_fetch} pages "
+            f"for {endpoint_key}"
+        )
+
+        pending: Deque[Tuple[int, asyncio.Future[Dict[str, Any]]]] = deque()
+        try:
+            while remaining or pending:
+                # Top up the window before waiting on the oldest page
+                while remaining and len(pending) < window:
+                    next_page = remaining.popleft()
+                    pending.append((next_page, asyncio.ensure_future(
+                        self._fetch_page_limited(
+                            limiter, session, url, next_page, kwargs, page_size, 
+                            observe_page, retry
+                        )
+                    )))
+
+                page_num, task = pending.popleft()
+                try:
+                    result = await task
+                except Exception as e:
+                    raise QBenchPaginationError(
+                        f"Failed to fetch page {page_num} of {pages_to_fetch} "
+                        f"for {endpoint_key}: {e}", 
+                        checkpoint
+                    ) from e
+                result, done = take(result)
+                yield result
+                checkpoint.mark_done(page_num, result.get('data', []))
+                if done:
+                    return
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _iter_keyset_pages(
+        self, 
+        session: aiohttp.ClientSession, 
+        url: str, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        page_limit: Optional[int], 
+        checkpoint: PaginationCheckpoint, 
+        page_size: int, 
+        tuner: Optional[AdaptivePageSize], 
+        params: Dict[str, Any],
+        take: Optional[Callable[[Dict[str, Any]], Tuple[Dict[str, Any], bool]]] = None,
+        limiter: Optional[asyncio.Semaphore] = None,
+        retry: Union[RetryPolicy, int, bool, None] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield pages of an endpoint by walking its ID range in ascending order.
+        
+        Every request asks for page 1 of ``sort_by=id`` with the range start
+        moved up to the last ID seen, so the server never has to skip over an
+        offset and rows inserted during the scan cannot shift later pages.
+        The range start is sent inclusively and rows up to the last ID are
+        dropped client-side, so no row is returned twice or skipped whether
+        the server treats the bound as inclusive or exclusive.
+        
+        Pages are fetched one after another, since each request depends on
+        the previous one. A caller-supplied range start or end bounds the scan.
+        
+        Args:
+            session: aiohttp session
+            url: Base URL for the request
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            use_v1: Whether to use v1 API
+            page_limit: Maximum number of pages to fetch (None for all)
+            checkpoint: Records the last ID seen so the scan can be resumed
+            page_size: Fixed page size, used when there is no tuner
+            tuner: Page size tuner, or None for a fixed size
+            params: Additional query parameters
+            take: Cuts a page short and reports whether to stop the scan
+            limiter: Shared request budget to fetch under, if any
+            retry: Per-call retry override for the page requests
+            
+        Yields:
+            Dict containing each page's response, without repeated rows
+            
+        Raises:
+            QBenchValidationError: If the endpoint has no ID range filter on
+                its own ID, or the caller asked for another sort order
+        """
+        config = QBENCH_ENDPOINTS[endpoint_key]
+        prefix = config.get('id_range')
+        if use_v1 or not prefix or config.get('id_range_field', 'id') != 'id':
+            raise QBenchValidationError(
+                f"Endpoint '{endpoint_key}' does not support keyset pagination"
+            )
+        if 'sort_by' in params or 'sort_order' in params:
+            raise QBenchValidationError(
+                "Keyset pagination sorts by id; sort_by and sort_order cannot be set"
+            )
+
+        range_start = f"{prefix}_range_start"
+        scan_params = {**params, 'sort_by': 'id', 'sort_order': 'ASC'}
+        last_id = checkpoint.last_id
+        pages_done = len(checkpoint.completed_pages)
+        observe_page = None
+
+        while page_limit is None or pages_done < page_limit:
+            if last_id is not None:
+                scan_params[range_start] = last_id
+            try:
+                if not checkpoint.started:
+                    page, page_size = await self._fetch_first_page(
+                        session, url, endpoint_key, scan_params, page_size, tuner, 
+                        limiter, retry
+                    )
+                    checkpoint.record_first_page(page, page_size)
+                else:
+                    if tuner is not None:
+                        # No offsets to keep stable, so pick up the tuned size
+                        page_size = tuner.page_size(endpoint_key)
+                        observe_page = functools.partial(
+                            tuner.observe, endpoint_key, page_size
+                        )
+                    page = await self._fetch_page_limited(
+                        limiter, session, url, 1, scan_params, page_size, 
+                        observe_page, retry
+                    )
+            except Exception as e:
+                if not pages_done:
+                    raise
+                raise QBenchPaginationError(
+                    f"Failed to fetch keyset page {pages_done + 1} for "
+                    f"{endpoint_key} after id {last_id}: {e}", 
+                    checkpoint
+                ) from e
+
+            rows = page.get('data') or []
+            if any(row.get('id') is None for row in rows):
+                raise QBenchAPIError(
+                    f"Keyset pagination of {endpoint_key} needs an id on every entity"
+                )
+            new_rows = [
+                row for row in rows 
+                if last_id is None or int(row['id']) > int(last_id)
+            ]
+            if not new_rows:
+                return
+
+            page, done = {**page, 'data': new_rows}, False
+            if take is not None:
+                page, done = take(page)
+            new_rows = page['data']
+            yield page
+            pages_done += 1
+            if new_rows:
+                last_id = max(int(row['id']) for row in new_rows)
+                checkpoint.last_id = last_id
+            checkpoint.mark_done(pages_done, new_rows)
+            if done:
+                return
+
+            # total_count covers what is left of the range, this page included
+            total_count = page.get('total_count')
+            remaining = total_count - len(rows) if total_count is not None else None
+            if remaining is not None and remaining <= 0:
+                return
+            if remaining is None and len(rows) < page_size:
+                return
+
+    async def _iter_entities(
+        self, 
+        endpoint_key: str, 
+        by_page: bool = False, 
+        **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """
+        Stream entities (or each page's entity list) as pages arrive.
+        
+        Args:
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            by_page: Yield each page's list of entities instead of entities
+            **kwargs: Arguments passed through to `_iter_pages`
+            
+        Yields:
+            Entities, or lists of entities if by_page=True
+        """
+        async for page in self._iter_pages(endpoint_key, **kwargs):
+            data = page.get('data', [])
+            if by_page:
+                yield data
+            else:
+                for entity in data:
+                    yield entity
+
+    def _iter_entities_sync(
+        self, 
+        endpoint_key: str, 
+        by_page: bool = False, 
+        **kwargs: Any
+    ) -> Iterator[Any]:
+        """
+        Synchronous counterpart of `_iter_entities`.
+        
+        Pages are pulled from the background loop one at a time and
+        flattened in the caller's thread, so the cross-thread hop is paid
+        per page rather than per entity.
+        """
+        for page in self._iter_sync(self._iter_pages(endpoint_key, **kwargs)):
+            data = page.get('data', [])
+            if by_page:
+                yield data
+            else:
+                yield from data
+
+    def _iter_sync(self, items: AsyncIterator[Any]) -> Iterator[Any]:
+        """
+        Pull the items of an async generator through the background loop.
+        
+        Args:
+            items: Async generator to drain
+            
+        Yields:
+            Each item of the async generator
+        """
+        async def next_item() -> Any:
+            return await items.__anext__()
+
+        try:
+            while True:
+                try:
+                    item = self._run_sync(next_item())
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            # Cancels any work still in flight if the caller stopped early
+            aclose = getattr(items, 'aclose', None)
+            if aclose is not None:
+                self._run_sync(aclose())
+
+    async def _get_entity_list(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool = False, 
+        page_limit: Optional[int] = None, 
+        path_params: Optional[Dict[str, Any]] = None, 
+        include_metadata: bool = False,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        keyset: bool = False,
+        **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Get a paginated list of entities with concurrent page fetching.
+        
+        Args:
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            use_v1: Whether to use v1 API
+            page_limit: Maximum number of pages to fetch (None for all)
+            path_params: Parameters for URL formatting
+            include_metadata: Whether to include full response metadata
+            checkpoint: Records completed pages; pass the checkpoint of an
+                earlier failed fetch to resume it
+            keyset: Walk the collection by ID range instead of page number,
+                for stable latency and no duplicate or skipped rows on large
+                scans. Only for endpoints whose ``id_range`` filter is on
+                their own ID (e.g. samples).
+            **kwargs: Additional query parameters, plus ``max_items`` and
+                ``until`` to stop early (see `_iter_pages`)
+            
+        Returns:
+            List of entities (if include_metadata=False) or Dict with full metadata
+        """
+        # The checkpoint keeps each page's entities, so a call resumed from
+        # a failed fetch's checkpoint still returns the complete list
+        if checkpoint is None:
+            checkpoint = PaginationCheckpoint()
+        checkpoint.keep_results = True
+
+        try:
+            async for _ in self._iter_pages(
+                endpoint_key, 
+                use_v1=use_v1, 
+                page_limit=page_limit, 
+                path_params=path_params, 
+                checkpoint=checkpoint,
+                keyset=keyset,
+                **kwargs
+            ):
+                pass
+        except Exception as e:
+            logger.error(f"Error in _get_entity_list for {endpoint_key}: {e}")
+            raise
+
+        entity_array = checkpoint.entities()
+        logger.debug(f"Retrieved {len(entity_array)} entities for {endpoint_key}")
+        
+        # Return response based on include_metadata flag
+        if include_metadata:
+            # Include metadata from the first page response
+            full_response = dict(checkpoint.metadata)
+            full_response['data'] = entity_array
+            return full_response
+        else:
+            # Return just the entity array
+            return entity_array
+
+    async def _plan_shards(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        shards: int, 
+        params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Split a paginated endpoint into shards for a partitioned scan.
+        
+        Endpoints with an ID range filter on their own ID are split by ID:
+        the lowest and highest IDs are looked up with two single-row
+        requests and the range between them is cut into equal widths. Other
+        endpoints are split into blocks of pages using ``total_pages``.
+        
+        Args:
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            use_v1: Whether to use v1 API
+            path_params: Parameters for URL formatting
+            shards: Number of shards wanted
+            params: Query parameters of the scan
+            
+        Returns:
+            List of picklable shard descriptions for `_scan_shard`
+        """
+        url = self._build_url(endpoint_key, use_v1, path_params)
+        session = await self._get_async_session()
+        params = dict(params)
+        page_size, _ = self._page_sizing(params.pop('page_size', None))
+        keyset = params.pop('keyset', False)
+
+        config = QBENCH_ENDPOINTS[endpoint_key]
+        prefix = config.get('id_range')
+        range_keys = (f"{prefix}_range_start", f"{prefix}_range_end")
+        by_id = (
+            prefix and not use_v1 
+            and config.get('id_range_field', 'id') == 'id'
+            and not any(k in params for k in ('sort_by', 'sort_order') + range_keys)
+        )
+
+        if by_id:
+            lowest, highest = await asyncio.gather(*(
+                self._fetch_page(
+                    session, url, 1, {**params, 'sort_by': 'id', 'sort_order': order}, 1
+                )
+                for order in ('ASC', 'DESC')
+            ))
+            if not lowest.get('data') or not highest.get('data'):
+                return []
+            low, high = int(lowest['data'][0]['id']), int(highest['data'][0]['id'])
+            bounds = split_id_range(low, high, shards)
+            plan = []
+            for index, (start, end) in enumerate(bounds):
+                # The first and last shards stay open-ended so rows created
+                # outside the range during the scan aren't lost
+                lower = start if index > 0 else None
+                upper = end if index < len(bounds) - 1 else None
+                shard_params = {}
+                if lower is not None:
+                    # Start one below so the shard's first ID is returned
+                    # whether the server's bound is inclusive or exclusive;
+                    # _scan_shard drops the extra row
+                    shard_params[range_keys[0]] = lower - 1
+                if upper is not None:
+                    shard_params[range_keys[1]] = upper
+                plan.append({'params': shard_params, 'id_bounds': (lower, upper)})
+            return plan
+
+        if keyset:
+            raise QBenchValidationError(
+                f"Endpoint '{endpoint_key}' cannot be split by ID for a keyset scan"
+            )
+        first_page = await self._fetch_page(session, url, 1, params, page_size)
+        total_pages = max(first_page.get('total_pages', 1), 1)
+        plan = []
+        for first, last in split_page_range(total_pages, shards):
+            # A shard is a checkpoint that has already done the earlier pages
+            checkpoint = PaginationCheckpoint()
+            checkpoint.page_size = page_size
+            checkpoint.total_pages = last
+            checkpoint.completed_pages = set(range(1, first))
+            plan.append({'checkpoint': checkpoint.to_dict()})
+        return plan
+
+    async def _scan_shards(
+        self, 
+        endpoint_key: str, 
+        entity_id: Optional[int] = None, 
+        use_v1: bool = False, 
+        shards: Optional[int] = None, 
+        processes: Optional[int] = None, 
+        executor: Optional[Executor] = None, 
+        **kwargs: Any
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Run the shards of a partitioned scan and yield them as they finish.
+        
+        Args:
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            entity_id: ID for nested endpoints (e.g. an order's samples)
+            use_v1: Whether to use v1 API
+            shards: Number of shards (defaults to the number of processes)
+            processes: Worker processes (defaults to the CPU count)
+            executor: Executor to run shards on instead of a new process pool
+            **kwargs: Additional query parameters
+            
+        Yields:
+            Tuple of the shard's index and its entities, in completion order
+        """
+        if not QBENCH_ENDPOINTS.get(endpoint_key, {}).get('paginated'):
+            raise QBenchValidationError(
+                f"Endpoint '{endpoint_key}' is not paginated and cannot be partitioned"
+            )
+        if 'max_items' in kwargs or 'until' in kwargs:
+            raise QBenchValidationError(
+                "max_items and until stop a scan in order and cannot be partitioned"
+            )
+        processes = processes or os.cpu_count() or 1
+        path_params = {"id": entity_id} if entity_id else {}
+        plan = await self._plan_shards(
+            endpoint_key, use_v1, path_params, shards or processes, kwargs
+        )
+        if not plan:
+            return
+        logger.debug(f"Scanning {endpoint_key} in {len(plan)} shards")
+
+        own_executor = executor is None
+        if executor is None:
+            # Spawned workers don't inherit the parent's event loop thread,
+            # sessions or locks, which a forked child would get half-copied
+            executor = ProcessPoolExecutor(
+                max_workers=min(processes, len(plan)), 
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        client_config = dict(self._client_config)
+        if self._rate_limiter is not None:
+            # Workers split this client's quota rather than each getting it
+            client_config['rate_limit'] = (
+                self._rate_limiter.rate / min(processes, len(plan))
+            )
+        loop = asyncio.get_running_loop()
+        futures = {
+            loop.run_in_executor(
+                executor, _scan_shard, client_config, endpoint_key, 
+                use_v1, path_params, shard, kwargs
+            ): index
+            for index, shard in enumerate(plan)
+        }
+        try:
+            pending = set(futures)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            if own_executor:
+                executor.shutdown(wait=False)
+
+    async def _collect_shards(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Run a partitioned scan and merge its shards back in shard order."""
+        results = {
+            index: entities 
+            async for index, entities in self._scan_shards(**kwargs)
+        }
+        return [entity for index in sorted(results) for entity in results[index]]
+
+    async def _stream_shards(self, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Run a partitioned scan, yielding entities as each shard finishes."""
+        async for _, entities in self._scan_shards(**kwargs):
+            for entity in entities:
+                yield entity
+
+    def _stream_shards_sync(self, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """Synchronous counterpart of `_stream_shards`."""
+        for _, entities in self._iter_sync(self._scan_shards(**kwargs)):
+            yield from entities
+
+    def partitioned_scan(
+        self, 
+        endpoint_key: str, 
+        entity_id: Optional[int] = None, 
+        shards: Optional[int] = None, 
+        processes: Optional[int] = None, 
+        stream: bool = False, 
+        use_v1: bool = False, 
+        executor: Optional[Executor] = None, 
+        **kwargs: Any
+    ) -> Any:
+        """
+        Fetch a whole paginated endpoint in shards across worker processes.
+        
+        The endpoint is split into shards by ID range where it supports an
+        ID range filter (samples), otherwise into blocks of pages. Each shard
+        is fetched by its own client in a process pool, so large exports
+        scale with CPU cores for JSON decoding as well as with connections.
+        
+        Args:
+            endpoint_key: Paginated endpoint key, e.g. "get_samples"
+            entity_id: ID for nested endpoints (e.g. an order's samples)
+            shards: Number of shards (defaults to the number of processes)
+            processes: Worker processes (defaults to the CPU count)
+            stream: Yield entities as each shard finishes instead of
+                returning one merged list
+            use_v1: Whether to use v1 API
+            executor: Executor to run shards on instead of a new process pool
+            **kwargs: Additional query parameters, applied to every shard
+            
+        Returns:
+            List of all entities in shard order, or with stream=True a
+            generator of entities in shard completion order. Inside a
+            running event loop, a coroutine or async generator instead.
+            
+        Raises:
+            QBenchValidationError: If the endpoint is not paginated, or
+                max_items or until is given
+        """
+        scan_kwargs = dict(
+            endpoint_key=endpoint_key, 
+            entity_id=entity_id, 
+            use_v1=use_v1, 
+            shards=shards, 
+            processes=processes, 
+            executor=executor, 
+            **kwargs
+        )
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if stream:
+                return self._stream_shards_sync(**scan_kwargs)
+            return self._run_sync(self._collect_shards(**scan_kwargs))
+        if stream:
+            return self._stream_shards(**scan_kwargs)
+        return self._collect_shards(**scan_kwargs)
+
+    async def _fan_out_results(
+        self, 
+        endpoint_key: str, 
+        ids: List[Any], 
+        use_v1: bool = False, 
+        max_concurrency: Optional[int] = None, 
+        **kwargs: Any
+    ) -> AsyncIterator[Tuple[Any, List[Dict[str, Any]]]]:
+        """
+        Fetch the child list of every parent ID and yield each as it finishes.
+        
+        Args:
+            endpoint_key: Paginated endpoint key taking an ``{id}``
+            ids: Parent IDs; duplicates are fetched once
+            use_v1: Whether to use v1 API
+            max_concurrency: Requests in flight across all parents
+                (defaults to the client's concurrency limit)
+            **kwargs: Additional query parameters, applied to every parent
+            
+        Yields:
+            Tuple of the parent ID and its entities, in completion order
+        """
+        # One budget for every request of every parent, on the pooled session
+        limiter = asyncio.Semaphore(max_concurrency or self._concurrency_limit)
+
+        async def fetch_children(parent_id: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+            entities = await self._get_entity_list(
+                endpoint_key, 
+                use_v1=use_v1, 
+                path_params={'id': parent_id}, 
+                limiter=limiter, 
+                **kwargs
+            )
+            return parent_id, cast(List[Dict[str, Any]], entities)
+
+        tasks = [
+            asyncio.ensure_future(fetch_children(parent_id)) 
+            for parent_id in dict.fromkeys(ids)
+        ]
+        logger.debug(f"Fanning out {endpoint_key} over {len(tasks)} parents")
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _collect_fan_out(
+        self, 
+        endpoint_key: str, 
+        ids: List[Any], 
+        **kwargs: Any
+    ) -> Dict[Any, List[Dict[str, Any]]]:
+        """Run a fan-out and return the child lists keyed by parent ID, in ID order."""
+        results = {
+            parent_id: entities 
+            async for parent_id, entities in self._fan_out_results(
+                endpoint_key, ids, **kwargs
+            )
+        }
+        return {parent_id: results[parent_id] for parent_id in dict.fromkeys(ids)}
+
+    def fan_out(
+        self, 
+        endpoint_key: str, 
+        ids: List[Any], 
+        stream: bool = False, 
+        use_v1: bool = False, 
+        max_concurrency: Optional[int] = None, 
+        **kwargs: Any
+    ) -> Any:
+        """
+        Fetch a child list (e.g. get_order_samples) for many parent IDs at once.
+        
+        Every parent's list is paginated concurrently on the client's pooled
+        session, with one request budget shared by all of them instead of a
+        separate window per parent.
+        
+        Args:
+            endpoint_key: Paginated endpoint key taking an ``{id}``,
+                e.g. "get_order_samples"
+            ids: Parent IDs; duplicates are fetched once
+            stream: Yield ``(parent_id, entities)`` as each parent finishes
+                instead of returning a dict
+            use_v1: Whether to use v1 API
+            max_concurrency: Requests in flight across all parents
+                (defaults to the client's concurrency limit)
+            **kwargs: Additional query parameters, applied to every parent
+            
+        Returns:
+            Dict of parent ID to its entities, or with stream=True a generator
+            of ``(parent_id, entities)`` tuples. Inside a running event loop,
+            a coroutine or async generator instead.
+            
+        Raises:
+            QBenchValidationError: If the endpoint is not a paginated child list
+        """
+        config = QBENCH_ENDPOINTS.get(endpoint_key, {})
+        path = config.get('v1' if use_v1 else 'v2') or ''
+        if not config.get('paginated') or '{id}' not in path:
+            raise QBenchValidationError(
+                f"Endpoint '{endpoint_key}' is not a paginated list under a parent ID"
+            )
+
+        fan_out_kwargs = dict(use_v1=use_v1, max_concurrency=max_concurrency, **kwargs)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if stream:
+                return self._iter_sync(
+                    self._fan_out_results(endpoint_key, ids, **fan_out_kwargs)
+                )
+            return self._run_sync(
+                self._collect_fan_out(endpoint_key, ids, **fan_out_kwargs)
+            )
+        if stream:
+            return self._fan_out_results(endpoint_key, ids, **fan_out_kwargs)
+        return self._collect_fan_out(endpoint_key, ids, **fan_out_kwargs)
+
+    @staticmethod
+    def _chunk_ids(ids: List[Any], budget: int) -> List[List[Any]]:
+        """
+        Split IDs into chunks whose ``ids=`` query fits in a URL length budget.
+        
+        Args:
+            ids: IDs to split
+            budget: Characters available for the ``ids`` parameters
+            
+        Returns:
+            List of ID chunks, in the original order
+        """
+        chunks: List[List[Any]] = []
+        chunk: List[Any] = []
+        used = 0
+        for entity_id in ids:
+            cost = len(f"ids={entity_id}&")
+            if chunk and (used + cost > budget or len(chunk) >= MAX_IDS_PER_REQUEST):
+                chunks.append(chunk)
+                chunk, used = [], 0
+            chunk.append(entity_id)
+            used += cost
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def _get_many(
+        self, 
+        list_key: str, 
+        ids: List[Any], 
+        max_concurrency: Optional[int] = None, 
+        **kwargs: Any
+    ) -> Dict[Any, Optional[Dict[str, Any]]]:
+        """
+        Fetch entities by ID through their list endpoint's ``ids`` filter.
+        
+        Args:
+            list_key: Paginated endpoint key marked ``ids_filter``
+            ids: IDs to fetch; duplicates are fetched once
+            max_concurrency: Requests in flight across all chunks
+                (defaults to the client's concurrency limit)
+            **kwargs: Additional query parameters
+            
+        Returns:
+            Dict of each requested ID to its entity, or None if not found
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        url = self._build_url(list_key)
+        # Leave room for the page and caller parameters next to the IDs
+        budget = MAX_URL_LENGTH - len(url) - 100 - len(str(kwargs))
+        chunks = self._chunk_ids(unique_ids, max(budget, 1))
+        logger.debug(
+            f"Fetching {len(unique_ids)} entities from {list_key} "
+            f"in {len(chunks)} requests"
+        )
+
+        limiter = asyncio.Semaphore(max_concurrency or self._concurrency_limit)
+        pages = await asyncio.gather(*(
+            self._get_entity_list(
+                list_key, 
+                ids=chunk, 
+                page_size=len(chunk), 
+                limiter=limiter, 
+                **kwargs
+            )
+            for chunk in chunks
+        ))
+
+        # IDs may be typed as ints or strings; match them as strings
+        found = {
+            str(entity.get('id')): entity 
+            for entities in pages for entity in cast(List[Dict[str, Any]], entities)
+        }
+        result = {entity_id: found.get(str(entity_id)) for entity_id in unique_ids}
+        missing = [entity_id for entity_id, entity in result.items() if entity is None]
+        if missing:
+            logger.warning(
+                f"{len(missing)} of {len(unique_ids)} IDs not found in {list_key}: "
+                f"{missing[:20]}{'...' if len(missing) > 20 else ''}"
+            )
+        return result
+
+    def get_many(
+        self, 
+        resource: str, 
+        ids: List[Any], 
+        max_concurrency: Optional[int] = None, 
+        **kwargs: Any
+    ) -> Any:
+        """
+        Fetch many entities by ID in a few list requests instead of one each.
+        
+        The IDs are split into chunks that keep each URL under
+        ``MAX_URL_LENGTH``, sent through the list endpoint's ``ids`` filter,
+        and the chunks are fetched concurrently.
+        
+        Args:
+            resource: Entity name such as "sample" or "samples", or the
+                list endpoint key ("get_samples")
+            ids: IDs to fetch; duplicates are fetched once
+            max_concurrency: Requests in flight across all chunks
+                (defaults to the client's concurrency limit)
+            **kwargs: Additional query parameters
+            
+        Returns:
+            Dict of each requested ID to its entity, or None for IDs that
+            were not found (these are also logged). Inside a running event
+            loop, a coroutine instead.
+            
+        Raises:
+            QBenchValidationError: If the resource has no list endpoint
+                accepting an ``ids`` filter, or page_size is passed (each
+                chunk is fetched as a single page)
+        """
+        if 'page_size' in kwargs:
+            raise QBenchValidationError(
+                "get_many fetches each chunk as one page; page_size cannot be set"
+            )
+        base = resource[len('get_'):] if resource.startswith('get_') else resource
+        for list_key in (f"get_{base}", f"get_{base}s", f"get_{base}es"):
+            if QBENCH_ENDPOINTS.get(list_key, {}).get('ids_filter'):
+                break
+        else:
+            supported = sorted(
+                key for key, config in QBENCH_ENDPOINTS.items() 
+                if config.get('ids_filter')
+            )
+            raise QBenchValidationError(
+                f"'{resource}' has no list endpoint with an ids filter; "
+                f"supported: {', '.join(supported)}"
+            )
+
+        coro = self._get_many(list_key, ids, max_concurrency=max_concurrency, **kwargs)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._run_sync(coro)
+        return coro
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """The client's response cache, or None if caching is off."""
+        return self._cache
+
+    def _response_cache_key(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        params: Dict[str, Any]
+    ) -> Optional[CacheKey]:
+        """
+        Return the cache key of a call, or None if it must not be cached.
+        
+        Only GETs of endpoints the cache has a TTL for are cached, and only
+        when every parameter is plain data (not a predicate or checkpoint).
+        """
+        if self._cache is None or not self._cache.caches(endpoint_key):
+            return None
+        if not self._is_plain_get(endpoint_key, params):
+            return None
+        return self._cache.make_key(endpoint_key, use_v1, path_params, params)
+
+    @staticmethod
+    def _is_plain_get(endpoint_key: str, params: Dict[str, Any]) -> bool:
+        """Whether a call is a GET whose parameters are all plain data."""
+        if QBENCH_ENDPOINTS[endpoint_key].get('method', 'GET') != 'GET':
+            return False
+        return not any(
+            callable(value) or isinstance(value, PaginationCheckpoint) 
+            for value in params.values()
+        )
+
+    def _single_flight_key(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        params: Dict[str, Any]
+    ) -> Optional[Tuple[Any, ...]]:
+        """Return the key identical in-flight calls share, or None if they don't."""
+        if not self._coalesce or not self._is_plain_get(endpoint_key, params):
+            return None
+        return (
+            asyncio.get_running_loop(), 
+            *ResponseCache.make_key(endpoint_key, use_v1, path_params, params)
+        )
+
+    async def _single_flight(
+        self, 
+        key: Tuple[Any, ...], 
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run ``fetch`` once for all callers awaiting the same key concurrently.
+        
+        The first caller starts the request as a task; callers arriving
+        while it runs await the same task and get their own copy of its
+        result (or its exception). A caller being cancelled doesn't cancel
+        the request unless no other caller is still waiting for it.
+        
+        Args:
+            key: Key from `_single_flight_key`
+            fetch: Makes the request when called
+            
+        Returns:
+            The request's result
+        """
+        flight = self._in_flight.get(key)
+        follower = flight is not None
+        if flight is None:
+            task = asyncio.ensure_future(fetch())
+            flight = [task, 0]
+            self._in_flight[key] = flight
+
+            def forget(_: asyncio.Future) -> None:
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+
+            task.add_done_callback(forget)
+        else:
+            logger.debug(f"Joining in-flight request for {key[1]}")
+
+        task = flight[0]
+        flight[1] += 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if flight[1] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            flight[1] -= 1
+        # Followers get a copy so no caller can change another's result
+        return copy.deepcopy(result) if follower else result
+
+    def _apply_write_to_cache(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        response: Any
+    ) -> None:
+        """
+        Update or evict cached responses a write may have changed.
+        
+        Args:
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            use_v1: Whether the v1 API was used
+            path_params: Path parameters of the request
+            response: The write's response, or None if it raised
+        """
+        if QBENCH_ENDPOINTS[endpoint_key].get('method', 'GET') == 'GET':
+            return
+        if self._disk_cache is not None:
+            dropped = self._disk_cache.apply_write(endpoint_key)
+            if dropped:
+                logger.debug(
+                    f"{endpoint_key} dropped {dropped} collections from the disk cache"
+                )
+        if self._cache is None:
+            return
+        updated, evicted = self._cache.apply_write(
+            endpoint_key, use_v1, path_params, response
+        )
+        if updated or evicted:
+            logger.debug(
+                f"{endpoint_key} updated {updated} and evicted {evicted} "
+                f"cached responses"
+            )
+
+    def _raise_if_not_found(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any]
+    ) -> None:
+        """
+        Raise the remembered 404 of a single-entity GET, if there is one.
+        
+        Raises:
+            QBenchAPIError: If the entity is cached as missing
+        """
+        if self._cache is None:
+            return
+        hit, response_data = self._cache.get_not_found(
+            endpoint_key, use_v1, path_params
+        )
+        if hit:
+            raise QBenchAPIError("Resource not found", 404, response_data)
+
+    def _remember_not_found(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        error: QBenchAPIError
+    ) -> None:
+        """Cache a 404 of a single-entity GET, if the cache keeps them."""
+        if self._cache is not None and error.status_code == 404:
+            self._cache.set_not_found(
+                endpoint_key, use_v1, path_params, error.response_data
+            )
+
+    @contextlib.asynccontextmanager
+    async def _request_slot(self) -> AsyncIterator[None]:
+        """
+        Hold a slot of the adaptive concurrency limit for one request.
+        
+        Reports the request's latency to the limiter when it completes, and
+        whether it failed in a way that signals overload.
+        """
+        limiter = self._concurrency
+        if limiter is None:
+            yield
+            return
+        await limiter.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            limiter.release(time.monotonic() - started)
+            raise
+        except Exception as e:
+            limiter.release(
+                time.monotonic() - started, overloaded=_is_transient_error(e)
+            )
+            raise
+        limiter.release(time.monotonic() - started)
+
+    @contextlib.contextmanager
+    def _circuit_guard(self, url: str) -> Iterator[None]:
+        """
+        Run one request attempt past the circuit breaker, if there is one.
         
-        logger.info(f"QBench API client initialized for {base_url}")
+        Raises QBenchCircuitOpenError instead of sending while the circuit
+        is open, and records how the attempt went.
+        """
+        breaker = self._circuit_breaker
+        if breaker is None:
+            yield
+            return
+        key = breaker.key_for(url)
+        breaker.before_request(key)
+        try:
+            yield
+        except BaseException as e:
+            breaker.record(key, e)
+            raise
+        breaker.record(key)
 
-    def __del__(self):
-        """Clean up session on deletion."""
-        if hasattr(self, '_session'):
-            self._session.close()
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """The client's circuit breaker, or None if off."""
+        return self._circuit_breaker
 
+    @property
+    def concurrency(self) -> Optional[AdaptiveConcurrency]:
+        """The client's adaptive concurrency limiter, or None for a fixed limit."""
+        return self._concurrency
 
-    @retry(
-        wait=wait_exponential(multiplier=2, min=1, max=10), 
-        stop=stop_after_attempt(5),
-        retry=retry_if_exception_type((requests.exceptions.ConnectionError, requests.exceptions.Timeout)),
-        reraise=True
-    )
-    def _make_request(
+    @property
+    def rate_limiter(self) -> Optional[TokenBucket]:
+        """The client's request rate limiter, or None if requests are unthrottled."""
+        return self._rate_limiter
+
+    @property
+    def disk_cache(self) -> Optional[DiskCache]:
+        """The client's on-disk cache of complete lists, or None if off."""
+        return self._disk_cache
+
+    def _uses_disk_cache(
         self, 
-        method: str, 
         endpoint_key: str, 
-        use_v1: bool = False,
-        params: Optional[Dict[str, Any]] = None, 
-        data: Optional[Dict[str, Any]] = None,
-        path_params: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+        page_limit: Optional[int], 
+        params: Dict[str, Any]
+    ) -> bool:
         """
-        Make a synchronous request to the QBench API with retry logic.
+        Whether a paginated call is served through the disk cache.
+        
+        Only complete, plain-data results are stored: partial fetches
+        (``page_limit``, ``max_items``, ``until``), resumed fetches and
+        keyset scans go straight to the server.
+        """
+        if self._disk_cache is None or not self._disk_cache.caches(endpoint_key):
+            return False
+        if page_limit is not None:
+            return False
+        stateful = ('checkpoint', 'keyset', 'max_items', 'until')
+        if any(params.get(option) for option in stateful):
+            return False
+        return not any(callable(value) for value in params.values())
 
+    async def _get_disk_cached_list(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        include_metadata: bool, 
+        params: Dict[str, Any]
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Return a complete list from the disk cache, revalidating it first.
+        
+        A collection younger than the cache's ``max_age`` is brought up to
+        date with one ``last_updated`` query for the entities changed since
+        its watermark. Endpoints without that filter get a one-entity count
+        request instead and are fetched in full if ``total_count`` changed.
+        Older or missing collections are fetched in full and stored.
+        
         Args:
-            method (str): HTTP method ('GET', 'POST', etc.).
-            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
-            use_v1 (bool): If True, use the v1 API. Else use v2.
-            params (dict, optional): URL parameters for the request.
-            data (dict, optional): JSON payload for the request.
-            path_params (dict, optional): Parameters to replace in the endpoint
-
-        Returns:
-            dict: JSON response from the API.
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            use_v1: Whether to use v1 API
+            path_params: Parameters for URL formatting
+            include_metadata: Whether to include full response metadata
+            params: Query parameters of the call
             
-        Raises:
-            QBenchValidationError: For invalid endpoint or parameters
-            QBenchAPIError: For API-related errors
-            QBenchConnectionError: For connection issues
+        Returns:
+            List of entities (if include_metadata=False) or Dict with full metadata
         """
-        if endpoint_key not in QBENCH_ENDPOINTS:
-            raise QBenchValidationError(f"Invalid API endpoint: {endpoint_key}")
-        
-        # Default to v2 unless explicitly set
-        version = "v1" if use_v1 else "v2"
-        base_url = self._base_url_v1 if use_v1 else self._base_url
-
-        # Get the correct endpoint format
-        endpoint = QBENCH_ENDPOINTS[endpoint_key].get(version)
-        if not endpoint:
-            raise QBenchValidationError(
-                f"Endpoint '{endpoint_key}' does not exist in version {version}"
-            )
+        disk = self._disk_cache
+        if disk is None:
+            raise QBenchValidationError("The client has no disk cache")
+        key = disk.make_key(endpoint_key, use_v1, path_params, params)
+        state = disk.state(key)
+        now = time.time()
+        delta = bool(
+            QBENCH_ENDPOINTS[endpoint_key].get('last_updated') 
+            and not use_v1 
+            and 'last_updated' not in params
+        )
 
-        # Format endpoint with path parameters if provided
-        if path_params:
-            try:
-                endpoint = endpoint.format(**path_params)
-            except KeyError as e:
-                raise QBenchValidationError(
-                    f"Missing required path parameter: {e}"
+        max_age = disk.max_age_for(delta)
+        if state is not None and now - state['full_refreshed'] >= max_age:
+            state = None
+        if state is not None and now - state['refreshed'] >= disk.revalidate_after:
+            if delta:
+                changed = cast(List[Dict[str, Any]], await self._get_entity_list(
+                    endpoint_key, 
+                    use_v1=use_v1, 
+                    path_params=path_params, 
+                    **dict(params, last_updated=int(state['watermark']))
+                ))
+                if changed:
+                    disk.merge(key, changed, now)
+                else:
+                    disk.touch(key, now)
+                logger.debug(
+                    f"Revalidated {endpoint_key} from disk cache: "
+                    f"{len(changed)} changed"
                 )
+            elif await self._disk_count_matches(
+                disk, key, endpoint_key, use_v1, path_params, params
+            ):
+                disk.touch(key, now)
+            else:
+                logger.debug(f"Count of {endpoint_key} changed; refetching it in full")
+                state = None
 
-        url = f"{base_url}/{endpoint}"
-        
-        # Refresh auth headers if needed
-        self._session.headers.update(self._auth.get_headers())
+        if state is not None:
+            entities, metadata = disk.load(key)
+            if 'total_count' in metadata:
+                metadata['total_count'] = len(entities)
+        else:
+            response = cast(Dict[str, Any], await self._get_entity_list(
+                endpoint_key, 
+                use_v1=use_v1, 
+                path_params=path_params, 
+                include_metadata=True,
+                **params
+            ))
+            entities = response.pop('data')
+            metadata = response
+            disk.replace(key, endpoint_key, entities, metadata, now)
+
+        if include_metadata:
+            return dict(metadata, data=entities)
+        return entities
 
+    async def _disk_count_matches(
+        self, 
+        disk: DiskCache, 
+        key: str, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        params: Dict[str, Any]
+    ) -> bool:
+        """
+        Whether the server's count of a collection matches what is on disk.
+        
+        Costs one single-entity request; a response without ``total_count``
+        counts as a mismatch.
+        """
         try:
-            logger.debug(f"Making {method} request to {url}")
-            response = self._session.request(
-                method, 
-                url, 
-                params=params, 
-                json=data,
-                timeout=self._timeout
+            counted = await self._count_entities(
+                endpoint_key, use_v1, path_params, params
             )
-            response.raise_for_status()
-            
-            # Handle empty responses
-            if response.status_code == 204:  # No Content
-                return {}
-                
-            try:
-                return response.json()
-            except ValueError:
-                # Response is not JSON
-                return {"status": "success", "data": response.text}
-                
-        except requests.exceptions.Timeout:
-            raise QBenchTimeoutError(f"Request timeout after {self._timeout} seconds")
-        except requests.exceptions.ConnectionError as e:
-            raise QBenchConnectionError(f"Connection error: {e}")
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if e.response else None
-            try:
-                error_data = e.response.json() if e.response else None
-            except ValueError:
-                error_data = None
-                
-            if status_code == 401:
-                # Try to refresh token and retry once
-                try:
-                    self._auth._fetch_access_token()
-                    self._session.headers.update(self._auth.get_headers())
-                    raise  # Will be caught by retry decorator
-                except Exception:
-                    raise QBenchAPIError("Authentication failed", status_code, error_data)
-            elif status_code == 404:
-                raise QBenchAPIError("Resource not found", status_code, error_data)
-            elif status_code == 429:
-                raise QBenchAPIError("Rate limit exceeded", status_code, error_data)
-            else:
-                raise QBenchAPIError(
-                    f"API request failed: {method.upper()} {url} - {e}",
-                    status_code, 
-                    error_data
-                )
-        except requests.exceptions.RequestException as e:
-            raise QBenchAPIError(f"Request failed: {e}")
-        except RetryError as e:
-            # All retries exhausted
-            raise QBenchAPIError(f"Request failed after all retries: {e.last_attempt.exception()}")
+        except QBenchAPIError:
+            return False
+        return counted['total_count'] == disk.count(key)
 
-    async def _fetch_page(
+    def _count_request(
         self, 
-        session: aiohttp.ClientSession, 
-        url: str, 
-        page: int, 
         params: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], int]:
         """
-        Fetch a single page of paginated data.
+        Build the query for a count: page 1 of a single entity.
         
         Args:
-            session: aiohttp session
-            url: Base URL for the request
-            page: Page number to fetch
-            params: Additional URL parameters
+            params: Filters of the count; ``page_size`` sets the page size
+                ``total_pages`` is reported for
             
         Returns:
-            Dict containing the page data
+            Tuple of the query parameters and the page size to report for
         """
-        page_params = params.copy()
-        page_params.update({
-            'page_num': page,
-            'page_size': 50
-        })
+        params = dict(params)
+        page_size, _ = self._page_sizing(params.pop('page_size', None))
+        params.update({'page_num': 1, 'page_size': 1})
+        return params, page_size
+
+    @staticmethod
+    def _count_result(
+        endpoint_key: str, 
+        response: Any, 
+        page_size: int
+    ) -> Dict[str, int]:
+        """
+        Read the totals of a count request.
         
-        try:
-            async with session.get(url, params=page_params, timeout=self._timeout) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return data or {'data': []}
-        except asyncio.TimeoutError:
-            raise QBenchTimeoutError(f"Page {page} request timed out")
-        except aiohttp.ClientError as e:
-            raise QBenchConnectionError(f"Error fetching page {page}: {e}")
+        Args:
+            endpoint_key: The endpoint key from QBENCH_ENDPOINTS
+            response: Response of the one-entity request
+            page_size: Page size to report ``total_pages`` for
+            
+        Returns:
+            Dict with ``total_count`` and ``total_pages``
+            
+        Raises:
+            QBenchAPIError: If the response has no total_count
+        """
+        total_count = None
+        if isinstance(response, dict):
+            total_count = response.get('total_count')
+        if total_count is None:
+            raise QBenchAPIError(
+                f"Response of {endpoint_key} has no total_count to count with"
+            )
+        return {
+            'total_count': total_count, 
+            'total_pages': -(-total_count // page_size)
+        }
 
-    async def _get_entity_list(
+    async def _count_entities(
         self, 
         endpoint_key: str, 
-        use_v1: bool = False, 
-        page_limit: Optional[int] = None, 
-        path_params: Optional[Dict[str, Any]] = None, 
-        include_metadata: bool = False,
-        **kwargs
-    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        params: Dict[str, Any],
+        retry: Union[RetryPolicy, int, bool, None] = None
+    ) -> Dict[str, int]:
         """
-        Get a paginated list of entities with concurrent page fetching.
+        Count the entities of a paginated endpoint without fetching them.
         
         Args:
             endpoint_key: The endpoint key from QBENCH_ENDPOINTS
             use_v1: Whether to use v1 API
-            page_limit: Maximum number of pages to fetch (None for all)
             path_params: Parameters for URL formatting
-            include_metadata: Whether to include full response metadata
-            **kwargs: Additional query parameters
+            params: Filters to count with
+            retry: Per-call retry override
             
         Returns:
-            List of entities (if include_metadata=False) or Dict with full metadata
+            Dict with ``total_count`` and ``total_pages``
         """
-        if path_params is None:
-            path_params = {}
-            
-        version = "v1" if use_v1 else "v2"
-        base_url = self._base_url_v1 if use_v1 else self._base_url
-
-        endpoint = QBENCH_ENDPOINTS[endpoint_key][version]
-        if path_params:
-            endpoint = endpoint.format(**path_params)
-
-        url = f"{base_url}/{endpoint}"
-        entity_array = []
-        
-        # Set up aiohttp session with proper headers and concurrency control
-        connector = aiohttp.TCPConnector(limit=self._concurrency_limit)
-        timeout = aiohttp.ClientTimeout(total=self._timeout)
-        
-        async with aiohttp.ClientSession(
-            headers=self._auth.get_headers(),
-            connector=connector,
-            timeout=timeout
-        ) as session:
-            try:
-                # Fetch first page to determine total pages
-                page_1_res = await self._fetch_page(session, url, 1, kwargs)
-                page_1_data = page_1_res.get('data', [])
-
-                # Determine how many pages to fetch
-                total_pages = page_1_res.get('total_pages', 1)
-                pages_to_fetch = min(page_limit or total_pages, total_pages)
-                
-                entity_array.extend(page_1_data)
-                logger.debug(f"Fetching {pages_to_fetch} pages for {endpoint_key}")
-
-                # Fetch remaining pages concurrently if needed
-                if pages_to_fetch > 1:
-                    # Create semaphore to limit concurrent requests
-                    semaphore = asyncio.Semaphore(self._concurrency_limit)
-                    
-                    async def fetch_with_semaphore(page_num):
-                        async with semaphore:
-                            return await self._fetch_page(session, url, page_num, kwargs)
-                    
-                    tasks = [
-                        fetch_with_semaphore(page) 
-                        for page in range(2, pages_to_fetch + 1)
-                    ]
-                    
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                    for i, result in enumerate(results):
-                        if isinstance(result, Exception):
-                            logger.error(f"Error fetching page {i+2}: {result}")
-                            continue
-                        entity_array.extend(result.get('data', []))
-
-            except Exception as e:
-                logger.error(f"Error in _get_entity_list for {endpoint_key}: {e}")
-                raise
+        query, page_size = self._count_request(params)
+        response = await self._make_request_async(
+            'GET', endpoint_key, use_v1, query, None, path_params, retry=retry
+        )
+        return self._count_result(endpoint_key, response, page_size)
 
-        logger.debug(f"Retrieved {len(entity_array)} entities for {endpoint_key}")
-        
-        # Return response based on include_metadata flag
-        full_response = {'data': entity_array}
-        if include_metadata:
-            # Include metadata from the first page response
-            if page_1_res:
-                full_response.update({
-                    k: v for k, v in page_1_res.items() 
-                    if k != 'data'
-                })
-            return full_response
-        else:
-            # Return just the entity array
-            return entity_array
+    def _count_entities_sync(
+        self, 
+        endpoint_key: str, 
+        use_v1: bool, 
+        path_params: Dict[str, Any], 
+        params: Dict[str, Any],
+        retry: Union[RetryPolicy, int, bool, None] = None
+    ) -> Dict[str, int]:
+        """Synchronous counterpart of `_count_entities`; no event loop needed."""
+        query, page_size = self._count_request(params)
+        response = self._make_request(
+            'GET', endpoint_key, use_v1, query, None, path_params, retry=retry
+        )
+        return self._count_result(endpoint_key, response, page_size)
 
     def __getattr__(self, name: str):
         """
@@ -346,6 +2402,32 @@ class QBenchAPI:
         Raises:
             AttributeError: If the method name is not a valid endpoint
         """
+        prefix, _, list_name = name.partition('_')
+        if prefix in ('iter', 'count') and list_name:
+            # iter_samples and iter_get_samples both stream get_samples;
+            # count_samples and count_get_samples both count it
+            if not list_name.startswith('get_'):
+                list_name = f"get_{list_name}"
+            if QBENCH_ENDPOINTS.get(list_name, {}).get('paginated'):
+                list_method = getattr(self, list_name)
+                mode = 'stream' if prefix == 'iter' else 'count'
+
+                def mode_method(*args: Any, **kwargs: Any) -> Any:
+                    return list_method(*args, **{mode: True}, **kwargs)
+
+                if prefix == 'iter':
+                    mode_method.__doc__ = (
+                        f"Stream {list_name} page by page; equivalent to "
+                        f"qb.{list_name}(..., stream=True)."
+                    )
+                else:
+                    mode_method.__doc__ = (
+                        f"Count {list_name} with one minimal request; equivalent "
+                        f"to qb.{list_name}(..., count=True)."
+                    )
+                mode_method.__name__ = name
+                return mode_method
+
         if name not in QBENCH_ENDPOINTS:
             raise AttributeError(
                 f"'{self.__class__.__name__}' object has no attribute '{name}'. "
@@ -360,6 +2442,7 @@ class QBenchAPI:
             page_limit: Optional[int] = None, 
             data: Optional[Dict[str, Any]] = None, 
             include_metadata: bool = False,
+            retry: Union[RetryPolicy, int, bool, None] = None,
             **kwargs
         ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
             """
@@ -371,15 +2454,77 @@ class QBenchAPI:
                 page_limit: Max pages for paginated endpoints
                 data: Request body for POST/PATCH/PUT requests
                 include_metadata: Whether to include API metadata (default: False)
+                retry: Retry override for the requests of this call
                 **kwargs: Additional query parameters
                 
             Returns:
                 API response data (just the data by default, full response if include_metadata=True)
             """
+            if retry is None:
+                return await run_call(
+                    entity_id, use_v1, page_limit, data, include_metadata, kwargs
+                )
+            override = _retry_override.set(self._retry_policy.resolve(retry))
+            try:
+                return await run_call(
+                    entity_id, use_v1, page_limit, data, include_metadata, kwargs
+                )
+            finally:
+                _retry_override.reset(override)
+
+        async def run_call(
+            entity_id: Optional[int], 
+            use_v1: bool, 
+            page_limit: Optional[int], 
+            data: Optional[Dict[str, Any]], 
+            include_metadata: bool, 
+            kwargs: Dict[str, Any]
+        ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+            """Serve a dynamic method call from the cache or the API."""
             path_params = {"id": entity_id} if entity_id else {}
             method = endpoint_config.get('method', 'GET')
 
+            # Call options that change the result are part of the cache key
+            options = dict(kwargs, include_metadata=include_metadata)
             if endpoint_config.get('paginated'):
+                options['page_limit'] = page_limit
+            cache_key = self._response_cache_key(name, use_v1, path_params, options)
+            if cache_key is not None and self._cache is not None:
+                cached: Union[Dict[str, Any], List[Dict[str, Any]]]
+                hit, cached = self._cache.get(cache_key)
+                if hit:
+                    return cached
+
+            fetch = functools.partial(
+                fetch_uncached, 
+                path_params, method, cache_key, use_v1, page_limit, data, 
+                include_metadata, kwargs
+            )
+            flight_key = self._single_flight_key(name, use_v1, path_params, options)
+            if flight_key is not None:
+                return cast(
+                    Union[Dict[str, Any], List[Dict[str, Any]]], 
+                    await self._single_flight(flight_key, fetch)
+                )
+            return await fetch()
+
+        async def fetch_uncached(
+            path_params: Dict[str, Any], 
+            method: str, 
+            cache_key: Optional[CacheKey], 
+            use_v1: bool, 
+            page_limit: Optional[int], 
+            data: Optional[Dict[str, Any]], 
+            include_metadata: bool, 
+            kwargs: Dict[str, Any]
+        ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+            """Make the request(s) of a dynamic method call and cache the result."""
+            paginated = endpoint_config.get('paginated')
+            if paginated and self._uses_disk_cache(name, page_limit, kwargs):
+                result = await self._get_disk_cached_list(
+                    name, use_v1, path_params, include_metadata, kwargs
+                )
+            elif paginated:
                 result = await self._get_entity_list(
                     name, 
                     use_v1=use_v1, 
@@ -389,23 +2534,30 @@ class QBenchAPI:
                     **kwargs
                 )
             else:
-                # Run synchronous method in thread pool for non-paginated endpoints
-                loop = asyncio.get_running_loop()
-                result = await loop.run_in_executor(
-                    None, 
-                    self._make_request, 
-                    method, 
-                    name, 
-                    use_v1, 
-                    kwargs, 
-                    data, 
-                    path_params
-                )
+                # Native aiohttp request; no thread pool hop needed
+                self._raise_if_not_found(name, use_v1, path_params)
+                result = None
+                try:
+                    result = await self._make_request_async(
+                        method, 
+                        name, 
+                        use_v1, 
+                        kwargs, 
+                        data, 
+                        path_params
+                    )
+                except QBenchAPIError as e:
+                    self._remember_not_found(name, use_v1, path_params, e)
+                    raise
+                finally:
+                    self._apply_write_to_cache(name, use_v1, path_params, result)
                 
                 # Extract data if not including metadata
                 if not include_metadata and isinstance(result, dict) and 'data' in result:
                     result = result['data']
-                    
+
+            if cache_key is not None and self._cache is not None:
+                self._cache.set(cache_key, result)
             return result
 
         def dynamic_method(
@@ -414,8 +2566,13 @@ class QBenchAPI:
             data: Optional[Dict[str, Any]] = None, 
             page_limit: Optional[int] = None, 
             include_metadata: bool = False,
+            stream: bool = False,
+            by_page: bool = False,
+            max_in_flight: Optional[int] = None,
+            count: bool = False,
+            retry: Union[RetryPolicy, int, bool, None] = None,
             **kwargs
-        ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        ) -> Any:
             """
             Synchronous wrapper that handles async/sync context detection.
             
@@ -425,14 +2582,61 @@ class QBenchAPI:
                 data: Request body for POST/PATCH/PUT requests
                 page_limit: Max pages for paginated endpoints
                 include_metadata: Whether to include API metadata (default: False)
+                stream: Return a generator that yields entities as pages arrive
+                by_page: When streaming, yield each page's list of entities
+                max_in_flight: When streaming, max pages fetched ahead of the consumer
+                count: Return only ``total_count`` and ``total_pages``, read
+                    from a single one-entity request
+                retry: Retry override for this call: a RetryPolicy, a number
+                    of attempts, False for a single attempt, or True to also
+                    retry a POST/PATCH
                 **kwargs: Additional query parameters
                 
             Returns:
-                API response data (just the data by default, full response if include_metadata=True)
+                API response data (just the data by default, full response if
+                include_metadata=True).
+                With stream=True, an async generator inside a running event loop
+                and a regular generator otherwise.
             """
+            if stream:
+                if not endpoint_config.get('paginated'):
+                    raise QBenchValidationError(
+                        f"Endpoint '{name}' is not paginated and cannot be streamed"
+                    )
+                stream_kwargs = dict(
+                    use_v1=use_v1, 
+                    page_limit=page_limit, 
+                    path_params={"id": entity_id} if entity_id else {}, 
+                    by_page=by_page, 
+                    max_in_flight=max_in_flight,
+                    retry=retry,
+                    **kwargs
+                )
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    return self._iter_entities_sync(name, **stream_kwargs)
+                return self._iter_entities(name, **stream_kwargs)
+
+            if count:
+                if not endpoint_config.get('paginated'):
+                    raise QBenchValidationError(
+                        f"Endpoint '{name}' is not paginated and cannot be counted"
+                    )
+                count_path = {"id": entity_id} if entity_id else {}
+                count_args = (name, use_v1, count_path, kwargs, retry)
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    return self._count_entities_sync(*count_args)
+                return self._count_entities(*count_args)
+
             try:
                 # Check if we're in an async context
-                loop = asyncio.get_running_loop()
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
                 # If there's an active event loop, return coroutine for awaiting
                 return async_dynamic_method(
                     entity_id=entity_id, 
@@ -440,20 +2644,63 @@ class QBenchAPI:
                     page_limit=page_limit, 
                     data=data, 
                     include_metadata=include_metadata,
+                    retry=retry,
                     **kwargs
                 )
-            except RuntimeError:
-                # No active event loop; safe to call asyncio.run()
-                return asyncio.run(
-                    async_dynamic_method(
-                        entity_id=entity_id, 
-                        use_v1=use_v1, 
-                        page_limit=page_limit, 
-                        data=data, 
-                        include_metadata=include_metadata,
-                        **kwargs
+
+            if not endpoint_config.get('paginated'):
+                # Non-paginated calls go straight through the pooled requests
+                # session; there is nothing to gain from an event loop here
+                path_params = {"id": entity_id} if entity_id else {}
+                cache_key = self._response_cache_key(
+                    name, use_v1, path_params, 
+                    dict(kwargs, include_metadata=include_metadata)
+                )
+                if cache_key is not None and self._cache is not None:
+                    hit, cached = self._cache.get(cache_key)
+                    if hit:
+                        return cached
+
+                self._raise_if_not_found(name, use_v1, path_params)
+                result = None
+                try:
+                    result = self._make_request(
+                        endpoint_config.get('method', 'GET'), 
+                        name, 
+                        use_v1, 
+                        kwargs, 
+                        data, 
+                        path_params,
+                        retry=retry
                     )
+                except QBenchAPIError as e:
+                    self._remember_not_found(name, use_v1, path_params, e)
+                    raise
+                finally:
+                    self._apply_write_to_cache(name, use_v1, path_params, result)
+                if (
+                    not include_metadata 
+                    and isinstance(result, dict) 
+                    and 'data' in result
+                ):
+                    result = result['data']
+                if cache_key is not None and self._cache is not None:
+                    self._cache.set(cache_key, result)
+                return result
+
+            # No active event loop; run on the client's long-lived loop so
+            # the async session and its connections are reused across calls
+            return self._run_sync(
+                async_dynamic_method(
+                    entity_id=entity_id, 
+                    use_v1=use_v1, 
+                    page_limit=page_limit, 
+                    data=data, 
+                    include_metadata=include_metadata,
+                    retry=retry,
+                    **kwargs
                 )
+            )
             
         # Add docstring with endpoint information
         method_doc = f"""
@@ -469,11 +2716,16 @@ class QBenchAPI:
             data (dict, optional): Request body for POST/PATCH/PUT requests
             page_limit (int, optional): Max pages for paginated requests (None = all)
             include_metadata (bool): Include full API response metadata (default: False)
+            stream (bool): Yield entities as pages arrive instead of returning a list
+            by_page (bool): When streaming, yield one list of entities per page
+            max_in_flight (int, optional): When streaming, max pages fetched ahead
             **kwargs: Additional query parameters
             
         Returns:
             By default returns just the data (list or dict).
             If include_metadata=True, returns full API response with metadata.
+            If stream=True, returns a generator (an async generator when called
+            from a running event loop).
             
         Example:
             # Get single entity (returns just the entity data)
@@ -494,30 +2746,67 @@ class QBenchAPI:
         
         return dynamic_method
 
+    def warmup(self) -> Any:
+        """
+        Authenticate and open the HTTP session ahead of the first request.
+        
+        Useful with ``lazy_auth=True`` to pay the token round trip at a
+        moment of your choosing. Inside a running event loop this returns a
+        coroutine that authenticates over aiohttp and opens the loop's
+        session.
+        
+        Returns:
+            The client (or a coroutine returning it)
+            
+        Raises:
+            QBenchAuthError: If authentication fails
+            QBenchConnectionError: If connection to QBench fails
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._session.headers.update(
+                self._auth.bearer_headers(self._auth.get_access_token())
+            )
+            return self
+        return self._warmup_async()
+
+    async def _warmup_async(self) -> "QBenchAPI":
+        """Async implementation of `warmup`."""
+        session = await self._get_async_session()
+        await self._auth.get_access_token_async(session)
+        return self
+
     def health_check(self) -> Dict[str, Any]:
         """
         Perform a health check by making a simple API request.
         
+        With a circuit breaker, an open circuit fails the check without a
+        request, and the state of every circuit is included.
+        
         Returns:
             dict: Health check results
         """
         try:
             # Try to fetch a simple endpoint to verify connectivity
             result = self._make_request('GET', 'get_api_clients', params={'page_size': 1})
-            return {
+            health = {
                 'status': 'healthy',
                 'authenticated': self._auth.is_authenticated(),
                 'api_accessible': True,
                 'timestamp': time.time()
             }
         except Exception as e:
-            return {
+            health = {
                 'status': 'unhealthy',
                 'authenticated': self._auth.is_authenticated(),
                 'api_accessible': False,
                 'error': str(e),
                 'timestamp': time.time()
             }
+        if self._circuit_breaker is not None:
+            health['circuits'] = self._circuit_breaker.stats()
+        return health
     
     def list_available_endpoints(self) -> List[str]:
         """
@@ -549,7 +2838,27 @@ class QBenchAPI:
         return config
     
     def close(self) -> None:
-        """Close the HTTP session and clean up resources."""
+        """Close the HTTP sessions and clean up resources."""
+        if hasattr(self, '_loop_lock'):
+            self._stop_background_loop()
+        for loop, session in list(getattr(self, '_async_sessions', {}).items()):
+            self._async_sessions.pop(loop, None)
+            if session.closed or loop.is_closed():
+                continue
+            if loop.is_running():
+                # Owned by a loop we can't block on; schedule the close there
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+            else:
+                loop.run_until_complete(session.close())
+        if hasattr(self, '_auth'):
+            self._auth.close()
+        if getattr(self, '_owns_disk_cache', False) and self._disk_cache is not None:
+            self._disk_cache.close()
         if hasattr(self, '_session'):
             self._session.close()
             logger.debug("QBench API session closed")
+
+    async def aclose(self) -> None:
+        """Close the HTTP sessions from async code, awaiting the aiohttp session."""
+        await self._close_async_session()
+        self.close()
@@ -1,21 +1,154 @@
 """Authentication module for QBench SDK."""
 
+import asyncio
 import json
+import logging
+import os
+import sqlite3
+import threading
 import time
+import weakref
+import aiohttp
 import requests
 from hashlib import sha256
 from hmac import HMAC
 from base64 import urlsafe_b64encode
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from requests.exceptions import HTTPError, RequestException
 
 from .exceptions import QBenchAuthError, QBenchConnectionError
 
+logger = logging.getLogger(__name__)
+
+# Token lifetime assumed when the token response has no expires_in
+DEFAULT_TOKEN_LIFETIME = 50 * 60
+# Treat a token as expired this long (at most a tenth of its lifetime) early
+TOKEN_EXPIRY_MARGIN = 60
+
+
+class TokenStore:
+    """
+    Access tokens shared by every process on a host, kept in a SQLite file.
+
+    A process that finds a still-valid token in the store uses it instead of
+    minting its own. Refreshes are coordinated with an immediate (write)
+    transaction: the first process to need a new token holds the lock while
+    it fetches one, and processes queued behind it pick that token up
+    instead of fetching again.
+
+    Each operation opens its own short-lived connection, so a store can be
+    shared by threads and survives being pickled or forked into workers.
+    The file is created readable by its owner only, since it holds tokens.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Open (or create) the token store.
+
+        Args:
+            path (str): SQLite database file shared by the processes.
+            timeout (float): Seconds to wait for another process's refresh.
+        """
+        self.path = path
+        self.timeout = timeout
+        if not os.path.exists(path):
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tokens ("
+                "key TEXT PRIMARY KEY, access_token TEXT, expiry REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that leaves transaction control to the caller."""
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    @staticmethod
+    def make_key(base_url: str, api_key: str) -> str:
+        """Return the store key of one set of credentials."""
+        return sha256(f"{base_url.rstrip('/')}|{api_key}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """
+        Return a stored token that hasn't expired.
+
+        Args:
+            key (str): Key from `make_key`.
+
+        Returns:
+            tuple: ``(access_token, expiry)``, or None if there is no valid token.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT access_token, expiry FROM tokens WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None or row[1] <= time.time():
+            return None
+        return row[0], row[1]
+
+    def refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Tuple[str, float]],
+        stale_token: Optional[str] = None
+    ) -> Tuple[str, float]:
+        """
+        Return a valid token, fetching a new one only if no process has.
+
+        Args:
+            key (str): Key from `make_key`.
+            fetch (callable): Mints a token; returns ``(access_token, expiry)``.
+            stale_token (str): A token known to be rejected; it is replaced
+                even if it hasn't expired.
+
+        Returns:
+            tuple: ``(access_token, expiry)`` of the valid token.
+        """
+        conn = self._connect()
+        try:
+            # Taking the write lock up front serialises refreshes across processes
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT access_token, expiry FROM tokens WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > time.time() and row[0] != stale_token:
+                    conn.execute("ROLLBACK")
+                    return row[0], row[1]
+                token, expiry = fetch()
+                conn.execute(
+                    "INSERT OR REPLACE INTO tokens (key, access_token, expiry) VALUES (?, ?, ?)",
+                    (key, token, expiry)
+                )
+                conn.execute("COMMIT")
+                return token, expiry
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def __repr__(self) -> str:
+        return f"TokenStore(path={self.path!r})"
+
 
 class QBenchAuth:
     """Handles JWT-based authentication for QBench API."""
     
-    def __init__(self, base_url: str, api_key: str, api_secret: str):
+    def __init__(
+        self, 
+        base_url: str, 
+        api_key: str, 
+        api_secret: str, 
+        token_store: Union[str, TokenStore, None] = None,
+        auto_refresh: bool = False,
+        refresh_ahead: float = 300.0,
+        lazy: bool = False
+    ):
         """
         Initialize QBench authentication.
         
@@ -23,9 +156,19 @@ class QBenchAuth:
             base_url (str): The base URL of the QBench instance
             api_key (str): API key for authentication
             api_secret (str): API secret for authentication
+            token_store (str | TokenStore): Share access tokens with other
+                processes on this host through a SQLite file (a path or a
+                TokenStore), so only one of them mints each token
+            auto_refresh (bool): Refresh the token on a background thread
+                shortly before it expires, so requests never wait for one
+            refresh_ahead (float): Seconds before expiry to refresh in the
+                background (at most half the token's remaining lifetime)
+            lazy (bool): Don't fetch a token now; the first call that needs
+                one does
             
         Raises:
-            QBenchAuthError: If required authentication parameters are missing
+            QBenchAuthError: If required authentication parameters are missing,
+                or (unless lazy) if the initial authentication fails
         """
         if not all([base_url, api_key, api_secret]):
             raise QBenchAuthError(
@@ -38,10 +181,24 @@ class QBenchAuth:
         self._api_secret = api_secret
         self._access_token: Optional[str] = None
         self._token_expiry: int = 0
+        if isinstance(token_store, str):
+            token_store = TokenStore(token_store)
+        self._token_store: Optional[TokenStore] = token_store
+        self._store_key = TokenStore.make_key(self._base_url, api_key)
+        # One refresh at a time: threads share the lock, tasks on an event
+        # loop share that loop's refresh task
+        self._lock = threading.Lock()
+        self._async_refreshes: Dict[asyncio.AbstractEventLoop, asyncio.Future] = {}
+        self._auto_refresh = auto_refresh
+        self._refresh_ahead = refresh_ahead
+        self._refresh_timer: Optional[threading.Timer] = None
+
+        if lazy:
+            return
 
         # Perform initial authentication check
         try:
-            self._fetch_access_token()
+            self._obtain_access_token()
         except Exception as e:
             raise QBenchAuthError(f"Initial authentication failed: {e}")
 
@@ -77,6 +234,47 @@ class QBenchAuth:
         # Full signed token output
         signed_token = f"{token}.{signature_encoded}"
         return signed_token
+
+    def _token_url(self) -> str:
+        """Return the URL of the OAuth token endpoint."""
+        return f"{self._base_url}/qbench/oauth2/v1/token"
+
+    def _token_parameters(self) -> Dict[str, str]:
+        """Return the form parameters of a token request, with a fresh JWT."""
+        return {
+            "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+            "assertion": self._generate_jwt()
+        }
+
+    @staticmethod
+    def _expiry_from(token_data: Dict[str, Any]) -> int:
+        """
+        Return when a new token should be treated as expired.
+        
+        Uses the response's ``expires_in`` (seconds), less a small margin
+        for clock skew and request time; falls back to 50 minutes.
+        """
+        try:
+            lifetime = float(token_data.get('expires_in', 0))
+        except (TypeError, ValueError):
+            lifetime = 0
+        if lifetime <= 0:
+            return int(time.time()) + DEFAULT_TOKEN_LIFETIME
+        return int(time.time() + lifetime - min(TOKEN_EXPIRY_MARGIN, lifetime / 10))
+
+    @staticmethod
+    def _token_http_error(status_code: Optional[int], reason: str) -> QBenchAuthError:
+        """Map a failed token request to a QBenchAuthError."""
+        if status_code == 401:
+            return QBenchAuthError("Invalid API credentials provided.")
+        elif status_code == 403:
+            return QBenchAuthError("API access forbidden. Check your permissions.")
+        return QBenchAuthError(f"HTTP error during authentication: {reason}")
+
+    def _current_token(self) -> str:
+        """Return the current access token, or '' before one is obtained."""
+        return self._access_token or ""
+
     def _fetch_access_token(self) -> None:
         """
         Obtain an access token from QBench.
@@ -86,20 +284,9 @@ class QBenchAuth:
             QBenchConnectionError: If connection to QBench fails
         """
         try:
-            signed_token = self._generate_jwt()
-
-            # Prepare the request params
-            parameters = {
-                "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                "assertion": signed_token
-            }
-
-            # Endpoint to fetch the token
-            token_url = f"{self._base_url}/qbench/oauth2/v1/token"
-
             response = requests.post(
-                token_url, 
-                data=parameters,
+                self._token_url(), 
+                data=self._token_parameters(),
                 timeout=30,
                 headers={"Content-Type": "application/x-www-form-urlencoded"}
             )
@@ -107,25 +294,103 @@ class QBenchAuth:
             
             token_data = response.json()
             self._access_token = token_data.get('access_token')
-            
-            # Set expiry to 50 minutes to allow for refresh before actual expiry
-            self._token_expiry = int(time.time()) + (50 * 60)
+            self._token_expiry = self._expiry_from(token_data)
 
             if not self._access_token:
                 raise QBenchAuthError("Failed to obtain access token from response.")
 
         except HTTPError as e:
-            if e.response.status_code == 401:
-                raise QBenchAuthError("Invalid API credentials provided.")
-            elif e.response.status_code == 403:
-                raise QBenchAuthError("API access forbidden. Check your permissions.")
-            else:
-                raise QBenchAuthError(f"HTTP error during authentication: {e}")
+            raise self._token_http_error(e.response.status_code, str(e))
         except RequestException as e:
             raise QBenchConnectionError(f"Connection error during authentication: {e}")
         except Exception as e:
             raise QBenchAuthError(f"Unexpected error during authentication: {e}")
 
+    def _obtain_access_token(self, stale_token: Optional[str] = None) -> None:
+        """
+        Get a new access token, through the token store if there is one.
+        
+        Args:
+            stale_token: Token known to be rejected, which must not be reused
+            
+        Raises:
+            QBenchAuthError: If token acquisition fails
+            QBenchConnectionError: If connection to QBench fails
+        """
+        if self._token_store is None:
+            self._fetch_access_token()
+            self._schedule_refresh()
+            return
+
+        def fetch() -> Tuple[str, float]:
+            self._fetch_access_token()
+            return self._current_token(), self._token_expiry
+
+        try:
+            stored = None if stale_token else self._token_store.get(self._store_key)
+            if stored is None:
+                stored = self._token_store.refresh(self._store_key, fetch, stale_token)
+        except sqlite3.Error as e:
+            # The store is an optimisation; never fail authentication over it
+            logger.warning(f"Token store {self._token_store.path} unavailable: {e}")
+            fetch()
+        else:
+            self._access_token, expiry = stored
+            self._token_expiry = int(expiry)
+        self._schedule_refresh()
+
+    def _schedule_refresh(self, delay: Optional[float] = None) -> None:
+        """
+        Start the background refresh timer for the current token.
+        
+        Args:
+            delay: Seconds until the refresh; by default ``refresh_ahead``
+                before expiry, capped at half the remaining lifetime
+        """
+        if not self._auto_refresh:
+            return
+        if delay is None:
+            remaining = max(0.0, self._token_expiry - time.time())
+            delay = remaining - min(self._refresh_ahead, remaining / 2)
+        # The timer holds the auth object weakly, so a dropped client's
+        # auth stops refreshing instead of minting tokens until exit
+        timer = threading.Timer(
+            delay, self._refresh_if_alive, args=(weakref.ref(self), self._access_token)
+        )
+        timer.daemon = True
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        self._refresh_timer = timer
+        timer.start()
+
+    @staticmethod
+    def _refresh_if_alive(
+        auth_ref: "weakref.ReferenceType[QBenchAuth]", 
+        token: Optional[str]
+    ) -> None:
+        """Run `_background_refresh` unless the auth object is gone."""
+        auth = auth_ref()
+        if auth is not None:
+            auth._background_refresh(token)
+
+    def _background_refresh(self, token: Optional[str]) -> None:
+        """Replace ``token`` ahead of its expiry; runs on the timer thread."""
+        try:
+            # Passing the token as stale forces a refresh unless another
+            # thread (or process, via the store) has already replaced it
+            self.refresh(stale_token=token)
+        except Exception as e:
+            logger.warning(f"Background token refresh failed, retrying in 30s: {e}")
+            if int(time.time()) < self._token_expiry:
+                self._schedule_refresh(30.0)
+
+    def close(self) -> None:
+        """Stop the background refresh timer."""
+        timer = getattr(self, '_refresh_timer', None)
+        self._auto_refresh = False
+        if timer is not None:
+            timer.cancel()
+
     def get_access_token(self) -> str:
         """
         Retrieve a valid access token, refreshing if necessary.
@@ -136,23 +401,191 @@ class QBenchAuth:
         Raises:
             QBenchAuthError: If token refresh fails
         """
-        if not self._access_token or int(time.time()) >= self._token_expiry:
-            self._fetch_access_token()
-        return self._access_token
+        if self._needs_refresh():
+            return self.refresh()
+        return self._current_token()
 
-    def get_headers(self) -> Dict[str, str]:
+    async def get_access_token_async(
+        self, 
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> str:
         """
-        Return headers with Bearer authorization for authenticated requests.
+        Retrieve a valid access token without blocking the event loop.
+        
+        Args:
+            session (aiohttp.ClientSession): Session to request a new token
+                with; a temporary one is used if not given
         
         Returns:
-            Dict[str, str]: HTTP headers with authorization
+            str: Valid access token
+            
+        Raises:
+            QBenchAuthError: If token refresh fails
+        """
+        if self._needs_refresh():
+            return await self.refresh_async(session=session)
+        return self._current_token()
+
+    def _needs_refresh(self, stale_token: Optional[str] = None) -> bool:
+        """Whether the token is missing, expired or the one known to be rejected."""
+        return (
+            not self._access_token 
+            or int(time.time()) >= self._token_expiry 
+            or (stale_token is not None and self._access_token == stale_token)
+        )
+
+    def refresh(self, stale_token: Optional[str] = None) -> str:
+        """
+        Get a new access token, unless another thread already has.
+        
+        Concurrent callers queue on a lock; once the first has refreshed,
+        the rest find a valid token and return it without a request.
+        
+        Args:
+            stale_token (str): The token a request was rejected with (401).
+                It is replaced even if it hasn't expired; a different, valid
+                token means someone else already replaced it.
+        
+        Returns:
+            str: Valid access token
+            
+        Raises:
+            QBenchAuthError: If token refresh fails
+        """
+        with self._lock:
+            if self._needs_refresh(stale_token):
+                self._obtain_access_token(stale_token)
+            return self._current_token()
+
+    async def refresh_async(
+        self, 
+        stale_token: Optional[str] = None, 
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> str:
+        """
+        Get a new access token on the event loop, unless a task already is.
+        
+        All tasks on a loop that need a token while a refresh is in flight
+        await that same refresh. It takes the same lock as `refresh`, so a
+        thread and an event loop never both fetch a token. The token
+        endpoint is called with aiohttp; with a token store the refresh runs
+        in a thread instead, since waiting on another process's refresh
+        blocks.
+        
+        Args:
+            stale_token (str): The token a request was rejected with (401)
+            session (aiohttp.ClientSession): Session to request the token with
+        
+        Returns:
+            str: Valid access token
+            
+        Raises:
+            QBenchAuthError: If token refresh fails
+        """
+        if not self._needs_refresh(stale_token):
+            return self._current_token()
+        loop = asyncio.get_running_loop()
+        task = self._async_refreshes.get(loop)
+        if task is None:
+            task = loop.create_task(self._refresh_async(stale_token, session))
+            self._async_refreshes[loop] = task
+            task.add_done_callback(lambda _: self._async_refreshes.pop(loop, None))
+        # A waiter being cancelled must not cancel the others' refresh
+        return await asyncio.shield(task)
+
+    async def _refresh_async(
+        self, 
+        stale_token: Optional[str], 
+        session: Optional[aiohttp.ClientSession]
+    ) -> str:
+        """Run one refresh for `refresh_async`."""
+        if self._token_store is not None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.refresh, stale_token
+            )
+        await self._acquire_lock_async()
+        try:
+            # A thread may have refreshed while we waited; its token is as good
+            if self._needs_refresh(stale_token):
+                self._access_token, self._token_expiry = (
+                    await self._fetch_access_token_async(session)
+                )
+                self._schedule_refresh()
+            return self._current_token()
+        finally:
+            self._lock.release()
+
+    async def _acquire_lock_async(self) -> None:
+        """Take ``_lock`` without blocking the event loop while a thread holds it."""
+        # Polled, since a thread blocked acquiring it for a task that is then
+        # cancelled would take the lock and never give it back
+        while not self._lock.acquire(blocking=False):
+            await asyncio.sleep(0.01)
+
+    async def _fetch_access_token_async(
+        self, 
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> Tuple[str, int]:
         """
-        access_token = self.get_access_token()
+        Obtain an access token from QBench over aiohttp.
+        
+        Args:
+            session (aiohttp.ClientSession): Session to use; a temporary one
+                is opened if not given
+        
+        Returns:
+            tuple: The access token and when to refresh it (unix time)
+        
+        Raises:
+            QBenchAuthError: If token acquisition fails
+            QBenchConnectionError: If connection to QBench fails
+        """
+        own_session = session is None
+        if session is None:
+            session = aiohttp.ClientSession()
+        try:
+            async with session.post(
+                self._token_url(), 
+                data=self._token_parameters(),
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                if response.status >= 400:
+                    raise self._token_http_error(
+                        response.status, f"{response.status} {response.reason}"
+                    )
+                token_data = await response.json(content_type=None)
+        except QBenchAuthError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise QBenchConnectionError(f"Connection error during authentication: {e}")
+        except Exception as e:
+            raise QBenchAuthError(f"Unexpected error during authentication: {e}")
+        finally:
+            if own_session:
+                await session.close()
+
+        access_token = (token_data or {}).get('access_token')
+        if not access_token:
+            raise QBenchAuthError("Failed to obtain access token from response.")
+        return access_token, self._expiry_from(token_data)
+
+    @staticmethod
+    def bearer_headers(access_token: str) -> Dict[str, str]:
+        """Return request headers authorizing with an access token."""
         return {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
         }
 
+    def get_headers(self) -> Dict[str, str]:
+        """
+        Return headers with Bearer authorization for authenticated requests.
+        
+        Returns:
+            Dict[str, str]: HTTP headers with authorization
+        """
+        return self.bearer_headers(self.get_access_token())
+
     def is_authenticated(self) -> bool:
         """
         Check if the current token is valid and not expired.
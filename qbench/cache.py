@@ -0,0 +1,655 @@
+"""Response caching for QBench SDK."""
+
+import copy
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .endpoints import QBENCH_ENDPOINTS
+
+logger = logging.getLogger(__name__)
+
+# Endpoint key, API version, path parameters and query parameters (as JSON)
+CacheKey = Tuple[str, bool, str, str]
+
+
+def _path_segments(endpoint_key: str) -> List[str]:
+    """
+    Return the resource segments of an endpoint's path, without placeholders.
+
+    The v2 path is used when there is one, so v1 and v2 endpoints of the
+    same resource are related through it.
+    """
+    config = QBENCH_ENDPOINTS.get(endpoint_key, {})
+    path = config.get('v2') or config.get('v1') or ''
+    return [segment for segment in path.split('/') if segment and '{' not in segment]
+
+
+def _is_single_entity(endpoint_key: str) -> bool:
+    """Whether an endpoint is a plain ``<resource>/{id}`` path."""
+    config = QBENCH_ENDPOINTS.get(endpoint_key, {})
+    path = config.get('v2') or config.get('v1') or ''
+    return path.count('/') == 1 and path.endswith('/{id}')
+
+
+class ResponseCache:
+    """
+    In-memory cache of GET responses with per-endpoint TTLs and LRU eviction.
+
+    Entries are keyed by endpoint key, API version, path parameters and
+    query parameters. Every endpoint uses ``ttl`` unless ``endpoint_ttls``
+    overrides it; a TTL of 0 (or None) disables caching for that endpoint,
+    so ``ResponseCache(ttl=0, endpoint_ttls={"get_user": 600})`` caches only
+    users. Once ``max_size`` entries are stored, the least recently used
+    entry is evicted.
+
+    Values are copied on the way in and out, so callers can modify what
+    they get back without changing the cached response.
+
+    With ``not_found_ttl`` set, 404s of single-entity GETs (``get_sample``
+    and the like) are remembered too, so probing a deleted ID again raises
+    straight away. A create call for the resource forgets them.
+
+    Writes made through the client are applied with `apply_write`, using
+    the resource segments of the paths in QBENCH_ENDPOINTS: a write to
+    ``samples`` updates cached ``get_sample`` entries in place from the
+    entities it returns and evicts every other cached endpoint whose path
+    includes ``samples`` (``get_samples``, ``get_sample_tests``, ...).
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = 300.0,
+        endpoint_ttls: Optional[Dict[str, Optional[float]]] = None,
+        not_found_ttl: Optional[float] = None
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            max_size (int): Most entries kept before evicting the least
+                recently used one.
+            ttl (float): Seconds an entry stays fresh, for endpoints without
+                their own TTL. 0 or None caches nothing by default.
+            endpoint_ttls (dict): Per-endpoint TTL overrides keyed by
+                endpoint key, e.g. ``{"get_assay": 3600, "get_sample": 0}``.
+            not_found_ttl (float): Seconds a 404 of a single-entity GET is
+                remembered. 0 or None (the default) doesn't remember them.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str, Any]]" = OrderedDict()
+        self.not_found_ttl = not_found_ttl
+        self._not_found: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Lookups of remembered 404s, kept apart from the response hit rate
+        self._not_found_hits = 0
+        self._not_found_misses = 0
+
+    @staticmethod
+    def make_key(
+        endpoint_key: str,
+        use_v1: bool,
+        path_params: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]]
+    ) -> CacheKey:
+        """
+        Build the cache key of a request.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            use_v1 (bool): Whether the v1 API is used.
+            path_params (dict): Parameters for URL formatting.
+            params (dict): Query parameters and call options.
+
+        Returns:
+            tuple: A hashable key independent of parameter order.
+        """
+        return (
+            endpoint_key,
+            bool(use_v1),
+            json.dumps(path_params or {}, sort_keys=True, default=str),
+            json.dumps(params or {}, sort_keys=True, default=str),
+        )
+
+    def ttl_for(self, endpoint_key: str) -> Optional[float]:
+        """Return the TTL of an endpoint, or None if it isn't cached."""
+        ttl = self.endpoint_ttls.get(endpoint_key, self.ttl)
+        return ttl if ttl and ttl > 0 else None
+
+    def caches(self, endpoint_key: str) -> bool:
+        """Whether responses of an endpoint are cached at all."""
+        return self.ttl_for(endpoint_key) is not None
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        """
+        Look up a fresh entry.
+
+        Args:
+            key (tuple): Key from `make_key`.
+
+        Returns:
+            tuple: ``(True, value)`` on a hit, ``(False, None)`` on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            value = entry[2]
+        return True, copy.deepcopy(value)
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        """
+        Store a response under a key from `make_key`.
+
+        Args:
+            key (tuple): Key from `make_key`.
+            value: The response to cache.
+        """
+        ttl = self.ttl_for(key[0])
+        if ttl is None or self.max_size <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, key[0], value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_not_found(
+        self,
+        endpoint_key: str,
+        use_v1: bool,
+        path_params: Optional[Dict[str, Any]]
+    ) -> Tuple[bool, Any]:
+        """
+        Look up a remembered 404.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            use_v1 (bool): Whether the v1 API is used.
+            path_params (dict): Parameters for URL formatting.
+
+        Returns:
+            tuple: ``(True, response_data)`` of the 404 if the entity is
+            known to be missing, else ``(False, None)``.
+        """
+        if not self.not_found_ttl or self.not_found_ttl <= 0:
+            return False, None
+        key = self.make_key(endpoint_key, use_v1, path_params, None)
+        with self._lock:
+            entry = self._not_found.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._not_found[key]
+                entry = None
+            if entry is None:
+                self._not_found_misses += 1
+                return False, None
+            self._not_found.move_to_end(key)
+            self._not_found_hits += 1
+            response_data = entry[1]
+        return True, copy.deepcopy(response_data)
+
+    def set_not_found(
+        self,
+        endpoint_key: str,
+        use_v1: bool,
+        path_params: Optional[Dict[str, Any]],
+        response_data: Any = None
+    ) -> None:
+        """
+        Remember that a single-entity GET returned 404.
+
+        Ignored unless ``not_found_ttl`` is set and the endpoint is a plain
+        ``<resource>/{id}`` GET.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            use_v1 (bool): Whether the v1 API is used.
+            path_params (dict): Parameters for URL formatting.
+            response_data (dict): Body of the 404 response.
+        """
+        if not self.not_found_ttl or self.not_found_ttl <= 0 or self.max_size <= 0:
+            return
+        if (
+            QBENCH_ENDPOINTS.get(endpoint_key, {}).get('method', 'GET') != 'GET'
+            or not _is_single_entity(endpoint_key)
+        ):
+            return
+        key = self.make_key(endpoint_key, use_v1, path_params, None)
+        with self._lock:
+            self._not_found[key] = (
+                time.monotonic() + self.not_found_ttl, copy.deepcopy(response_data)
+            )
+            self._not_found.move_to_end(key)
+            while len(self._not_found) > self.max_size:
+                self._not_found.popitem(last=False)
+                self._evictions += 1
+
+    def apply_write(
+        self,
+        endpoint_key: str,
+        use_v1: bool,
+        path_params: Optional[Dict[str, Any]],
+        response: Any
+    ) -> Tuple[int, int]:
+        """
+        Bring the cache in line with a write made through the client.
+
+        Cached single entities returned by the write (``{"data": [...]}``, as
+        in the CreateResponse schemas) are replaced in place. Single entities
+        the write names but doesn't return are evicted, as is every cached
+        list of an affected resource. When the outcome of the write is
+        unknown (``response`` is None, e.g. after a timeout), every cached
+        entry of the affected resources is evicted.
+
+        A create (a POST to a top-level resource such as ``samples``) also
+        forgets the remembered 404s of that resource, since it may have
+        created one of those IDs.
+
+        Args:
+            endpoint_key (str): The write's endpoint key from QBENCH_ENDPOINTS.
+            use_v1 (bool): Whether the write used the v1 API.
+            path_params (dict): Path parameters of the write.
+            response: The write's response, or None if it failed.
+
+        Returns:
+            tuple: Number of entries updated and number evicted.
+        """
+        segments = _path_segments(endpoint_key)
+        if not segments:
+            return 0, 0
+        resources = set(segments)
+        creates = (
+            len(segments) == 1
+            and QBENCH_ENDPOINTS[endpoint_key].get('method') == 'POST'
+        )
+        written_id = (path_params or {}).get('id')
+
+        # Only a write to a top-level resource returns entities of that
+        # resource; nested writes (e.g. batches/{id}/tests) may not
+        entities: Dict[str, Any] = {}
+        if len(segments) == 1 and not use_v1 and isinstance(response, dict):
+            returned = response.get('data')
+            if isinstance(returned, list):
+                entities = {
+                    str(entity['id']): entity for entity in returned
+                    if isinstance(entity, dict) and 'id' in entity
+                }
+        # Without an ID or returned entities, any entity may have changed
+        precise = response is not None and (written_id is not None or entities)
+
+        updated = evicted = 0
+        with self._lock:
+            for key, (expires, cached_key, value) in list(self._entries.items()):
+                if not resources.intersection(_path_segments(cached_key)):
+                    continue
+                if (
+                    precise
+                    and _is_single_entity(cached_key)
+                    and _path_segments(cached_key) == segments
+                ):
+                    entity_id = str(json.loads(key[2]).get('id'))
+                    options = json.loads(key[3])
+                    entity = entities.get(entity_id)
+                    if entity is not None and not key[1] and options in (
+                        {'include_metadata': False}, {'include_metadata': True}
+                    ):
+                        value = {'data': entity} if options['include_metadata'] else entity
+                        self._entries[key] = (expires, cached_key, copy.deepcopy(value))
+                        updated += 1
+                        continue
+                    if entity is None and entity_id != str(written_id):
+                        continue
+                del self._entries[key]
+                evicted += 1
+            if creates:
+                for key in list(self._not_found):
+                    if _path_segments(key[0]) == segments:
+                        del self._not_found[key]
+                        evicted += 1
+        return updated, evicted
+
+    def invalidate(self, endpoint_key: Optional[str] = None) -> int:
+        """
+        Drop cached entries, for one endpoint or all of them.
+
+        Args:
+            endpoint_key (str): Endpoint whose entries to drop; None for all.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        with self._lock:
+            if endpoint_key is None:
+                dropped = len(self._entries) + len(self._not_found)
+                self._entries.clear()
+                self._not_found.clear()
+                return dropped
+            keys = [k for k, entry in self._entries.items() if entry[1] == endpoint_key]
+            for k in keys:
+                del self._entries[k]
+            missing = [k for k in self._not_found if k[0] == endpoint_key]
+            for k in missing:
+                del self._not_found[k]
+            return len(keys) + len(missing)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._not_found.clear()
+            self._hits = self._misses = self._evictions = 0
+            self._not_found_hits = self._not_found_misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache statistics.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``evictions``, ``size``,
+            ``hit_rate`` (hits over lookups, 0.0 before any lookup),
+            ``not_found`` (remembered 404s), and ``not_found_hits`` and
+            ``not_found_misses`` (lookups of remembered 404s, which are
+            not part of ``hit_rate``).
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'size': len(self._entries),
+                'not_found': len(self._not_found),
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'not_found_hits': self._not_found_hits,
+                'not_found_misses': self._not_found_misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"ResponseCache(size={len(self._entries)}/{self.max_size}, "
+            f"ttl={self.ttl})"
+        )
+
+
+class DiskCache:
+    """
+    SQLite-backed cache of complete paginated results, shared across processes.
+
+    Each cached collection (endpoint, version, path and query parameters)
+    stores its entities, its first-page metadata and a ``last_updated``
+    watermark. Until ``max_age`` has passed since its last full fetch, a
+    collection is revalidated incrementally: endpoints with a
+    ``last_updated`` filter fetch only the entities changed since the
+    watermark and merge them by ID. Other endpoints (``get_users``,
+    ``get_divisions``, ...) can't ask what changed, so they are checked
+    with a one-entity request comparing ``total_count`` (a changed count
+    means a full fetch) and fetched in full again after the shorter
+    ``static_max_age``, which bounds how long an edit goes unseen. A
+    collection revalidated less than ``revalidate_after`` seconds ago (by
+    any process using the same file) is served without a request.
+
+    Delta queries can't see deletions, so ``max_age`` also bounds how long
+    a deleted entity can linger.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        endpoints: Optional[Iterable[str]] = None,
+        max_age: float = 86400.0,
+        revalidate_after: float = 60.0,
+        overlap: float = 60.0,
+        static_max_age: float = 3600.0
+    ):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path (str): SQLite database file, shared by every process using it.
+            endpoints (iterable): Paginated endpoint keys to cache, e.g.
+                ``["get_assays", "get_users"]``. None caches all of them.
+            max_age (float): Seconds after which a collection is fetched in
+                full again.
+            revalidate_after (float): Seconds a revalidated collection is
+                served without asking the server.
+            overlap (float): Seconds the watermark is moved back to cover
+                clock skew between this host and the server.
+            static_max_age (float): ``max_age`` of endpoints without a
+                ``last_updated`` filter.
+        """
+        self.path = path
+        self.endpoints = set(endpoints) if endpoints is not None else None
+        self.max_age = max_age
+        self.revalidate_after = revalidate_after
+        self.overlap = overlap
+        self.static_max_age = static_max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL lets other processes read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS collections ("
+                "key TEXT PRIMARY KEY, endpoint_key TEXT, metadata TEXT, "
+                "watermark REAL, refreshed REAL, full_refreshed REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entities ("
+                "key TEXT, entity_id TEXT, body TEXT, PRIMARY KEY (key, entity_id))"
+            )
+
+    def caches(self, endpoint_key: str) -> bool:
+        """Whether an endpoint's complete results are cached on disk."""
+        return self.endpoints is None or endpoint_key in self.endpoints
+
+    def max_age_for(self, incremental: bool) -> float:
+        """Seconds between full fetches of a collection, by whether it has delta queries."""
+        return self.max_age if incremental else min(self.max_age, self.static_max_age)
+
+    @staticmethod
+    def make_key(
+        endpoint_key: str,
+        use_v1: bool,
+        path_params: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]]
+    ) -> str:
+        """Build the key of a collection; see `ResponseCache.make_key`."""
+        return json.dumps(ResponseCache.make_key(endpoint_key, use_v1, path_params, params))
+
+    def state(self, key: str) -> Optional[Dict[str, float]]:
+        """
+        Return when a collection was last fetched.
+
+        Args:
+            key (str): Key from `make_key`.
+
+        Returns:
+            dict: ``watermark``, ``refreshed`` and ``full_refreshed`` unix
+            times, or None if the collection isn't stored.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, refreshed, full_refreshed FROM collections WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'watermark': row[0], 'refreshed': row[1], 'full_refreshed': row[2]}
+
+    def count(self, key: str) -> int:
+        """Return the number of entities stored for a collection."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM entities WHERE key = ?", (key,)
+            ).fetchone()
+        return int(row[0])
+
+    def load(self, key: str) -> Tuple[List[Any], Dict[str, Any]]:
+        """
+        Return a stored collection.
+
+        Args:
+            key (str): Key from `make_key`.
+
+        Returns:
+            tuple: The entities in the order first fetched, and the metadata.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata FROM collections WHERE key = ?", (key,)
+            ).fetchone()
+            bodies = self._conn.execute(
+                "SELECT body FROM entities WHERE key = ? ORDER BY rowid", (key,)
+            ).fetchall()
+        metadata = json.loads(row[0]) if row else {}
+        return [json.loads(body) for (body,) in bodies], metadata
+
+    def replace(
+        self,
+        key: str,
+        endpoint_key: str,
+        entities: List[Any],
+        metadata: Dict[str, Any],
+        started: float
+    ) -> None:
+        """
+        Store a fully fetched collection.
+
+        Args:
+            key (str): Key from `make_key`.
+            endpoint_key (str): The collection's endpoint key.
+            entities (list): Every entity of the collection.
+            metadata (dict): First-page metadata of the fetch.
+            started (float): Unix time the fetch started.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entities WHERE key = ?", (key,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entities (key, entity_id, body) VALUES (?, ?, ?)",
+                [
+                    (key, self._entity_id(entity, index), json.dumps(entity))
+                    for index, entity in enumerate(entities)
+                ]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO collections "
+                "(key, endpoint_key, metadata, watermark, refreshed, full_refreshed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint_key, json.dumps(metadata), started - self.overlap,
+                 started, started)
+            )
+
+    def merge(self, key: str, entities: List[Any], started: float) -> None:
+        """
+        Merge the entities changed since the watermark into a collection.
+
+        Args:
+            key (str): Key from `make_key`.
+            entities (list): Entities returned by the delta query.
+            started (float): Unix time the delta query started.
+        """
+        skipped = 0
+        with self._lock, self._conn:
+            for entity in entities:
+                # A position in the delta says nothing about the stored
+                # position, so an entity without an ID cannot be matched
+                if not (isinstance(entity, dict) and 'id' in entity):
+                    skipped += 1
+                    continue
+                entity_id = self._entity_id(entity)
+                body = json.dumps(entity)
+                # Keep a changed entity's position; append new ones
+                updated = self._conn.execute(
+                    "UPDATE entities SET body = ? WHERE key = ? AND entity_id = ?",
+                    (body, key, entity_id)
+                )
+                if not updated.rowcount:
+                    self._conn.execute(
+                        "INSERT INTO entities (key, entity_id, body) VALUES (?, ?, ?)",
+                        (key, entity_id, body)
+                    )
+            self._conn.execute(
+                "UPDATE collections SET watermark = ?, refreshed = ? WHERE key = ?",
+                (started - self.overlap, started, key)
+            )
+        if skipped:
+            logger.warning(
+                f"Skipped {skipped} entities without an ID while merging into {key}"
+            )
+
+    def touch(self, key: str, started: float) -> None:
+        """Record that a collection was revalidated without changes."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE collections SET refreshed = ? WHERE key = ?", (started, key)
+            )
+
+    def apply_write(self, endpoint_key: str) -> int:
+        """
+        Drop stored collections a write may have changed.
+
+        Collections are related to the write the same way as in
+        `ResponseCache.apply_write`; they are fetched in full next time.
+
+        Args:
+            endpoint_key (str): The write's endpoint key from QBENCH_ENDPOINTS.
+
+        Returns:
+            int: Number of collections dropped.
+        """
+        resources = set(_path_segments(endpoint_key))
+        with self._lock:
+            rows = self._conn.execute("SELECT key, endpoint_key FROM collections").fetchall()
+        keys = [
+            key for key, cached_key in rows
+            if resources.intersection(_path_segments(cached_key))
+        ]
+        for key in keys:
+            self.invalidate(key)
+        return len(keys)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one stored collection, or all of them."""
+        with self._lock, self._conn:
+            if key is None:
+                self._conn.execute("DELETE FROM entities")
+                self._conn.execute("DELETE FROM collections")
+            else:
+                self._conn.execute("DELETE FROM entities WHERE key = ?", (key,))
+                self._conn.execute("DELETE FROM collections WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _entity_id(entity: Any, index: Optional[int] = None) -> str:
+        """Return the ID an entity is stored under."""
+        if isinstance(entity, dict) and 'id' in entity:
+            return str(entity['id'])
+        return f"#{index}"
+
+    def __repr__(self) -> str:
+        return f"DiskCache(path={self.path!r}, max_age={self.max_age})"
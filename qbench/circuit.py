@@ -0,0 +1,253 @@
+"""Circuit breaker for QBench SDK requests."""
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+from .exceptions import (
+    QBenchAPIError,
+    QBenchCircuitOpenError,
+    QBenchConnectionError,
+    QBenchTimeoutError,
+    QBenchValidationError
+)
+
+logger = logging.getLogger(__name__)
+
+# Circuit states
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Resource segment of an API path, e.g. "samples" in /qbench/api/v2/samples/12
+_ENDPOINT_GROUP = re.compile(r'/api/v\d+/([^/]+)')
+
+
+class _Circuit:
+    """State of one circuit."""
+
+    __slots__ = ('state', 'failures', 'opened_at', 'probes', 'trips')
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.trips = 0
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a QBench instance is failing, instead of piling up retries.
+
+    Each circuit starts closed and counts consecutive failures: timeouts,
+    connection errors and 5xx responses. After ``failure_threshold`` of
+    them it opens, and requests fail at once with `QBenchCircuitOpenError`
+    without reaching the network. After ``recovery_timeout`` seconds it is
+    half-open: up to ``half_open_max_calls`` probe requests go through at a
+    time while the rest keep failing fast. A successful probe closes the
+    circuit, a failed one opens it again.
+
+    Circuits are kept per instance (scheme and host) or, with
+    ``per_endpoint``, per instance and endpoint group (the resource of the
+    URL, e.g. ``samples``), so a failing report endpoint doesn't stop sample
+    reads. Any response from the server other than a 5xx, including a 404,
+    counts as success; a 429 counts as neither.
+
+    The breaker can be shared by several clients, threads and event loops.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        per_endpoint: bool = False
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open a circuit.
+            recovery_timeout (float): Seconds a circuit stays open before
+                letting probe requests through.
+            half_open_max_calls (int): Probe requests allowed in flight at
+                once while half-open.
+            per_endpoint (bool): Keep a circuit per endpoint group rather
+                than one per instance.
+
+        Raises:
+            QBenchValidationError: If a threshold or timeout is not positive.
+        """
+        if failure_threshold < 1 or half_open_max_calls < 1:
+            raise QBenchValidationError(
+                "failure_threshold and half_open_max_calls must be at least 1"
+            )
+        if recovery_timeout <= 0:
+            raise QBenchValidationError("recovery_timeout must be positive")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.per_endpoint = per_endpoint
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> Tuple[Type["CircuitBreaker"], Tuple[int, float, int, bool]]:
+        # Worker processes get a breaker with the same settings, fresh state
+        return (
+            self.__class__,
+            (self.failure_threshold, self.recovery_timeout,
+             self.half_open_max_calls, self.per_endpoint)
+        )
+
+    def key_for(self, url: str) -> str:
+        """
+        Return the circuit a request URL belongs to.
+
+        Args:
+            url (str): Full request URL.
+
+        Returns:
+            str: ``scheme://host``, followed by ``/<group>`` when per endpoint.
+        """
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        if self.per_endpoint:
+            match = _ENDPOINT_GROUP.search(parts.path)
+            if match:
+                key = f"{key}/{match.group(1)}"
+        return key
+
+    @staticmethod
+    def is_failure(error: BaseException) -> bool:
+        """Whether an error shows the server failing, as opposed to refusing."""
+        if isinstance(error, (QBenchTimeoutError, QBenchConnectionError)):
+            return True
+        return (
+            isinstance(error, QBenchAPIError)
+            and error.status_code is not None
+            and error.status_code >= 500
+        )
+
+    def before_request(self, key: str) -> None:
+        """
+        Let a request through or refuse it; pair with `record`.
+
+        Args:
+            key (str): Circuit of the request, from `key_for`.
+
+        Raises:
+            QBenchCircuitOpenError: If the circuit is open, or half-open with
+                all probe slots taken.
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.state == CLOSED:
+                return
+            now = time.monotonic()
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + self.recovery_timeout - now
+                if remaining > 0:
+                    raise QBenchCircuitOpenError(
+                        f"Circuit for {key} is open; retry in {remaining:.1f}s",
+                        key, remaining
+                    )
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+                logger.info(f"Circuit for {key} is half-open; probing")
+            if circuit.probes >= self.half_open_max_calls:
+                raise QBenchCircuitOpenError(
+                    f"Circuit for {key} is half-open and waiting on a probe request",
+                    key, 0.0
+                )
+            circuit.probes += 1
+
+    def record(self, key: str, error: Optional[BaseException] = None) -> None:
+        """
+        Record the outcome of a request let through by `before_request`.
+
+        Args:
+            key (str): Circuit of the request.
+            error (Exception): What the request raised, or None on success.
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                if error is None or not self.is_failure(error):
+                    return
+                circuit = self._circuits[key] = _Circuit()
+            probe = circuit.state == HALF_OPEN
+            if probe:
+                circuit.probes = max(0, circuit.probes - 1)
+
+            if error is not None and self.is_failure(error):
+                circuit.failures += 1
+                if probe or (circuit.state == CLOSED and circuit.failures >= self.failure_threshold):
+                    circuit.state = OPEN
+                    circuit.opened_at = time.monotonic()
+                    circuit.trips += 1
+                    logger.warning(
+                        f"Circuit for {key} opened after {circuit.failures} "
+                        f"consecutive failures: {error}"
+                    )
+            elif error is None or (
+                isinstance(error, QBenchAPIError) and error.status_code not in (None, 429)
+            ):
+                # The server answered
+                if circuit.state != CLOSED:
+                    logger.info(f"Circuit for {key} closed")
+                circuit.state = CLOSED
+                circuit.failures = 0
+            # Anything else (cancellation, a 429) says nothing about health
+
+    def state(self, key: str) -> str:
+        """Return the state of a circuit: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and time.monotonic() >= circuit.opened_at + self.recovery_timeout:
+                return HALF_OPEN
+            return circuit.state
+
+    def reset(self) -> None:
+        """Close all circuits."""
+        with self._lock:
+            self._circuits.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return circuit breaker statistics.
+
+        Returns:
+            dict: Per circuit key, its ``state``, consecutive ``failures``,
+            ``trips`` (times it opened) and ``retry_after`` (seconds until
+            an open circuit probes again, else 0).
+        """
+        with self._lock:
+            now = time.monotonic()
+            stats = {}
+            for key, circuit in self._circuits.items():
+                remaining = 0.0
+                state = circuit.state
+                if state == OPEN:
+                    remaining = max(0.0, circuit.opened_at + self.recovery_timeout - now)
+                    if remaining == 0:
+                        state = HALF_OPEN
+                stats[key] = {
+                    'state': state,
+                    'failures': circuit.failures,
+                    'trips': circuit.trips,
+                    'retry_after': remaining,
+                }
+            return stats
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitBreaker(failure_threshold={self.failure_threshold}, "
+            f"recovery_timeout={self.recovery_timeout}, "
+            f"per_endpoint={self.per_endpoint})"
+        )
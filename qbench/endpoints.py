@@ -9,9 +9,20 @@ but should be used carefully as their structure can change from instance to inst
 and they do not have the same output structure as v2. These may be included at a later 
 date if needed, but all work should be attempted in v2 first. Some data however is less
 accessible in v2 unless you make multiple API calls.
+
+Paginated endpoints that accept an ID range filter (e.g. sample_id_range_start and
+sample_id_range_end) declare its prefix as "id_range". "id_range_field" names the
+entity field the range applies to when it is not the entity's own "id" (tests are
+filtered by their sample's ID). Keyset scans need the range to be on "id".
+List endpoints that accept an "ids" list filter are marked "ids_filter" and can be
+used by get_many to fetch many entities per request. List endpoints with a
+"last_updated" filter (entities changed since a unix timestamp) are marked
+"last_updated" so DiskCache can revalidate them with delta queries.
 """
 
-QBENCH_ENDPOINTS = {
+from typing import Any, Dict
+
+QBENCH_ENDPOINTS: Dict[str, Dict[str, Any]] = {
     # ACCESSIONING_TYPE
     "get_accessioning_type": {"method": "GET", "v2": "accessioning-types/{id}", "v1": None},
     "get_accessioning_types": {"method": "GET", "v2": "accessioning-types", "v1": None, "paginated": True},
@@ -24,7 +35,7 @@ QBENCH_ENDPOINTS = {
     "create_assays": {"method": "POST", "v2": "assays", "v1": None},
 
     "get_assay": {"method": "GET", "v2": "assays/{id}", "v1": "assay/{id}"},
-    "get_assays": {"method": "GET", "v2": "assays", "v1": "assay", "paginated": True},
+    "get_assays": {"method": "GET", "v2": "assays", "v1": "assay", "paginated": True, "last_updated": True},
 
     "get_assay_divisions": {"method": "GET", "v2": "assays/{id}/divisions", "v1": None, "paginated": True},
     "get_assay_panels": {"method": "GET", "v2": "assays/{id}/panels", "v1": None, "paginated": True},
@@ -56,12 +67,12 @@ QBENCH_ENDPOINTS = {
 
     # BATCH
     "get_batch": {"method": "GET", "v2": "batches/{id}", "v1": "assay/{id}"},
-    "get_batches": {"method": "GET", "v2": "batches", "v1": "assay", "paginated": True},
+    "get_batches": {"method": "GET", "v2": "batches", "v1": "assay", "paginated": True, "ids_filter": True, "last_updated": True},
 
     "get_batch_children": {"method": "GET", "v2": "batches/{id}/children", "v1": None, "paginated": True},
     "get_batch_parents": {"method": "GET", "v2": "batches/{id}/parents", "v1": None, "paginated": True},
-    "get_batch_samples": {"method": "GET", "v2": "batches/{id}/samples", "v1": None, "paginated": True},
-    "get_batch_tests": {"method": "GET", "v2": "batches/{id}/tests", "v1": None, "paginated": True},
+    "get_batch_samples": {"method": "GET", "v2": "batches/{id}/samples", "v1": None, "paginated": True, "id_range": "sample_id"},
+    "get_batch_tests": {"method": "GET", "v2": "batches/{id}/tests", "v1": None, "paginated": True, "id_range": "sample_id", "id_range_field": "sample_id"},
     "get_batch_attachments": {"method": "GET", "v2": "batches/{id}/attachments", "v1": None, "paginated": True},
     "get_batch_worksheet_data": {"method": "GET", "v2": "batches/{id}/worksheet/data", "v1": None},
      
@@ -69,7 +80,7 @@ QBENCH_ENDPOINTS = {
     "create_contacts": {"method": "POST", "v2": "contacts", "v1": None},
 
     "get_contact": {"method": "GET", "v2": "contacts/{id}", "v1": "contact/{id}"},
-    "get_contacts": {"method": "GET", "v2": "contacts", "v1": "contact", "paginated": True},
+    "get_contacts": {"method": "GET", "v2": "contacts", "v1": "contact", "paginated": True, "last_updated": True},
 
     "get_contact_customers": {"method": "GET", "v2": "contacts/{id}/customers", "v1": None, "paginated": True},
 
@@ -80,7 +91,7 @@ QBENCH_ENDPOINTS = {
     "create_customers": {"method": "POST", "v2": "customers", "v1": None},
 
     "get_customer": {"method": "GET", "v2": "customers/{id}", "v1": "customer/{id}"},
-    "get_customers": {"method": "GET", "v2": "customers", "v1": "customer", "paginated": True},
+    "get_customers": {"method": "GET", "v2": "customers", "v1": "customer", "paginated": True, "last_updated": True},
     "get_customer_contacts": {"method": "GET", "v2": "customers/{id}/contacts", "v1": None, "paginated": True},
     "get_customer_divisions": {"method": "GET", "v2": "customers/{id}/divisions", "v1": None, "paginated": True},
     "get_customer_sources": {"method": "GET", "v2": "customers/{id}/sources", "v1": None, "paginated": True},
@@ -102,7 +113,7 @@ QBENCH_ENDPOINTS = {
     "create_invoices": {"method": "POST", "v2": "invoices", "v1": None},
 
     "get_invoice": {"method": "GET", "v2": "invoices/{id}", "v1": "invoice/{id}"},
-    "get_invoices": {"method": "GET", "v2": "invoices", "v1": "invoice", "paginated": True},
+    "get_invoices": {"method": "GET", "v2": "invoices", "v1": "invoice", "paginated": True, "last_updated": True},
     "get_invoice_orders": {"method": "GET", "v2": "invoices/{id}/orders", "v1": None, "paginated": True},
     "get_invoice_payments": {"method": "GET", "v2": "invoices/{id}/payments", "v1": None, "paginated": True},
     "get_invoice_invoice_items": {"method": "GET", "v2": "invoices/{id}/invoice-items", "v1": None, "paginated": True},
@@ -146,11 +157,11 @@ QBENCH_ENDPOINTS = {
     "create_orders": {"method": "POST", "v2": "orders", "v1": None},
 
     "get_order": {"method": "GET", "v2": "orders/{id}", "v1": "order/{id}"},
-    "get_orders": {"method": "GET", "v2": "orders", "v1": "order", "paginated": True},
+    "get_orders": {"method": "GET", "v2": "orders", "v1": "order", "paginated": True, "ids_filter": True, "last_updated": True},
     "get_order_invoices": {"method": "GET", "v2": "orders/{id}/invoices", "v1": None, "paginated": True},
     "get_order_reports": {"method": "GET", "v2": "orders/{id}/reports", "v1": None, "paginated": True},
-    "get_order_samples": {"method": "GET", "v2": "orders/{id}/samples", "v1": None, "paginated": True},
-    "get_order_tests": {"method": "GET", "v2": "orders/{id}/tests", "v1": None, "paginated": True},
+    "get_order_samples": {"method": "GET", "v2": "orders/{id}/samples", "v1": None, "paginated": True, "id_range": "sample_id"},
+    "get_order_tests": {"method": "GET", "v2": "orders/{id}/tests", "v1": None, "paginated": True, "id_range": "sample_id", "id_range_field": "sample_id"},
     "get_order_attachments": {"method": "GET", "v2": "orders/{id}/attachments", "v1": None, "paginated": True},
 
     "update_orders": {"method": "PATCH", "v2": "orders", "v1": None},
@@ -161,7 +172,7 @@ QBENCH_ENDPOINTS = {
     "create_panels": {"method": "POST", "v2": "panels", "v1": None},
 
     "get_panel": {"method": "GET", "v2": "panels/{id}", "v1": "panel/{id}"},
-    "get_panels": {"method": "GET", "v2": "panels", "v1": "panel", "paginated": True},
+    "get_panels": {"method": "GET", "v2": "panels", "v1": "panel", "paginated": True, "ids_filter": True, "last_updated": True},
     "get_panel_assays": {"method": "GET", "v2": "panels/{id}/assays", "v1": None, "paginated": True},
 
     "update_panels": {"method": "PATCH", "v2": "panels", "v1": None},
@@ -202,11 +213,11 @@ QBENCH_ENDPOINTS = {
     "create_samples": {"method": "POST", "v2": "samples", "v1": None},
 
     "get_sample": {"method": "GET", "v2": "samples/{id}", "v1": "sample/{id}"},
-    "get_samples": {"method": "GET", "v2": "samples", "v1": "sample", "paginated": True},
+    "get_samples": {"method": "GET", "v2": "samples", "v1": "sample", "paginated": True, "id_range": "sample_id", "ids_filter": True, "last_updated": True},
     "get_sample_batches": {"method": "GET", "v2": "samples/{id}/batches", "v1": None, "paginated": True},
     "get_sample_reports": {"method": "GET", "v2": "samples/{id}/reports", "v1": None, "paginated": True},
-    "get_sample_subsamples": {"method": "GET", "v2": "samples/{id}/sub-samples", "v1": None, "paginated": True},
-    "get_sample_tests": {"method": "GET", "v2": "samples/{id}/tests", "v1": None, "paginated": True},
+    "get_sample_subsamples": {"method": "GET", "v2": "samples/{id}/sub-samples", "v1": None, "paginated": True, "id_range": "sample_id"},
+    "get_sample_tests": {"method": "GET", "v2": "samples/{id}/tests", "v1": None, "paginated": True, "id_range": "sample_id", "id_range_field": "sample_id"},
     "get_sample_attachments": {"method": "GET", "v2": "samples/{id}/attachments", "v1": None, "paginated": True},
 
     "update_samples": {"method": "PATCH", "v2": "samples", "v1": None},
@@ -225,7 +236,7 @@ QBENCH_ENDPOINTS = {
     "create_tests": {"method": "POST", "v2": "tests", "v1": None},
 
     "get_test": {"method": "GET", "v2": "tests/{id}", "v1": "test/{id}"},
-    "get_tests": {"method": "GET", "v2": "tests", "v1": "test", "paginated": True},
+    "get_tests": {"method": "GET", "v2": "tests", "v1": "test", "paginated": True, "id_range": "sample_id", "id_range_field": "sample_id", "ids_filter": True, "last_updated": True},
     "get_test_batches": {"method": "GET", "v2": "tests/{id}/batches", "v1": None, "paginated": True},
     "get_test_reports": {"method": "GET", "v2": "tests/{id}/reports", "v1": None, "paginated": True},
     "get_test_attachments": {"method": "GET", "v2": "tests/{id}/attachments", "v1": None, "paginated": True},
@@ -1,6 +1,6 @@
 """Custom exceptions for QBench SDK."""
 
-from typing import Optional, Dict, Any
+from typing import Any, Dict, Optional, Tuple, Type
 
 
 class QBenchError(Exception):
@@ -15,19 +15,29 @@ class QBenchAPIError(QBenchError):
         message -- explanation of the error
         status_code -- HTTP status code if available
         response_data -- API response data if available
+        retry_after -- seconds the server asked to wait (Retry-After), if any
     """
     
     def __init__(
         self, 
         message: str, 
         status_code: Optional[int] = None, 
-        response_data: Optional[Dict[str, Any]] = None
+        response_data: Optional[Dict[str, Any]] = None,
+        retry_after: Optional[float] = None
     ):
         self.message = message
         self.status_code = status_code
         self.response_data = response_data
+        self.retry_after = retry_after
         super().__init__(self.message)
 
+    def __reduce__(self) -> Tuple[Type["QBenchAPIError"], Tuple[Any, ...]]:
+        # Keep status and data when raised in a worker process
+        return (
+            self.__class__, 
+            (self.message, self.status_code, self.response_data, self.retry_after)
+        )
+
     def __str__(self) -> str:
         if self.status_code:
             return f"HTTP {self.status_code}: {self.message}"
@@ -52,3 +62,46 @@ class QBenchValidationError(QBenchError):
 class QBenchTimeoutError(QBenchError):
     """Exception raised for timeout errors."""
     pass
+
+
+class QBenchPaginationError(QBenchError):
+    """Exception raised when a paginated fetch fails part-way through.
+
+    Attributes:
+        message -- explanation of the error
+        checkpoint -- PaginationCheckpoint of the completed pages, which can
+            be passed back to the same call to resume it
+    """
+
+    def __init__(self, message: str, checkpoint: Optional[Any] = None):
+        self.message = message
+        self.checkpoint = checkpoint
+        super().__init__(self.message)
+
+    def __reduce__(self) -> Tuple[Type["QBenchPaginationError"], Tuple[Any, ...]]:
+        return (self.__class__, (self.message, self.checkpoint))
+
+
+class QBenchCircuitOpenError(QBenchError):
+    """Exception raised when a request is refused by an open circuit breaker.
+
+    Attributes:
+        message -- explanation of the error
+        circuit -- key of the open circuit (the instance, or instance and
+            endpoint group)
+        retry_after -- seconds until the circuit lets a probe request through
+    """
+
+    def __init__(
+        self, 
+        message: str, 
+        circuit: Optional[str] = None, 
+        retry_after: Optional[float] = None
+    ):
+        self.message = message
+        self.circuit = circuit
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+    def __reduce__(self) -> Tuple[Type["QBenchCircuitOpenError"], Tuple[Any, ...]]:
+        return (self.__class__, (self.message, self.circuit, self.retry_after))
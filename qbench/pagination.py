@@ -0,0 +1,315 @@
+"""Pagination helpers for QBench SDK."""
+
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .exceptions import QBenchValidationError
+
+
+class AdaptivePageSize:
+    """
+    Chooses ``page_size`` per endpoint from what the server accepts and how
+    pages perform.
+
+    The first scan of an endpoint probes with ``max_size``. If the server
+    returns fewer rows than requested while more exist, it has capped the
+    page size, and that cap becomes the endpoint's limit. Every page fetched
+    afterwards reports its latency and payload size: slow or heavy pages
+    halve the size used for the next scan, fast and light pages double it
+    (up to the learned limit).
+
+    The size never changes in the middle of a scan, because ``page_num``
+    offsets are only consistent for a fixed ``page_size``. Keyset scans have
+    no offsets and pick up the tuned size on every request.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 50,
+        min_size: int = 10,
+        max_size: int = 1000,
+        target_latency: float = 2.0,
+        max_payload_bytes: int = 4 * 1024 * 1024
+    ):
+        """
+        Initialize the page size tuner.
+
+        Args:
+            initial_size (int): Size used if the server rejects the probe.
+            min_size (int): Smallest page size to shrink to.
+            max_size (int): Size to probe with and the upper bound.
+            target_latency (float): Page latency in seconds to stay under.
+            max_payload_bytes (int): Page payload size in bytes to stay under.
+        """
+        self.initial_size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.max_payload_bytes = max_payload_bytes
+        self._sizes: Dict[str, int] = {}
+        self._limits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def page_size(self, endpoint_key: str) -> int:
+        """
+        Return the page size to start the next scan of an endpoint with.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+
+        Returns:
+            int: ``max_size`` for an unprobed endpoint, else the tuned size.
+        """
+        with self._lock:
+            if endpoint_key not in self._limits:
+                return self.max_size
+            return self._sizes[endpoint_key]
+
+    def record_first_page(
+        self, endpoint_key: str, requested: int, page: Dict[str, Any]
+    ) -> int:
+        """
+        Learn the server's page size limit from the first page of a scan.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            requested (int): The page size that was requested.
+            page (dict): The first page's response.
+
+        Returns:
+            int: The page size the server actually used, which the rest of
+            the scan must keep using.
+        """
+        returned = len(page.get('data') or [])
+        total_count = page.get('total_count')
+        honoured = requested
+        if total_count is not None and returned < min(requested, total_count):
+            # Fewer rows than asked for while more exist: the server capped it
+            honoured = max(returned, 1)
+
+        with self._lock:
+            if endpoint_key not in self._limits or honoured < requested:
+                self._limits[endpoint_key] = honoured
+            self._sizes[endpoint_key] = min(
+                self._sizes.get(endpoint_key, honoured), honoured
+            )
+        return honoured
+
+    def record_probe_rejected(self, endpoint_key: str) -> int:
+        """
+        Fall back to ``initial_size`` after the server rejected the probe size.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+
+        Returns:
+            int: The page size to retry the first page with.
+        """
+        with self._lock:
+            self._limits[endpoint_key] = self.initial_size
+            self._sizes[endpoint_key] = self.initial_size
+        return self.initial_size
+
+    def observe(
+        self, endpoint_key: str, page_size: int, latency: float, payload_bytes: int
+    ) -> None:
+        """
+        Record how a page performed and tune the size for the next scan.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            page_size (int): The page size the page was fetched with.
+            latency (float): Seconds the page took.
+            payload_bytes (int): Size of the response body.
+        """
+        with self._lock:
+            limit = self._limits.get(endpoint_key, self.max_size)
+            size = self._sizes.get(endpoint_key, page_size)
+            if latency > self.target_latency or payload_bytes > self.max_payload_bytes:
+                size = max(self.min_size, page_size // 2)
+            elif (
+                latency < self.target_latency / 2
+                and payload_bytes < self.max_payload_bytes / 2
+                and size >= page_size  # Don't undo a shrink from this scan
+            ):
+                size = min(limit, page_size * 2)
+            self._sizes[endpoint_key] = size
+
+    def reset(self, endpoint_key: Optional[str] = None) -> None:
+        """Forget what was learned, for one endpoint or all of them."""
+        with self._lock:
+            if endpoint_key is None:
+                self._sizes.clear()
+                self._limits.clear()
+            else:
+                self._sizes.pop(endpoint_key, None)
+                self._limits.pop(endpoint_key, None)
+
+
+class PaginationCheckpoint:
+    """
+    Records the progress of a paginated fetch so it can be resumed.
+
+    Pass a checkpoint to a paginated call (``qb.get_samples(checkpoint=cp)``)
+    and it records ``total_pages``, the page size and every completed page.
+    If the fetch fails part-way through, call again with the same checkpoint
+    and only the missing pages are fetched. A failed fetch also raises
+    QBenchPaginationError with the checkpoint attached, so callers that did
+    not pass one can still resume.
+
+    When a full list is being collected, each page's entities are kept on
+    the checkpoint so the resumed call returns the complete list. When
+    streaming, only page numbers are kept, since those pages have already
+    been handed to the caller. Use `to_dict` and `from_dict` to persist
+    progress between processes.
+
+    Keyset scans (``keyset=True``) also record the last ID seen, and resume
+    from there rather than from a page number.
+    """
+
+    def __init__(self) -> None:
+        self.endpoint_key: Optional[str] = None
+        self.params: Optional[Dict[str, Any]] = None
+        self.mode: Optional[str] = None
+        self.last_id: Optional[int] = None
+        self.page_size: Optional[int] = None
+        self.total_pages: Optional[int] = None
+        self.metadata: Dict[str, Any] = {}
+        self.completed_pages: Set[int] = set()
+        self.keep_results = False
+        self._results: Dict[int, List[Any]] = {}
+
+    def bind(
+        self, endpoint_key: str, params: Dict[str, Any], mode: str = 'page'
+    ) -> None:
+        """
+        Tie the checkpoint to one endpoint, set of filters and scan mode.
+
+        Args:
+            endpoint_key (str): API endpoint key from QBENCH_ENDPOINTS.
+            params (dict): Path and query parameters of the fetch.
+            mode (str): ``'page'`` for page number scans, ``'keyset'`` for
+                ID range scans.
+
+        Raises:
+            QBenchValidationError: If the checkpoint belongs to another fetch
+        """
+        if self.endpoint_key is None:
+            self.endpoint_key = endpoint_key
+            self.params = dict(params)
+            self.mode = mode
+        elif self.endpoint_key != endpoint_key or self.params != params:
+            raise QBenchValidationError(
+                f"Checkpoint belongs to {self.endpoint_key} with params "
+                f"{self.params}; it cannot resume {endpoint_key} with {params}"
+            )
+        elif (self.mode or 'page') != mode:
+            raise QBenchValidationError(
+                f"Checkpoint was recorded by a {self.mode} scan; it cannot "
+                f"resume a {mode} scan"
+            )
+
+    @property
+    def started(self) -> bool:
+        """Whether the first page (and so ``total_pages``) is known."""
+        return self.total_pages is not None
+
+    def record_first_page(self, page: Dict[str, Any], page_size: int) -> None:
+        """Remember the page count, page size and metadata from page 1."""
+        self.page_size = page_size
+        self.total_pages = page.get('total_pages', 1)
+        self.metadata = {k: v for k, v in page.items() if k != 'data'}
+
+    def mark_done(self, page_num: int, data: Optional[List[Any]] = None) -> None:
+        """Record a page as completed, keeping its entities if collecting."""
+        self.completed_pages.add(page_num)
+        if self.keep_results and data is not None:
+            self._results[page_num] = data
+
+    def is_done(self, page_num: int) -> bool:
+        """Whether a page has already been completed."""
+        return page_num in self.completed_pages
+
+    def entities(self) -> List[Any]:
+        """Return the kept entities of all completed pages, in page order."""
+        entities: List[Any] = []
+        for page_num in sorted(self._results):
+            entities.extend(self._results[page_num])
+        return entities
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize progress (without kept entities) to a JSON-safe dict."""
+        return {
+            'endpoint_key': self.endpoint_key,
+            'params': self.params,
+            'mode': self.mode,
+            'last_id': self.last_id,
+            'page_size': self.page_size,
+            'total_pages': self.total_pages,
+            'metadata': self.metadata,
+            'completed_pages': sorted(self.completed_pages),
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "PaginationCheckpoint":
+        """Rebuild a checkpoint from `to_dict` output."""
+        checkpoint = cls()
+        checkpoint.endpoint_key = state.get('endpoint_key')
+        checkpoint.params = state.get('params')
+        checkpoint.mode = state.get('mode')
+        checkpoint.last_id = state.get('last_id')
+        checkpoint.page_size = state.get('page_size')
+        checkpoint.total_pages = state.get('total_pages')
+        checkpoint.metadata = state.get('metadata') or {}
+        checkpoint.completed_pages = set(state.get('completed_pages') or [])
+        return checkpoint
+
+    def __repr__(self) -> str:
+        return (
+            f"PaginationCheckpoint(endpoint_key={self.endpoint_key!r}, "
+            f"completed={len(self.completed_pages)}/{self.total_pages})"
+        )
+
+
+def split_id_range(low: int, high: int, shards: int) -> List[Tuple[int, int]]:
+    """
+    Split the inclusive ID range ``[low, high]`` into contiguous shards.
+
+    Args:
+        low (int): Smallest ID in the collection.
+        high (int): Largest ID in the collection.
+        shards (int): Number of shards wanted.
+
+    Returns:
+        list: Half-open ``(start, end)`` bounds, at most ``shards`` of them,
+        each ``end`` being the next shard's ``start``.
+    """
+    span = high - low + 1
+    shards = max(1, min(shards, span))
+    width = -(-span // shards)
+    return [
+        (start, min(start + width, high + 1))
+        for start in range(low, high + 1, width)
+    ]
+
+
+def split_page_range(total_pages: int, shards: int) -> List[Tuple[int, int]]:
+    """
+    Split pages ``1..total_pages`` into contiguous, evenly sized blocks.
+
+    Args:
+        total_pages (int): Number of pages in the collection.
+        shards (int): Number of blocks wanted.
+
+    Returns:
+        list: Inclusive ``(first_page, last_page)`` blocks in page order.
+    """
+    shards = max(1, min(shards, total_pages))
+    size, extra = divmod(total_pages, shards)
+    blocks = []
+    first = 1
+    for index in range(shards):
+        last = first + size - 1 + (1 if index < extra else 0)
+        blocks.append((first, last))
+        first = last + 1
+    return blocks
@@ -0,0 +1,238 @@
+"""Retry policy for QBench SDK requests."""
+
+import email.utils
+import logging
+import random
+import time
+from typing import Any, Dict, FrozenSet, Optional, Union
+
+from tenacity import AsyncRetrying, Retrying, RetryCallState, stop_after_attempt, retry_if_exception
+
+from .exceptions import (
+    QBenchAPIError,
+    QBenchConnectionError,
+    QBenchTimeoutError,
+    QBenchValidationError
+)
+
+logger = logging.getLogger(__name__)
+
+# Methods that can be repeated without changing the outcome
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# HTTP statuses worth retrying
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds from now.
+
+    Args:
+        value (str): Header value, either delay seconds or an HTTP date.
+
+    Returns:
+        float: Seconds to wait (never negative), or None if absent or invalid.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before repeating a failed request.
+
+    Timeouts, connection errors and responses with a status in
+    ``retry_statuses`` (429 and 5xx by default) are retried, up to
+    ``max_attempts`` attempts in total. Only idempotent methods (GET, HEAD,
+    OPTIONS, PUT, DELETE) are retried unless ``retry_non_idempotent`` is set,
+    since repeating a POST or PATCH that reached the server could apply it
+    twice.
+
+    A ``Retry-After`` header on the response sets the wait (capped at
+    ``max_retry_after``). Otherwise the wait is "full jitter" exponential
+    backoff: a random time up to ``backoff_base * 2 ** (attempt - 1)``,
+    capped at ``backoff_max``, so clients that failed together don't retry
+    together.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        max_retry_after: float = 120.0,
+        retry_statuses: FrozenSet[int] = RETRY_STATUS_CODES,
+        retry_non_idempotent: bool = False
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts (int): Attempts in total, including the first; 1
+                disables retries.
+            backoff_base (float): Upper bound in seconds of the first
+                backoff; doubles with each attempt.
+            backoff_max (float): Largest backoff in seconds.
+            max_retry_after (float): Longest Retry-After in seconds honoured;
+                longer requests are cut to this.
+            retry_statuses (frozenset): HTTP statuses to retry.
+            retry_non_idempotent (bool): Also retry POST and PATCH.
+
+        Raises:
+            QBenchValidationError: If ``max_attempts`` is less than 1.
+        """
+        if max_attempts < 1:
+            raise QBenchValidationError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def replace(self, **changes: Any) -> "RetryPolicy":
+        """Return a copy of the policy with some settings changed."""
+        settings: Dict[str, Any] = {
+            'max_attempts': self.max_attempts,
+            'backoff_base': self.backoff_base,
+            'backoff_max': self.backoff_max,
+            'max_retry_after': self.max_retry_after,
+            'retry_statuses': self.retry_statuses,
+            'retry_non_idempotent': self.retry_non_idempotent,
+        }
+        settings.update(changes)
+        return RetryPolicy(**settings)
+
+    def resolve(self, override: Union["RetryPolicy", int, bool, None]) -> "RetryPolicy":
+        """
+        Apply a per-call override to this policy.
+
+        Args:
+            override: A RetryPolicy to use instead; an int for the number of
+                attempts; False to disable retries; True to also retry
+                non-idempotent methods; None to keep this policy.
+
+        Returns:
+            RetryPolicy: The policy for the call.
+        """
+        if override is None:
+            return self
+        if isinstance(override, RetryPolicy):
+            return override
+        if override is True:
+            return self.replace(retry_non_idempotent=True)
+        if override is False:
+            return self.replace(max_attempts=1)
+        return self.replace(max_attempts=int(override))
+
+    def is_retryable(self, method: str, error: BaseException) -> bool:
+        """
+        Whether a request that failed with ``error`` may be repeated.
+
+        Args:
+            method (str): HTTP method of the request.
+            error (Exception): The error the attempt raised.
+
+        Returns:
+            bool: True if the error is transient and the method may be repeated.
+        """
+        if method.upper() not in IDEMPOTENT_METHODS and not self.retry_non_idempotent:
+            return False
+        if isinstance(error, (QBenchTimeoutError, QBenchConnectionError)):
+            return True
+        return isinstance(error, QBenchAPIError) and error.status_code in self.retry_statuses
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Return the seconds to wait after a failed attempt.
+
+        Args:
+            attempt (int): Number of the attempt that failed, from 1.
+            error (Exception): The error it raised.
+
+        Returns:
+            float: Seconds to wait before the next attempt.
+        """
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            return min(float(retry_after), self.max_retry_after)
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def _wait(self, retry_state: RetryCallState) -> float:
+        """Tenacity wait callback."""
+        return self.delay(retry_state.attempt_number, _attempt_error(retry_state))
+
+    def _options(self, method: str, description: str) -> Dict[str, Any]:
+        """Build the tenacity options shared by the sync and async retriers."""
+
+        def log_retry(retry_state: RetryCallState) -> None:
+            sleep = retry_state.next_action.sleep if retry_state.next_action else 0.0
+            logger.warning(
+                f"Retrying {description} in {sleep:.1f}s "
+                f"(attempt {retry_state.attempt_number} of {self.max_attempts}): "
+                f"{_attempt_error(retry_state)}"
+            )
+
+        return {
+            'stop': stop_after_attempt(self.max_attempts),
+            'wait': self._wait,
+            'retry': retry_if_exception(lambda e: self.is_retryable(method, e)),
+            'before_sleep': log_retry,
+            'reraise': True,
+        }
+
+    def retrying(self, method: str, description: str = "request") -> Retrying:
+        """
+        Return a tenacity retrier for a synchronous request.
+
+        Args:
+            method (str): HTTP method of the request.
+            description (str): What is being retried, for the log.
+
+        Returns:
+            tenacity.Retrying: Call it with a function making one attempt;
+            it calls the function until it succeeds or the policy gives up,
+            and returns the result or re-raises the last error.
+        """
+        return Retrying(**self._options(method, description))
+
+    def async_retrying(self, method: str, description: str = "request") -> AsyncRetrying:
+        """
+        Return a tenacity retrier for a request on the event loop.
+
+        Args:
+            method (str): HTTP method of the request.
+            description (str): What is being retried, for the log.
+
+        Returns:
+            tenacity.AsyncRetrying: Await a call of it with a coroutine
+            function making one attempt; as with `retrying`, but waits
+            don't block the loop.
+        """
+        return AsyncRetrying(**self._options(method, description))
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryPolicy(max_attempts={self.max_attempts}, "
+            f"backoff_base={self.backoff_base}, "
+            f"retry_non_idempotent={self.retry_non_idempotent})"
+        )
+
+
+def _attempt_error(retry_state: RetryCallState) -> Optional[BaseException]:
+    """Return the error of the attempt a tenacity callback is called for."""
+    if retry_state.outcome is None:
+        return None
+    return retry_state.outcome.exception()
@@ -0,0 +1,267 @@
+"""Client-side request throttling for QBench SDK."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .exceptions import QBenchValidationError
+
+# Latencies below this are treated as equal, so jitter on a fast link isn't
+# mistaken for a latency spike
+LATENCY_FLOOR = 0.05
+
+
+class TokenBucket:
+    """
+    Token bucket limiting requests per second across threads and event loops.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens
+    per second; every request takes one. A caller that finds the bucket
+    empty reserves the next token and sleeps until it is due, so waiting
+    callers are served in arrival order and the bucket never needs polling.
+    The same bucket can be used from sync code (`acquire`), worker threads
+    and any number of event loops (`acquire_async`).
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate (float): Sustained requests per second.
+            burst (int): Requests that may go out back to back after a quiet
+                period. Defaults to one second's worth of ``rate``.
+
+        Raises:
+            QBenchValidationError: If ``rate`` or ``burst`` is not positive.
+        """
+        if rate <= 0:
+            raise QBenchValidationError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else max(1, int(rate))
+        if self.burst <= 0:
+            raise QBenchValidationError("burst must be positive")
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waited = 0.0
+        self._acquired = 0
+
+    def _reserve(self) -> float:
+        """Take a token, possibly one not yet refilled; return the wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            self._acquired += 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self._waited += wait
+            return wait
+
+    def _release(self) -> None:
+        """Give back a reserved token whose request was never sent."""
+        with self._lock:
+            self._tokens = min(float(self.burst), self._tokens + 1)
+            self._acquired -= 1
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent.
+
+        Returns:
+            float: Seconds waited.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Wait on the event loop until a request may be sent.
+
+        Returns:
+            float: Seconds waited.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._release()
+                raise
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return throttling statistics.
+
+        Returns:
+            dict: ``rate``, ``burst``, ``acquired`` (requests let through)
+            and ``waited`` (total seconds callers spent waiting).
+        """
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'acquired': self._acquired,
+                'waited': self._waited,
+            }
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.rate}, burst={self.burst})"
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on concurrent requests, tuned from server responses.
+
+    Every request that completes with healthy latency raises the limit by
+    ``1 / limit`` (one slot per limit's worth of requests, i.e. per round
+    trip); a rate limit (429), server error, timeout or a latency spike
+    above ``latency_tolerance`` times the best latency seen multiplies it by
+    ``backoff``. Only requests sent after the last cut can cut again, so a
+    burst of 429s from one overloaded moment halves the limit once, not once
+    per request.
+
+    Requests beyond the limit wait in arrival order. The limiter can be
+    shared by several event loops and threads.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5
+    ):
+        """
+        Initialize the concurrency limiter.
+
+        Args:
+            initial_limit (int): Concurrent requests allowed at first.
+            min_limit (int): Lowest the limit is cut to.
+            max_limit (int): Highest the limit grows to.
+            latency_tolerance (float): Latency, as a multiple of the best
+                latency seen, above which a request counts as overload.
+            backoff (float): Factor the limit is multiplied by on overload.
+
+        Raises:
+            QBenchValidationError: If the limits are inconsistent.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise QBenchValidationError(
+                "Expected 1 <= min_limit <= initial_limit <= max_limit, got "
+                f"{min_limit}, {initial_limit}, {max_limit}"
+            )
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._baseline: Optional[float] = None
+        self._last_cut = 0.0
+        self._cuts = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Concurrent requests currently allowed."""
+        return max(self.min_limit, int(self._limit))
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent; pair with `release`."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_flight < self.limit:
+                self._in_flight += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # A slot was handed over just as we were cancelled
+                    self._in_flight -= 1
+                    self._wake()
+            raise
+
+    def release(self, latency: float, overloaded: bool = False) -> None:
+        """
+        Free a request's slot and adjust the limit from how it went.
+
+        Args:
+            latency (float): Seconds the request took.
+            overloaded (bool): Whether the server signalled overload (429,
+                5xx or a timeout).
+        """
+        with self._lock:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if not overloaded:
+                baseline = max(self._baseline or latency, LATENCY_FLOOR)
+                overloaded = latency > self.latency_tolerance * baseline
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                elif not overloaded:
+                    # Drift up slowly so a lucky early request isn't the bar forever
+                    self._baseline += (latency - self._baseline) * 0.01
+
+            if overloaded:
+                if now - latency >= self._last_cut:
+                    self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                    self._last_cut = now
+                    self._cuts += 1
+            else:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters in order; the lock must be held."""
+        while self._waiters and self._in_flight < self.limit:
+            loop, future = self._waiters.popleft()
+            if loop.is_closed():
+                continue
+            self._in_flight += 1
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return limiter statistics.
+
+        Returns:
+            dict: ``limit``, ``in_flight``, ``waiting``, ``cuts`` (times the
+            limit was reduced) and ``baseline_latency``.
+        """
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'waiting': len(self._waiters),
+                'cuts': self._cuts,
+                'baseline_latency': self._baseline,
+            }
+
+    def __repr__(self) -> str:
+        return (
+            f"AdaptiveConcurrency(limit={self.limit}, "
+            f"min_limit={self.min_limit}, max_limit={self.max_limit})"
+        )
+
+
+def _resolve(future: asyncio.Future) -> None:
+    """Wake a waiter unless it has been cancelled meanwhile."""
+    if not future.done():
+        future.set_result(None)
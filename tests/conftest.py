@@ -2,8 +2,8 @@
 
 import os
 import pytest
-from unittest.mock import Mock, patch
-from qbench import QBenchAPI
+from unittest.mock import AsyncMock, Mock, patch
+from qbench import QBenchAPI, RetryPolicy
 from qbench.auth import QBenchAuth
 
 
@@ -20,15 +20,23 @@ def mock_auth():
         with patch.object(QBenchAuth, 'get_headers') as mock_headers:
             with patch.object(QBenchAuth, 'get_access_token') as mock_token:
                 with patch.object(QBenchAuth, 'is_authenticated', return_value=True) as mock_is_auth:
-                    with patch.object(QBenchAuth, '_fetch_access_token', return_value=None) as mock_fetch:
+                    with patch.object(QBenchAuth, '_fetch_access_token', return_value=None) as mock_fetch, \
+                            patch.object(QBenchAuth, 'get_access_token_async', new_callable=AsyncMock) as mock_token_async, \
+                            patch.object(QBenchAuth, 'refresh', return_value="new_token") as mock_refresh, \
+                            patch.object(QBenchAuth, 'refresh_async', new_callable=AsyncMock) as mock_refresh_async:
                         mock_headers.return_value = {
                             "Authorization": "Bearer test_token",
                             "Content-Type": "application/json"
                         }
                         mock_token.return_value = "test_token"
+                        mock_token_async.return_value = "test_token"
+                        mock_refresh_async.return_value = "new_token"
                         yield {
                             'headers': mock_headers,
                             'token': mock_token,
+                            'token_async': mock_token_async,
+                            'refresh': mock_refresh,
+                            'refresh_async': mock_refresh_async,
                             'is_auth': mock_is_auth,
                             'fetch': mock_fetch,
                             'init': mock_init
@@ -43,8 +51,12 @@ def qb_client(mock_auth):
         mock_session_instance = Mock()
         mock_session_class.return_value = mock_session_instance
         
-        # Create client - this will now use our mocked session
-        client = QBenchAPI(TEST_BASE_URL, TEST_API_KEY, TEST_API_SECRET)
+        # Create client - this will now use our mocked session; retries
+        # don't back off so error tests don't sleep
+        client = QBenchAPI(
+            TEST_BASE_URL, TEST_API_KEY, TEST_API_SECRET, 
+            retry_policy=RetryPolicy(backoff_base=0)
+        )
         
         # Store the mock session for testing
         client._mock_session = mock_session_instance
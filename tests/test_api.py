@@ -2,6 +2,7 @@
 
 import pytest
 import asyncio
+import time
 from unittest.mock import Mock, patch, MagicMock
 from qbench import QBenchAPI, QBenchAPIError, QBenchValidationError
 from qbench.exceptions import QBenchTimeoutError, QBenchConnectionError
@@ -124,10 +125,13 @@ class TestQBenchAPI:
     
     def test_del_cleanup(self, qb_client):
         """Test __del__ method cleanup."""
-        with patch.object(qb_client._session, 'close') as mock_close:
+        with patch.object(qb_client._session, 'close') as mock_close, \
+                patch.object(qb_client._auth, 'close') as mock_auth_close:
             # Simulate deletion
             qb_client.__del__()
             mock_close.assert_called_once()
+            # A dropped client stops its background token refresh
+            mock_auth_close.assert_called_once()
     
     def test_make_request_timeout(self, qb_client):
         """Test request timeout handling."""
@@ -140,6 +144,8 @@ class TestQBenchAPI:
                 qb_client._make_request('GET', 'get_samples')
             
             assert "timeout" in str(exc_info.value).lower()
+            # Timeouts of a GET are retried up to the policy's attempts
+            assert mock_request.call_count == 5
     
     def test_make_request_connection_error(self, qb_client):
         """Test connection error handling."""
@@ -164,7 +170,7 @@ class TestQBenchAPI:
         http_error = HTTPError(response=mock_response)
         
         with patch.object(qb_client._session, 'request') as mock_request:
-            with patch.object(qb_client._auth, '_fetch_access_token') as mock_refresh:
+            with patch.object(qb_client._auth, 'refresh', return_value="new_token") as mock_refresh:
                 # First call raises 401, then succeeds after token refresh
                 mock_request.side_effect = [http_error, http_error]  # Still fails after refresh
                 mock_response.raise_for_status.side_effect = http_error
@@ -172,9 +178,48 @@ class TestQBenchAPI:
                 with pytest.raises(QBenchAPIError) as exc_info:
                     qb_client._make_request('GET', 'get_samples')
                 
-                # Should have tried to refresh token
-                mock_refresh.assert_called()
-    
+                # Should have tried to refresh the rejected token
+                mock_refresh.assert_called_with(stale_token="test_token")
+                # Retried once with the new token, then given up
+                assert mock_request.call_count == 2
+
+    def test_make_request_401_retried_with_new_token(self, qb_client, mock_auth):
+        """Test that a request rejected with 401 succeeds after the token refresh."""
+        from requests.exceptions import HTTPError
+
+        rejected = Mock()
+        rejected.status_code = 401
+        rejected.json.return_value = {}
+        rejected.raise_for_status.side_effect = HTTPError(response=rejected)
+        ok = Mock()
+        ok.status_code = 200
+        ok.json.return_value = {'data': {'id': 1}}
+
+        with patch.object(qb_client._session, 'request', side_effect=[rejected, ok]):
+            assert qb_client._make_request('GET', 'get_sample', path_params={'id': 1}) == {
+                'data': {'id': 1}
+            }
+        mock_auth['refresh'].assert_called_once_with(stale_token="test_token")
+
+    @pytest.mark.asyncio
+    async def test_async_401_retried_with_new_token(self, qb_client, mock_auth):
+        """Test that async requests and pages recover from a 401 in the same call."""
+        from aioresponses import aioresponses
+
+        url = "https://test.qbench.net/qbench/api/v2/samples"
+        session = await qb_client._get_async_session()
+        with aioresponses() as mocked:
+            mocked.get(f"{url}/1", status=401)
+            mocked.get(f"{url}/1", payload={'data': {'id': 1}})
+            mocked.get(f"{url}?page_num=1&page_size=50", status=401)
+            mocked.get(f"{url}?page_num=1&page_size=50", payload={'data': [{'id': 1}]})
+
+            assert await qb_client.get_sample(1) == {'id': 1}
+            assert await qb_client._fetch_page(session, url, 1, {}) == {'data': [{'id': 1}]}
+
+        assert mock_auth['refresh_async'].await_count == 2
+        await qb_client.aclose()
+
     def test_make_request_429_rate_limit(self, qb_client):
         """Test 429 rate limit error."""
         from requests.exceptions import HTTPError
@@ -193,7 +238,105 @@ class TestQBenchAPI:
                 qb_client._make_request('GET', 'get_samples')
             
             assert "Rate limit exceeded" in str(exc_info.value)
-    
+
+    def test_make_request_honours_retry_after(self, qb_client):
+        """Test that a 429 is retried after the server's Retry-After."""
+        from requests.exceptions import HTTPError
+
+        limited = Mock()
+        limited.status_code = 429
+        limited.headers = {'Retry-After': '3'}
+        limited.json.return_value = {}
+        limited.raise_for_status.side_effect = HTTPError(response=limited)
+        ok = Mock()
+        ok.status_code = 200
+        ok.json.return_value = {'data': []}
+
+        with patch.object(qb_client._session, 'request', side_effect=[limited, ok]), \
+                patch('tenacity.nap.time.sleep') as mock_sleep:
+            assert qb_client._make_request('GET', 'get_samples') == {'data': []}
+
+        mock_sleep.assert_called_once_with(3.0)
+
+        with patch.object(qb_client._session, 'request', return_value=limited):
+            with pytest.raises(QBenchAPIError) as exc_info:
+                qb_client._make_request('GET', 'get_samples', retry=False)
+        assert exc_info.value.retry_after == 3.0
+
+    def test_post_not_retried_by_default(self, qb_client):
+        """Test that a non-idempotent request is only retried when asked."""
+        from requests.exceptions import Timeout
+
+        with patch.object(qb_client._session, 'request', side_effect=Timeout("timed out")) as mock_request:
+            with pytest.raises(QBenchTimeoutError):
+                qb_client.create_customers(data={'name': 'Acme'})
+            assert mock_request.call_count == 1
+
+            with pytest.raises(QBenchTimeoutError):
+                qb_client.create_customers(data={'name': 'Acme'}, retry=True)
+            assert mock_request.call_count == 1 + 5
+
+    @pytest.mark.asyncio
+    async def test_async_call_retry_override(self, qb_client):
+        """Test that retry= limits the attempts of an async call."""
+        from aioresponses import aioresponses
+
+        url = "https://test.qbench.net/qbench/api/v2/customers/1"
+        with aioresponses() as mocked:
+            mocked.get(url, status=503)
+            mocked.get(url, status=503)
+            mocked.get(url, payload={'data': {'id': 1}})
+            with pytest.raises(QBenchAPIError) as exc_info:
+                await qb_client.get_customer(1, retry=2)
+            assert exc_info.value.status_code == 503
+
+            assert await qb_client.get_customer(1) == {'id': 1}
+        await qb_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_retry_override(self, qb_client):
+        """Test that retry= also applies to the page requests of a stream."""
+        from aioresponses import aioresponses
+
+        url = "https://test.qbench.net/qbench/api/v2/samples?page_num=1&page_size=50"
+        with aioresponses() as mocked:
+            mocked.get(url, status=503)
+            mocked.get(url, payload={'data': [{'id': 1}], 'total_pages': 1})
+            with pytest.raises(QBenchAPIError) as exc_info:
+                async for _ in qb_client.get_samples(stream=True, retry=False):
+                    pass
+            assert exc_info.value.status_code == 503
+
+            assert [s async for s in qb_client.get_samples(stream=True)] == [{'id': 1}]
+        await qb_client.aclose()
+
+    def test_circuit_breaker_fails_fast(self, mock_auth):
+        """Test that an open circuit stops requests and shows in health_check."""
+        from requests.exceptions import Timeout
+        from qbench import CircuitBreaker, QBenchCircuitOpenError, RetryPolicy
+        with patch('requests.Session'):
+            client = QBenchAPI(
+                "https://test.qbench.net", "key", "secret",
+                retry_policy=RetryPolicy(backoff_base=0),
+                circuit_breaker=CircuitBreaker(failure_threshold=3)
+            )
+
+        with patch.object(client._session, 'request', side_effect=Timeout("timed out")) as mock_request:
+            # The circuit opens on the third attempt, so the retries stop there
+            with pytest.raises(QBenchCircuitOpenError):
+                client.get_sample(1)
+            assert mock_request.call_count == 3
+
+            with pytest.raises(QBenchCircuitOpenError):
+                client.get_sample(1)
+            health = client.health_check()
+            assert mock_request.call_count == 3
+
+        assert health['status'] == 'unhealthy'
+        assert health['circuits']["https://test.qbench.net"]['state'] == 'open'
+        assert client._client_config['circuit_breaker'] is client.circuit_breaker
+        client.close()
+
     def test_make_request_204_no_content(self, qb_client):
         """Test 204 No Content response."""
         mock_response = Mock()
@@ -621,6 +764,987 @@ class TestQBenchAPI:
                 with pytest.raises(Exception):
                     await qb_client._get_entity_list('get_samples')
 
+    @pytest.mark.asyncio
+    async def test_get_entity_list_reuses_async_session(self, qb_client):
+        """Test that consecutive list calls share one aiohttp session."""
+        page = {'data': [{'id': 1}], 'total_pages': 1}
+        
+        with patch.object(qb_client, '_fetch_page', return_value=page) as mock_fetch:
+            await qb_client._get_entity_list('get_samples')
+            await qb_client._get_entity_list('get_orders')
+            
+            first_session = mock_fetch.call_args_list[0][0][0]
+            second_session = mock_fetch.call_args_list[1][0][0]
+            assert first_session is second_session
+            assert not first_session.closed
+        
+        await qb_client.aclose()
+        assert first_session.closed
+        assert qb_client._async_sessions == {}
+    
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes_session(self, qb_client):
+        """Test that ``async with`` closes the shared aiohttp session."""
+        async with qb_client as client:
+            session = await client._get_async_session()
+            assert await client._get_async_session() is session
+        
+        assert session.closed
+    
+    def test_sync_calls_share_background_loop(self, qb_client):
+        """Test that sync list calls reuse one loop and one aiohttp session."""
+        page = {'data': [{'id': 1}], 'total_pages': 1}
+        
+        with patch.object(qb_client, '_fetch_page', return_value=page) as mock_fetch:
+            assert qb_client.get_samples() == [{'id': 1}]
+            loop = qb_client._loop
+            thread = qb_client._loop_thread
+            assert qb_client.get_orders() == [{'id': 1}]
+            
+            assert qb_client._loop is loop
+            assert thread.is_alive()
+            first_session = mock_fetch.call_args_list[0][0][0]
+            assert mock_fetch.call_args_list[1][0][0] is first_session
+        
+        qb_client.close()
+        
+        assert first_session.closed
+        assert loop.is_closed()
+        assert not thread.is_alive()
+        assert qb_client._loop is None
+    
+    def test_sync_call_propagates_errors_from_background_loop(self, qb_client):
+        """Test that exceptions raised on the background loop reach the caller."""
+        with patch.object(qb_client, '_fetch_page', side_effect=QBenchTimeoutError("slow")):
+            with pytest.raises(QBenchTimeoutError):
+                qb_client.get_samples()
+        
+        qb_client.close()
+    
+    @pytest.mark.asyncio
+    async def test_make_request_async_success(self, qb_client):
+        """Test successful native async request."""
+        from aioresponses import aioresponses
+        
+        with aioresponses() as mocked:
+            mocked.get(
+                "https://test.qbench.net/qbench/api/v2/samples/123", 
+                payload={"id": 123, "name": "Test Sample"}
+            )
+            
+            result = await qb_client._make_request_async(
+                'GET', 'get_sample', path_params={"id": 123}
+            )
+        
+        assert result == {"id": 123, "name": "Test Sample"}
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_make_request_async_error_mapping(self, qb_client):
+        """Test that async requests map HTTP errors like the sync path."""
+        from aioresponses import aioresponses
+        
+        with aioresponses() as mocked:
+            mocked.get(
+                "https://test.qbench.net/qbench/api/v2/samples/999", 
+                status=404, 
+                payload={"error": "Not found"}
+            )
+            mocked.post(
+                "https://test.qbench.net/qbench/api/v2/samples", 
+                status=429, 
+                payload={"error": "Rate limit exceeded"}
+            )
+            
+            with pytest.raises(QBenchAPIError) as exc_info:
+                await qb_client._make_request_async(
+                    'GET', 'get_sample', path_params={"id": 999}
+                )
+            assert "Resource not found" in str(exc_info.value)
+            assert exc_info.value.response_data == {"error": "Not found"}
+            
+            with pytest.raises(QBenchAPIError) as exc_info:
+                await qb_client._make_request_async('POST', 'create_samples', data={})
+            assert exc_info.value.status_code == 429
+        
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_make_request_async_no_content_and_text(self, qb_client):
+        """Test 204 and non-JSON handling in the async path."""
+        from aioresponses import aioresponses
+        
+        with aioresponses() as mocked:
+            mocked.delete("https://test.qbench.net/qbench/api/v2/samples/1", status=204)
+            mocked.get("https://test.qbench.net/qbench/api/v2/samples/2", body="plain text")
+            
+            assert await qb_client._make_request_async(
+                'DELETE', 'delete_sample', path_params={"id": 1}
+            ) == {}
+            assert await qb_client._make_request_async(
+                'GET', 'get_sample', path_params={"id": 2}
+            ) == {"status": "success", "data": "plain text"}
+        
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_async_single_entity_uses_native_path(self, qb_client):
+        """Test that awaited non-paginated calls don't use the thread pool."""
+        with patch.object(qb_client, '_make_request_async') as mock_async:
+            with patch.object(qb_client, '_make_request') as mock_sync:
+                mock_async.return_value = {"id": 1}
+                
+                results = await asyncio.gather(
+                    *(qb_client.get_sample(entity_id=i) for i in range(1, 4))
+                )
+                
+                assert results == [{"id": 1}] * 3
+                assert mock_async.call_count == 3
+                mock_sync.assert_not_called()
+    
+    def test_encode_params(self):
+        """Test query parameter encoding shared by the sync and async sessions."""
+        params = QBenchAPI._encode_params(
+            {"a": None, "b": True, "c": 5, "d": [1, 2]}
+        )
+        
+        assert params == {"b": "True", "c": 5, "d": [1, 2]}
+    
+    @pytest.mark.asyncio
+    async def test_sync_and_async_send_same_query(self, mock_auth):
+        """Test that requests and aiohttp put the same parameters on the wire."""
+        import responses
+        from aioresponses import aioresponses
+        from urllib.parse import urlsplit
+        client = QBenchAPI("https://test.qbench.net", "key", "secret")
+        url = "https://test.qbench.net/qbench/api/v2/customers/1"
+        params = {'active': True, 'archived': False, 'status': None, 'limit': 5}
+        
+        with responses.RequestsMock() as sync_mock:
+            sync_mock.get(url, json={'data': {'id': 1}})
+            client._make_request('GET', 'get_customer', params=params, path_params={'id': 1})
+            sync_query = urlsplit(sync_mock.calls[0].request.url).query
+        with aioresponses() as async_mock:
+            async_mock.get(f"{url}?{sync_query}", payload={'data': {'id': 1}})
+            await client._make_request_async('GET', 'get_customer', False, params, None, {'id': 1})
+            ((_, async_url),) = async_mock.requests
+        
+        assert sync_query == "active=True&archived=False&limit=5"
+        assert async_url.query_string == sync_query
+        await client.aclose()
+
+    @staticmethod
+    def _paged_fetch(total_pages, per_page=2):
+        """Build a fake _fetch_page that serves numbered pages."""
+        async def fake_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            return {
+                'data': [{'id': (page - 1) * per_page + i + 1} for i in range(per_page)],
+                'total_pages': total_pages
+            }
+        return fake_fetch
+    
+    @pytest.mark.asyncio
+    async def test_iter_endpoint_streams_entities_in_order(self, qb_client):
+        """Test async streaming of a paginated endpoint."""
+        with patch.object(qb_client, '_fetch_page', side_effect=self._paged_fetch(3)):
+            ids = [sample['id'] async for sample in qb_client.iter_samples()]
+        
+        assert ids == [1, 2, 3, 4, 5, 6]
+        await qb_client.aclose()
+    
+    def test_stream_sync_by_page(self, qb_client):
+        """Test sync streaming yields one list per page."""
+        with patch.object(qb_client, '_fetch_page', side_effect=self._paged_fetch(3)):
+            pages = list(qb_client.get_samples(stream=True, by_page=True))
+        
+        assert [[s['id'] for s in page] for page in pages] == [[1, 2], [3, 4], [5, 6]]
+        qb_client.close()
+    
+    @pytest.mark.asyncio
+    async def test_stream_bounds_pages_in_flight(self, qb_client):
+        """Test that streaming only requests a bounded window ahead of the consumer."""
+        with patch.object(qb_client, '_fetch_page', side_effect=self._paged_fetch(50)) as mock_fetch:
+            stream = qb_client.iter_samples(max_in_flight=3)
+            async for sample in stream:
+                if sample['id'] == 3:
+                    break
+            await stream.aclose()
+            
+            # Page 1 plus at most three pages ahead of the consumer
+            assert mock_fetch.call_count <= 4
+        
+        await qb_client.aclose()
+    
+    def test_stream_non_paginated_endpoint(self, qb_client):
+        """Test that non-paginated endpoints can't be streamed."""
+        with pytest.raises(QBenchValidationError):
+            qb_client.get_sample(entity_id=1, stream=True)
+        
+        with pytest.raises(AttributeError):
+            _ = qb_client.iter_sample
+    
+    @pytest.mark.asyncio
+    async def test_page_size_client_and_call_level(self, mock_auth):
+        """Test that page_size comes from the call, then the client."""
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", page_size=200)
+        page = {'data': [], 'total_pages': 1}
+        
+        with patch.object(client, '_fetch_page', return_value=page) as mock_fetch:
+            await client._get_entity_list('get_samples')
+            await client._get_entity_list('get_samples', page_size=500, status='active')
+            
+            assert mock_fetch.call_args_list[0][0][4] == 200
+            assert mock_fetch.call_args_list[1][0][4] == 500
+            # page_size is not forwarded as a plain filter
+            assert 'page_size' not in mock_fetch.call_args_list[1][0][3]
+        
+        await client.aclose()
+        
+        with patch('requests.Session'), pytest.raises(QBenchValidationError):
+            QBenchAPI("https://test.qbench.net", "key", "secret", page_size=0)
+    
+    @pytest.mark.asyncio
+    async def test_page_size_auto_uses_server_cap(self, qb_client):
+        """Test that adaptive sizing continues with the size the server honoured."""
+        requested = []
+        
+        async def capped_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            requested.append(page_size)
+            served = min(page_size, 100)
+            return {'data': [{'id': 1}] * served, 'total_pages': 3, 'total_count': 300}
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=capped_fetch):
+            result = await qb_client._get_entity_list('get_samples', page_size='auto')
+        
+        assert requested == [1000, 100, 100]
+        assert len(result) == 300
+        assert qb_client._call_page_tuner.page_size('get_samples') == 100
+        
+        # The call's "auto" doesn't make the client's default adaptive
+        assert qb_client._page_tuner is None
+        assert qb_client._page_sizing(None) == (50, None)
+        await qb_client.aclose()
+    
+    def test_page_size_invalid(self, qb_client):
+        """Test that invalid page sizes are rejected."""
+        with pytest.raises(QBenchValidationError):
+            qb_client._page_sizing(0)
+    
+    @pytest.mark.asyncio
+    async def test_fetch_page_retries_transient_errors(self, qb_client):
+        """Test that a page is retried after a transient server error."""
+        from aioresponses import aioresponses
+        
+        url = "https://test.qbench.net/qbench/api/v2/samples"
+        session = await qb_client._get_async_session()
+        
+        with aioresponses() as mocked:
+            mocked.get(f"{url}?page_num=2&page_size=50", status=503)
+            mocked.get(f"{url}?page_num=2&page_size=50", payload={'data': [{'id': 2}]})
+            
+            result = await qb_client._fetch_page(session, url, 2, {})
+        
+        assert result == {'data': [{'id': 2}]}
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_failed_page_raises_resumable_error(self, qb_client):
+        """Test that a failed page isn't dropped and the fetch can be resumed."""
+        from qbench.exceptions import QBenchPaginationError
+        fetched = []
+        failing = {3}
+        
+        async def flaky_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            fetched.append(page)
+            if page in failing:
+                raise QBenchConnectionError(f"page {page} failed")
+            return {'data': [{'id': page}], 'total_pages': 4}
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=flaky_fetch):
+            with pytest.raises(QBenchPaginationError) as exc_info:
+                await qb_client._get_entity_list('get_samples', status='active')
+            
+            checkpoint = exc_info.value.checkpoint
+            assert 3 not in checkpoint.completed_pages
+            assert {1, 2} <= checkpoint.completed_pages
+            
+            failing.clear()
+            fetched.clear()
+            result = await qb_client._get_entity_list(
+                'get_samples', status='active', checkpoint=checkpoint
+            )
+        
+        assert 1 not in fetched and 2 not in fetched
+        assert [entity['id'] for entity in result] == [1, 2, 3, 4]
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_max_items_caps_pages_fetched(self, qb_client):
+        """Test that max_items trims the result and only requests the pages it needs."""
+        fetched = []
+        
+        async def fake_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            fetched.append((page, page_size))
+            first = (page - 1) * page_size
+            return {
+                'data': [{'id': first + i + 1} for i in range(page_size)],
+                'total_pages': 100 // page_size
+            }
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=fake_fetch):
+            result = await qb_client._get_entity_list('get_samples', max_items=5, page_size=2)
+            assert [entity['id'] for entity in result] == [1, 2, 3, 4, 5]
+            assert sorted(fetched) == [(1, 2), (2, 2), (3, 2)]
+            
+            # A limit smaller than a page shrinks the only request
+            fetched.clear()
+            result = await qb_client._get_entity_list('get_samples', max_items=3)
+            assert len(result) == 3
+            assert fetched == [(1, 3)]
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_until_cancels_pages_in_flight(self, qb_client):
+        """Test that a satisfied predicate ends the stream and cancels prefetched pages."""
+        cancelled = []
+        
+        async def slow_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            try:
+                await asyncio.sleep(0.01 * page)
+            except asyncio.CancelledError:
+                cancelled.append(page)
+                raise
+            return {'data': [{'id': page * 2 - 1}, {'id': page * 2}], 'total_pages': 20}
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=slow_fetch):
+            ids = [
+                sample['id'] async for sample in qb_client.iter_samples(
+                    until=lambda sample: sample['id'] == 7, max_in_flight=5
+                )
+            ]
+            await asyncio.sleep(0)
+        
+        assert ids == [1, 2, 3, 4, 5, 6, 7]
+        assert cancelled and min(cancelled) > 4
+        await qb_client.aclose()
+    
+    def test_max_items_invalid(self, qb_client):
+        """Test that a non-positive max_items is rejected."""
+        with pytest.raises(QBenchValidationError):
+            qb_client.get_samples(max_items=0)
+        qb_client.close()
+    
+    def test_count_sync_single_request(self, qb_client):
+        """Test that count_<endpoint> makes one page_size=1 request."""
+        with patch.object(qb_client, '_make_request') as mock_request:
+            mock_request.return_value = {'data': [{'id': 1}], 'total_count': 101, 'total_pages': 101}
+            
+            result = qb_client.count_samples(status="Completed", page_size=25)
+        
+        assert result == {'total_count': 101, 'total_pages': 5}
+        method, endpoint_key, use_v1, params = mock_request.call_args[0][:4]
+        assert (method, endpoint_key) == ('GET', 'get_samples')
+        assert params == {'status': 'Completed', 'page_num': 1, 'page_size': 1}
+    
+    @pytest.mark.asyncio
+    async def test_count_retry_override(self, qb_client):
+        """Test that retry= reaches the count request, sync and async."""
+        from aioresponses import aioresponses
+        response = {'data': [], 'total_count': 3, 'total_pages': 3}
+        
+        with patch.object(qb_client, '_make_request', return_value=response) as mock_request:
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: qb_client.count_samples(retry=False)
+            )
+        assert mock_request.call_args.kwargs['retry'] is False
+        
+        url = "https://test.qbench.net/qbench/api/v2/samples?page_num=1&page_size=1"
+        with aioresponses() as mocked:
+            mocked.get(url, status=503)
+            mocked.get(url, payload=response)
+            with pytest.raises(QBenchAPIError):
+                await qb_client.count_samples(retry=False)
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_count_async(self, qb_client):
+        """Test count=True inside an event loop, including nested endpoints."""
+        from aioresponses import aioresponses
+        
+        with aioresponses() as mocked:
+            mocked.get(
+                "https://test.qbench.net/qbench/api/v2/orders/7/samples?page_num=1&page_size=1", 
+                payload={'data': [], 'total_count': 0, 'total_pages': 0}
+            )
+            
+            result = await qb_client.get_order_samples(7, count=True)
+        
+        assert result == {'total_count': 0, 'total_pages': 0}
+        await qb_client.aclose()
+    
+    def test_count_requires_paginated_endpoint_and_total(self, qb_client):
+        """Test count errors for non-paginated endpoints and missing totals."""
+        with pytest.raises(AttributeError):
+            qb_client.count_sample
+        with pytest.raises(QBenchValidationError):
+            qb_client.get_sample(1, count=True)
+        with patch.object(qb_client, '_make_request', return_value={'data': []}):
+            with pytest.raises(QBenchAPIError):
+                qb_client.count_samples()
+    
+    def test_fan_out_keyed_by_parent(self, qb_client):
+        """Test fetching a child list for many parents, keyed by parent ID."""
+        async def fake_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            order_id = int(url.split('/')[-2])
+            return {'data': [{'id': order_id * 10 + page}], 'total_pages': 2}
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=fake_fetch):
+            result = qb_client.fan_out('get_order_samples', ids=[3, 1, 2, 1])
+        
+        assert list(result) == [3, 1, 2]
+        assert result[3] == [{'id': 31}, {'id': 32}]
+        assert result[1] == [{'id': 11}, {'id': 12}]
+        qb_client.close()
+    
+    @pytest.mark.asyncio
+    async def test_fan_out_shares_request_budget(self, qb_client):
+        """Test that all parents' pages share one concurrency budget."""
+        in_flight = 0
+        peak = 0
+        
+        async def slow_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return {'data': [{'id': page}], 'total_pages': 4}
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=slow_fetch):
+            results = {
+                parent_id: entities async for parent_id, entities in qb_client.fan_out(
+                    'get_sample_tests', ids=list(range(20)), stream=True, max_concurrency=3
+                )
+            }
+        
+        assert len(results) == 20
+        assert all(len(entities) == 4 for entities in results.values())
+        assert peak == 3
+        await qb_client.aclose()
+    
+    def test_fan_out_requires_child_list(self, qb_client):
+        """Test that fan_out only accepts paginated endpoints under a parent ID."""
+        with pytest.raises(QBenchValidationError):
+            qb_client.fan_out('get_samples', ids=[1])
+        with pytest.raises(QBenchValidationError):
+            qb_client.fan_out('get_sample', ids=[1])
+    
+    def test_get_many_reports_missing_ids(self, qb_client, caplog):
+        """Test that get_many maps every requested ID and reports missing ones."""
+        requested = []
+        
+        async def fake_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            requested.append(list(params['ids']))
+            return {'data': [{'id': int(i)} for i in params['ids'] if int(i) != 4], 'total_pages': 1}
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=fake_fetch):
+            result = qb_client.get_many("sample", ["1", 2, 4, 2])
+        
+        assert requested == [["1", 2, 4]]
+        assert result == {"1": {'id': 1}, 2: {'id': 2}, 4: None}
+        assert "1 of 3 IDs not found in get_samples" in caplog.text
+        qb_client.close()
+    
+    @pytest.mark.asyncio
+    async def test_get_many_chunks_under_url_limit(self, qb_client):
+        """Test that long ID lists are split into concurrent chunks with short URLs."""
+        from qbench.api import MAX_URL_LENGTH, MAX_IDS_PER_REQUEST
+        ids = [10 ** 9 + i for i in range(1000)]
+        requested = []
+        
+        async def fake_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            requested.append(params['ids'])
+            query = '&'.join(f"ids={i}" for i in params['ids'])
+            assert len(f"{url}?{query}&page_num=1&page_size={page_size}") <= MAX_URL_LENGTH
+            return {'data': [{'id': i} for i in params['ids']], 'total_pages': 1}
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=fake_fetch):
+            result = await qb_client.get_many("batches", ids)
+        
+        assert 1 < len(requested) < 1000
+        assert all(len(chunk) <= MAX_IDS_PER_REQUEST for chunk in requested)
+        assert sorted(i for chunk in requested for i in chunk) == ids
+        assert all(result[i] == {'id': i} for i in ids)
+        await qb_client.aclose()
+    
+    def test_get_many_unsupported_resource(self, qb_client):
+        """Test that resources without an ids filter are rejected."""
+        with pytest.raises(QBenchValidationError):
+            qb_client.get_many("customer", [1, 2])
+    
+    def test_get_many_rejects_page_size(self, qb_client):
+        """Test that page_size is rejected cleanly rather than clashing with the chunk size."""
+        with patch.object(qb_client, '_get_entity_list') as mock_list:
+            with pytest.raises(QBenchValidationError):
+                qb_client.get_many("sample", [1, 2], page_size=10)
+        mock_list.assert_not_called()
+    
+    def test_response_cache_serves_repeat_gets(self, mock_auth):
+        """Test that cached GETs skip the network and writes are never cached."""
+        from qbench import ResponseCache
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", cache=True)
+        assert isinstance(client.cache, ResponseCache)
+        
+        with patch.object(client, '_make_request', return_value={'id': 5, 'name': 'Assay'}) as mock_request:
+            assert client.get_assay(5) == {'id': 5, 'name': 'Assay'}
+            assert client.get_assay(5) == {'id': 5, 'name': 'Assay'}
+            client.get_assay(6)
+            assert mock_request.call_count == 2
+            
+            client.create_assays(data={'name': 'New'})
+            client.create_assays(data={'name': 'New'})
+            assert mock_request.call_count == 4
+        
+        assert client.cache.stats()['hits'] == 1
+        client.close()
+    
+    @pytest.mark.asyncio
+    async def test_response_cache_async_and_paginated(self, mock_auth):
+        """Test caching of awaited calls and whole paginated lists."""
+        from qbench import ResponseCache
+        with patch('requests.Session'):
+            client = QBenchAPI(
+                "https://test.qbench.net", "key", "secret", 
+                cache=ResponseCache(endpoint_ttls={'get_samples': 0})
+            )
+        
+        with patch.object(client, '_make_request_async', return_value={'id': 5}) as mock_request:
+            await client.get_user(5)
+            await client.get_user(5)
+            assert mock_request.call_count == 1
+        
+        with patch.object(client, '_get_entity_list', return_value=[{'id': 1}]) as mock_list:
+            await client.get_customers(status='active')
+            await client.get_customers(status='active')
+            await client.get_customers(status='active', page_limit=1)
+            await client.get_samples()
+            await client.get_samples()
+            assert mock_list.call_count == 4
+        await client.aclose()
+    
+    def test_response_cache_applies_writes(self, mock_auth):
+        """Test that writes through the client keep cached GETs correct."""
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", cache=True)
+        
+        with patch.object(client, '_make_request') as mock_request:
+            mock_request.return_value = {'data': {'id': 7, 'status': 'Received'}}
+            client.get_sample(7)
+            mock_request.return_value = {'data': [{'id': 7, 'status': 'Completed'}]}
+            client.update_samples(data=[{'id': 7, 'status': 'Completed'}])
+            
+            assert client.get_sample(7) == {'id': 7, 'status': 'Completed'}
+            assert mock_request.call_count == 2
+            
+            mock_request.side_effect = QBenchConnectionError("timed out")
+            with pytest.raises(QBenchConnectionError):
+                client.delete_sample(7)
+        
+        assert len(client.cache) == 0
+        client.close()
+    
+    def test_not_found_cache_skips_repeat_lookups(self, mock_auth):
+        """Test that a remembered 404 is raised without a request until a create."""
+        from qbench import ResponseCache
+        with patch('requests.Session'):
+            client = QBenchAPI(
+                "https://test.qbench.net", "key", "secret", 
+                cache=ResponseCache(ttl=0, not_found_ttl=60)
+            )
+        
+        with patch.object(client, '_make_request') as mock_request:
+            mock_request.side_effect = QBenchAPIError("Resource not found", 404, {'message': 'gone'})
+            for _ in range(3):
+                with pytest.raises(QBenchAPIError) as exc_info:
+                    client.get_sample(42)
+                assert exc_info.value.status_code == 404
+                assert exc_info.value.response_data == {'message': 'gone'}
+            assert mock_request.call_count == 1
+            
+            mock_request.side_effect = None
+            mock_request.return_value = {'data': [{'id': 42}]}
+            client.create_samples(data=[{'order_id': 1}])
+            assert client.get_sample(42) == [{'id': 42}]
+            assert mock_request.call_count == 3
+        client.close()
+    
+    @pytest.mark.asyncio
+    async def test_disk_cache_revalidates_with_delta_query(self, mock_auth, tmp_path):
+        """Test that a cached list is refreshed with a last_updated query."""
+        from qbench import DiskCache
+        disk = DiskCache(str(tmp_path / "cache.db"), revalidate_after=0, overlap=0)
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", disk_cache=disk)
+        
+        responses = [
+            {'data': [{'id': 1, 'v': 1}, {'id': 2, 'v': 1}], 'total_count': 2},
+            [{'id': 2, 'v': 2}, {'id': 3, 'v': 1}],
+        ]
+        with patch.object(client, '_get_entity_list', side_effect=responses) as mock_list, \
+                patch('qbench.api.time.time', side_effect=[1000.0, 2000.0]):
+            assert await client.get_assays() == [{'id': 1, 'v': 1}, {'id': 2, 'v': 1}]
+            result = await client.get_assays(include_metadata=True)
+            
+            assert result == {
+                'total_count': 3, 
+                'data': [{'id': 1, 'v': 1}, {'id': 2, 'v': 2}, {'id': 3, 'v': 1}]
+            }
+            assert mock_list.call_args_list[0].kwargs['include_metadata'] is True
+            assert mock_list.call_args_list[1].kwargs['last_updated'] == 1000
+            
+            # Partial fetches bypass the disk cache
+            mock_list.side_effect = None
+            mock_list.return_value = [{'id': 1}]
+            assert await client.get_assays(page_limit=1) == [{'id': 1}]
+        await client.aclose()
+        disk.close()
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_revalidates_static_lists_by_count(self, mock_auth, tmp_path):
+        """Test that lists without a last_updated filter are checked by total_count."""
+        from qbench import DiskCache
+        disk = DiskCache(str(tmp_path / "cache.db"), revalidate_after=0, static_max_age=3600)
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", disk_cache=disk)
+
+        def listing(count):
+            return {'data': [{'id': i} for i in range(1, count + 1)], 'total_count': count}
+
+        with patch.object(client, '_get_entity_list', side_effect=[listing(2), listing(3)]) as mock_list, \
+                patch.object(client, '_count_entities', side_effect=[
+                    {'total_count': 2, 'total_pages': 1}, {'total_count': 3, 'total_pages': 1}
+                ]) as mock_count, \
+                patch('qbench.api.time.time', side_effect=[1000.0, 1100.0, 1200.0, 5000.0]):
+            assert await client.get_users() == [{'id': 1}, {'id': 2}]
+            # Same count: served from disk
+            assert await client.get_users() == [{'id': 1}, {'id': 2}]
+            assert mock_list.call_count == 1
+            # Count changed: fetched in full
+            assert await client.get_users() == [{'id': 1}, {'id': 2}, {'id': 3}]
+            assert mock_list.call_count == 2
+            assert mock_count.call_count == 2
+
+            # Past static_max_age the list is fetched in full without a count
+            mock_list.side_effect = [listing(2)]
+            assert await client.get_users() == [{'id': 1}, {'id': 2}]
+            assert mock_count.call_count == 2
+        await client.aclose()
+        disk.close()
+
+    def test_close_closes_own_disk_cache(self, mock_auth, tmp_path):
+        """Test that closing the client closes a disk cache it opened from a path."""
+        import sqlite3
+        with patch('requests.Session'):
+            client = QBenchAPI(
+                "https://test.qbench.net", "key", "secret",
+                disk_cache=str(tmp_path / "cache.db")
+            )
+        client.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            client.disk_cache.state("key")
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_gets_share_one_request(self, mock_auth):
+        """Test that concurrent identical GETs are coalesced and writes are not."""
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret")
+        
+        async def slow_request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return {'data': {'id': 123}}
+        
+        with patch.object(client, '_make_request_async', side_effect=slow_request) as mock_request:
+            results = await asyncio.gather(*(client.get_customer(123) for _ in range(5)))
+            assert mock_request.call_count == 1
+            assert results == [{'id': 123}] * 5
+            results[1]['id'] = 0
+            assert results[0] == {'id': 123}
+            
+            await asyncio.gather(client.get_customer(123), client.get_customer(124))
+            await asyncio.gather(*(client.delete_customer(1) for _ in range(2)))
+            assert mock_request.call_count == 5
+        
+        assert client._in_flight == {}
+        await client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_coalesced_request_survives_one_cancelled_caller(self, mock_auth):
+        """Test that cancelling one caller leaves the shared request running."""
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret")
+        
+        with patch.object(client, '_get_entity_list') as mock_list:
+            async def slow_list(*args, **kwargs):
+                await asyncio.sleep(0.02)
+                return [{'id': 1}]
+            mock_list.side_effect = slow_list
+            
+            first = asyncio.ensure_future(client.get_assays())
+            second = asyncio.ensure_future(client.get_assays())
+            await asyncio.sleep(0)
+            first.cancel()
+            
+            assert await second == [{'id': 1}]
+            assert first.cancelled()
+            assert mock_list.call_count == 1
+        await client.aclose()
+    
+    @staticmethod
+    def _keyset_fetch(ids, calls):
+        """Build a fake _fetch_page that serves ids by inclusive range start."""
+        async def fake_fetch(session, url, page, params, page_size=50, observe=None, retry=None):
+            calls.append(dict(params))
+            start = int(params.get('sample_id_range_start', 0))
+            matching = [i for i in ids if i >= start]
+            return {
+                'data': [{'id': i} for i in matching[:page_size]],
+                'total_count': len(matching)
+            }
+        return fake_fetch
+    
+    @pytest.mark.asyncio
+    async def test_keyset_scan_walks_id_ranges(self, qb_client):
+        """Test that a keyset scan moves the range start instead of page_num."""
+        ids = [3, 5, 8, 13, 21, 34, 55]
+        calls = []
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=self._keyset_fetch(ids, calls)):
+            result = await qb_client._get_entity_list(
+                'get_samples', keyset=True, page_size=3, status='active'
+            )
+        
+        assert [entity['id'] for entity in result] == ids
+        assert all(c['sort_by'] == 'id' and c['sort_order'] == 'ASC' for c in calls)
+        assert all(c['status'] == 'active' for c in calls)
+        assert 'sample_id_range_start' not in calls[0]
+        assert [c.get('sample_id_range_start') for c in calls[1:]] == [8, 21]
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_keyset_scan_no_duplicates_after_insert(self, qb_client):
+        """Test that rows inserted mid-scan don't duplicate or skip rows."""
+        ids = [1, 2, 3, 4, 5, 6]
+        calls = []
+        fetch = self._keyset_fetch(ids, calls)
+        
+        async def inserting_fetch(*args, **kwargs):
+            page = await fetch(*args, **kwargs)
+            if len(calls) == 1:
+                ids.insert(0, 0)  # Would shift every later page_num offset
+                ids.append(7)
+            return page
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=inserting_fetch):
+            result = await qb_client._get_entity_list('get_samples', keyset=True, page_size=2)
+        
+        assert [entity['id'] for entity in result] == [1, 2, 3, 4, 5, 6, 7]
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_keyset_scan_resumes_from_last_id(self, qb_client):
+        """Test that a failed keyset scan resumes after the last ID seen."""
+        from qbench.exceptions import QBenchPaginationError
+        ids = list(range(1, 8))
+        calls = []
+        fetch = self._keyset_fetch(ids, calls)
+        
+        async def flaky_fetch(*args, **kwargs):
+            if len(calls) == 2:
+                calls.append({})
+                raise QBenchConnectionError("connection reset")
+            return await fetch(*args, **kwargs)
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=flaky_fetch):
+            with pytest.raises(QBenchPaginationError) as exc_info:
+                await qb_client._get_entity_list('get_samples', keyset=True, page_size=3)
+            
+            checkpoint = exc_info.value.checkpoint
+            assert checkpoint.last_id == 5
+            
+            calls.clear()
+            result = await qb_client._get_entity_list(
+                'get_samples', keyset=True, page_size=3, checkpoint=checkpoint
+            )
+        
+        assert calls[0]['sample_id_range_start'] == 5
+        assert [entity['id'] for entity in result] == ids
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_keyset_scan_max_items(self, qb_client):
+        """Test that a keyset scan stops at max_items and records the last ID kept."""
+        from qbench import PaginationCheckpoint
+        checkpoint = PaginationCheckpoint()
+        calls = []
+        
+        with patch.object(qb_client, '_fetch_page', side_effect=self._keyset_fetch([3, 5, 8, 13, 21, 34], calls)):
+            result = await qb_client._get_entity_list(
+                'get_samples', keyset=True, page_size=3, max_items=4, checkpoint=checkpoint
+            )
+        
+        assert [entity['id'] for entity in result] == [3, 5, 8, 13]
+        assert checkpoint.last_id == 13
+        assert len(calls) == 2
+        await qb_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_keyset_scan_unsupported(self, qb_client):
+        """Test that keyset scans are rejected where they can't be stable."""
+        with pytest.raises(QBenchValidationError):
+            await qb_client._get_entity_list('get_customers', keyset=True)
+        with pytest.raises(QBenchValidationError):
+            await qb_client._get_entity_list('get_tests', keyset=True)
+        with pytest.raises(QBenchValidationError):
+            await qb_client._get_entity_list('get_samples', keyset=True, sort_by='date_created')
+        await qb_client.aclose()
+    
+    @staticmethod
+    def _sharded_fetch(ids, calls, exclusive_start=False):
+        """Build a fake class-level _fetch_page honouring sort, ID range and page_num."""
+        async def fake_fetch(self, session, url, page, params, page_size=50, observe=None, retry=None):
+            calls.append(dict(params, page_num=page, page_size=page_size))
+            start = int(params.get('sample_id_range_start', min(ids) - 1))
+            end = int(params.get('sample_id_range_end', max(ids)))
+            matching = sorted(
+                (i for i in ids if (start < i if exclusive_start else start <= i) and i <= end), 
+                reverse=params.get('sort_order') == 'DESC'
+            )
+            offset = (page - 1) * page_size
+            return {
+                'data': [{'id': i} for i in matching[offset:offset + page_size]],
+                'total_count': len(matching),
+                'total_pages': -(-len(matching) // page_size)
+            }
+        return fake_fetch
+    
+    def test_partitioned_scan_by_id_range(self, qb_client):
+        """Test that samples are split by ID range and merged in order without repeats."""
+        from concurrent.futures import ThreadPoolExecutor
+        ids = list(range(1, 41))
+        calls = []
+        
+        with patch.object(QBenchAPI, '_fetch_page', self._sharded_fetch(ids, calls)):
+            with ThreadPoolExecutor(3) as executor:
+                result = qb_client.partitioned_scan(
+                    'get_samples', shards=3, executor=executor, page_size=4
+                )
+        
+        assert [entity['id'] for entity in result] == ids
+        range_starts = {c['sample_id_range_start'] for c in calls if 'sample_id_range_start' in c}
+        # Shards start at 15 and 29, asked for from one below
+        assert range_starts == {14, 28}
+        qb_client.close()
+    
+    def test_partitioned_scan_keeps_boundary_ids_with_exclusive_start(self, qb_client):
+        """Test that IDs on shard boundaries survive a server with an exclusive range start."""
+        from concurrent.futures import ThreadPoolExecutor
+        ids = list(range(1, 41))
+        calls = []
+        
+        fake_fetch = self._sharded_fetch(ids, calls, exclusive_start=True)
+        with patch.object(QBenchAPI, '_fetch_page', fake_fetch):
+            with ThreadPoolExecutor(3) as executor:
+                result = qb_client.partitioned_scan(
+                    'get_samples', shards=3, executor=executor, page_size=4
+                )
+        
+        # 15 and 29 are the first IDs of the second and third shards
+        assert [entity['id'] for entity in result] == ids
+        qb_client.close()
+    
+    @pytest.mark.asyncio
+    async def test_partitioned_scan_by_page_blocks(self, qb_client):
+        """Test that endpoints without an ID filter are split into page blocks."""
+        from concurrent.futures import ThreadPoolExecutor
+        ids = list(range(1, 21))
+        calls = []
+        
+        with patch.object(QBenchAPI, '_fetch_page', self._sharded_fetch(ids, calls)):
+            with ThreadPoolExecutor(2) as executor:
+                entities = [
+                    entity async for entity in qb_client.partitioned_scan(
+                        'get_customers', shards=2, executor=executor, 
+                        stream=True, page_size=4
+                    )
+                ]
+        
+        assert sorted(entity['id'] for entity in entities) == ids
+        # Page 1 is read once to plan the shards, then every page once
+        assert sorted(c['page_num'] for c in calls) == [1, 1, 2, 3, 4, 5]
+        await qb_client.aclose()
+    
+    def test_partitioned_scan_in_spawned_processes(self):
+        """Test a scan on the default process pool, with real workers and requests."""
+        import json
+        import pickle
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlsplit
+        from qbench.api import _scan_shard
+        ids = list(range(1, 11))
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self._reply({'access_token': 'test_token', 'expires_in': 3600})
+            
+            def do_GET(self):
+                query = parse_qs(urlsplit(self.path).query)
+                page = int(query.get('page_num', ['1'])[0])
+                size = int(query.get('page_size', ['50'])[0])
+                self._reply({
+                    'data': [{'id': i} for i in ids[(page - 1) * size:page * size]],
+                    'total_count': len(ids),
+                    'total_pages': -(-len(ids) // size)
+                })
+            
+            def _reply(self, body):
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, *args):
+                pass
+        
+        assert pickle.loads(pickle.dumps(_scan_shard)) is _scan_shard
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = QBenchAPI(
+            f"http://127.0.0.1:{server.server_address[1]}", "key", "secret", lazy_auth=True
+        )
+        try:
+            result = client.partitioned_scan(
+                'get_customers', shards=2, processes=2, page_size=4
+            )
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+        
+        assert [entity['id'] for entity in result] == ids
+    
+    def test_partitioned_scan_non_paginated(self, qb_client):
+        """Test that non-paginated endpoints can't be partitioned."""
+        with pytest.raises(QBenchValidationError):
+            qb_client.partitioned_scan('get_sample')
+        qb_client.close()
+    
     # Add tests for missing path parameters edge case
     def test_make_request_invalid_path_params(self, qb_client):
         """Test dynamic method with invalid path parameters."""
@@ -691,6 +1815,95 @@ class TestQBenchAPI:
         assert "method" in info
         assert "v2" in info or "v1" in info
     
+    @pytest.mark.asyncio
+    async def test_rate_limit_applies_to_every_request_path(self, mock_auth):
+        """Test that sync, async and page requests all take a token."""
+        from aioresponses import aioresponses
+        from qbench import TokenBucket
+        bucket = TokenBucket(rate=1000, burst=1000)
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", rate_limit=bucket)
+        assert client.rate_limiter is bucket
+        
+        client._session.request.return_value.status_code = 200
+        client._session.request.return_value.json.return_value = {'id': 1}
+        client._make_request('GET', 'get_sample', path_params={'id': 1})
+        
+        with aioresponses() as mocked:
+            mocked.get("https://test.qbench.net/qbench/api/v2/customers/1", payload={'id': 1})
+            mocked.get(
+                "https://test.qbench.net/qbench/api/v2/assays?page_num=1&page_size=50", 
+                payload={'data': [{'id': 1}], 'total_pages': 1}
+            )
+            await client.get_customer(1)
+            await client.get_assays()
+        
+        assert bucket.stats()['acquired'] == 3
+        assert client._client_config['rate_limit'] == 1000
+        await client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_adaptive_concurrency_backs_off_on_429(self, mock_auth):
+        """Test that an auto concurrency limit shrinks when the server pushes back."""
+        from aioresponses import aioresponses
+        from qbench import AdaptiveConcurrency
+        with patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", concurrency_limit="auto")
+        assert isinstance(client.concurrency, AdaptiveConcurrency)
+        assert client._concurrency_limit == client.concurrency.max_limit
+        assert client._client_config['concurrency_limit'] == "auto"
+        initial = client.concurrency.limit
+        
+        with aioresponses() as mocked:
+            mocked.get("https://test.qbench.net/qbench/api/v2/customers/1", status=429)
+            with pytest.raises(QBenchAPIError):
+                await client.get_customer(1, retry=False)
+        
+        assert client.concurrency.limit == initial // 2
+        assert client.concurrency.stats()['in_flight'] == 0
+        await client.aclose()
+        
+        with patch('requests.Session'), pytest.raises(QBenchValidationError):
+            QBenchAPI("https://test.qbench.net", "key", "secret", concurrency_limit="fast")
+    
+    def test_lazy_auth_defers_token_fetch(self):
+        """Test that a lazy client fetches its token on the first request only."""
+        with patch.object(QBenchAuth, '_fetch_access_token') as mock_fetch, \
+                patch('requests.Session'):
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", lazy_auth=True)
+            mock_fetch.assert_not_called()
+            
+            def mint():
+                client._auth._access_token = "lazy_token"
+                client._auth._token_expiry = int(time.time()) + 3000
+            mock_fetch.side_effect = mint
+            
+            with patch.object(client._session, 'request') as mock_request:
+                mock_request.return_value.json.return_value = {'id': 1}
+                client.get_sample(1)
+            assert mock_fetch.call_count == 1
+            assert client.warmup() is client
+            assert mock_fetch.call_count == 1
+        client.close()
+    
+    @pytest.mark.asyncio
+    async def test_warmup_async_authenticates_without_blocking(self):
+        """Test that warmup in async code fetches the token over aiohttp."""
+        from aioresponses import aioresponses
+        with patch('requests.post') as mock_post:
+            client = QBenchAPI("https://test.qbench.net", "key", "secret", lazy_auth=True)
+            with aioresponses() as mocked:
+                mocked.post(
+                    "https://test.qbench.net/qbench/oauth2/v1/token", 
+                    payload={"access_token": "warm_token", "expires_in": 3600}
+                )
+                assert await client.warmup() is client
+            mock_post.assert_not_called()
+        
+        assert client._auth.is_authenticated()
+        assert client._auth.get_access_token() == "warm_token"
+        await client.aclose()
+    
     def test_auth_object_base_url(self):
         """Test that auth object stores base URL correctly."""
         # Create a real auth object (with mocked token fetch)
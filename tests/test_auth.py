@@ -1,9 +1,11 @@
 """Tests for QBench authentication module."""
 
+import asyncio
+import os
 import pytest
 import time
 from unittest.mock import Mock, patch, MagicMock
-from qbench.auth import QBenchAuth
+from qbench.auth import QBenchAuth, TokenStore
 from qbench.exceptions import QBenchAuthError, QBenchConnectionError
 
 
@@ -264,6 +266,220 @@ class TestQBenchAuth:
         
         assert "Connection error during authentication" in str(exc_info.value)
 
+    def test_concurrent_threads_share_one_refresh(self):
+        """Test that threads seeing an expired token trigger a single fetch."""
+        from concurrent.futures import ThreadPoolExecutor
+        with patch.object(QBenchAuth, '_fetch_access_token'):
+            auth = QBenchAuth("https://test.qbench.com", "test_key", "test_secret")
+        
+        def slow_fetch():
+            time.sleep(0.05)
+            auth._access_token = "fresh_token"
+            auth._token_expiry = int(time.time()) + 3000
+        
+        auth._access_token, auth._token_expiry = "old_token", 0
+        with patch.object(auth, '_fetch_access_token', side_effect=slow_fetch) as mock_fetch:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                tokens = list(pool.map(lambda _: auth.get_access_token(), range(8)))
+            assert tokens == ["fresh_token"] * 8
+            assert mock_fetch.call_count == 1
+            
+            # A 401 with a token someone already replaced doesn't refresh again
+            assert auth.refresh(stale_token="old_token") == "fresh_token"
+            assert mock_fetch.call_count == 1
+            auth.refresh(stale_token="fresh_token")
+            assert mock_fetch.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_share_one_async_refresh(self):
+        """Test that tasks share one aiohttp token request without blocking."""
+        from aioresponses import aioresponses
+        with patch.object(QBenchAuth, '_fetch_access_token'):
+            auth = QBenchAuth("https://test.qbench.com", "test_key", "test_secret")
+        
+        with aioresponses() as mocked, patch('requests.post') as mock_post:
+            mocked.post(
+                "https://test.qbench.com/qbench/oauth2/v1/token", 
+                payload={"access_token": "async_token"}
+            )
+            tokens = await asyncio.gather(*(auth.get_access_token_async() for _ in range(10)))
+            
+            assert tokens == ["async_token"] * 10
+            assert len(mocked.requests) == 1
+            mock_post.assert_not_called()
+        assert auth.is_authenticated()
+        assert auth._async_refreshes == {}
+    
+    @pytest.mark.asyncio
+    async def test_async_refresh_maps_http_errors(self):
+        """Test that a rejected async token request raises QBenchAuthError."""
+        from aioresponses import aioresponses
+        with patch.object(QBenchAuth, '_fetch_access_token'):
+            auth = QBenchAuth("https://test.qbench.com", "test_key", "test_secret")
+        
+        with aioresponses() as mocked:
+            mocked.post("https://test.qbench.com/qbench/oauth2/v1/token", status=401)
+            with pytest.raises(QBenchAuthError) as exc_info:
+                await auth.refresh_async()
+        assert "Invalid API credentials" in str(exc_info.value)
+    
+    @pytest.mark.asyncio
+    async def test_sync_and_async_refreshes_share_one_fetch(self):
+        """Test that a thread and a task refreshing at once fetch a single token."""
+        with patch.object(QBenchAuth, '_fetch_access_token'):
+            auth = QBenchAuth("https://test.qbench.com", "test_key", "test_secret")
+        fetches = []
+        
+        def slow_fetch():
+            time.sleep(0.1)
+            fetches.append('sync')
+            auth._access_token = f"token-{len(fetches)}"
+            auth._token_expiry = int(time.time()) + 3000
+        
+        async def slow_fetch_async(session=None):
+            await asyncio.sleep(0.1)
+            fetches.append('async')
+            return f"token-{len(fetches)}", int(time.time()) + 3000
+        
+        loop = asyncio.get_running_loop()
+        with patch.object(auth, '_fetch_access_token', side_effect=slow_fetch), \
+                patch.object(auth, '_fetch_access_token_async', side_effect=slow_fetch_async):
+            for first in ('async', 'sync'):
+                auth._access_token, auth._token_expiry = "old_token", 0
+                fetches.clear()
+                if first == 'async':
+                    task = asyncio.ensure_future(auth.refresh_async())
+                    await asyncio.sleep(0.02)
+                    thread_token = await loop.run_in_executor(None, auth.refresh)
+                    tokens = [await task, thread_token]
+                else:
+                    thread = loop.run_in_executor(None, auth.refresh)
+                    await asyncio.sleep(0.02)
+                    tokens = [await auth.refresh_async(), await thread]
+                
+                assert fetches == [first]
+                assert tokens == ["token-1", "token-1"]
+    
+    @patch('requests.post')
+    def test_expiry_follows_expires_in(self, mock_post):
+        """Test that the token lifetime comes from expires_in when present."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"access_token": "t", "expires_in": 600}
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+        
+        with patch('time.time', return_value=1000):
+            auth = QBenchAuth("https://test.qbench.com", "test_key", "test_secret")
+            assert auth._token_expiry == 1000 + 600 - 60
+            
+            mock_response.json.return_value = {"access_token": "t", "expires_in": 100}
+            auth._fetch_access_token()
+            assert auth._token_expiry == 1000 + 100 - 10
+            
+            mock_response.json.return_value = {"access_token": "t", "expires_in": "soon"}
+            auth._fetch_access_token()
+            assert auth._token_expiry == 1000 + 50 * 60
+    
+    def test_auto_refresh_replaces_token_before_expiry(self):
+        """Test that the background timer refreshes ahead of expiry."""
+        minted = []
+        
+        def fetch(auth):
+            minted.append(f"token-{len(minted) + 1}")
+            auth._access_token = minted[-1]
+            auth._token_expiry = int(time.time()) + 2
+        
+        with patch.object(QBenchAuth, '_fetch_access_token', autospec=True, side_effect=fetch):
+            auth = QBenchAuth(
+                "https://test.qbench.com", "test_key", "test_secret", 
+                auto_refresh=True, refresh_ahead=1.9
+            )
+            assert auth._refresh_timer.interval <= 1.0
+            deadline = time.time() + 3
+            while len(minted) < 2 and time.time() < deadline:
+                time.sleep(0.05)
+            auth.close()
+        
+        assert minted[:2] == ["token-1", "token-2"]
+        assert auth.get_access_token() in minted
+        assert auth._refresh_timer.finished.is_set()
+    
+    def test_auto_refresh_stops_when_auth_is_dropped(self):
+        """Test that a pending refresh doesn't keep a dropped auth object minting."""
+        import gc
+        import weakref
+        minted = []
+        
+        def fetch(auth):
+            minted.append(f"token-{len(minted) + 1}")
+            auth._access_token = minted[-1]
+            auth._token_expiry = int(time.time()) + 2
+        
+        # A plain function, as a mock would keep the auth object in its calls
+        with patch.object(QBenchAuth, '_fetch_access_token', fetch):
+            auth = QBenchAuth(
+                "https://test.qbench.com", "test_key", "test_secret", 
+                auto_refresh=True, refresh_ahead=1.9
+            )
+            timer = auth._refresh_timer
+            auth_ref = weakref.ref(auth)
+            del auth
+            gc.collect()
+            timer.join(3)
+        
+        assert auth_ref() is None
+        assert minted == ["token-1"]
+
+
+class TestTokenStore:
+    """Test cases for the shared TokenStore."""
+    
+    @staticmethod
+    def _minting_fetch(auth_tokens):
+        """Patch _fetch_access_token to mint numbered tokens."""
+        def fetch(auth):
+            auth_tokens.append(f"token-{len(auth_tokens) + 1}")
+            auth._access_token = auth_tokens[-1]
+            auth._token_expiry = int(time.time()) + 3000
+        return patch.object(QBenchAuth, '_fetch_access_token', autospec=True, side_effect=fetch)
+    
+    def test_processes_reuse_stored_token(self, tmp_path):
+        """Test that a second client reuses the token minted by the first."""
+        path = str(tmp_path / "tokens.db")
+        minted = []
+        with self._minting_fetch(minted):
+            first = QBenchAuth("https://test.qbench.com", "test_key", "test_secret", token_store=path)
+            second = QBenchAuth("https://test.qbench.com/", "test_key", "test_secret", token_store=TokenStore(path))
+            other = QBenchAuth("https://test.qbench.com", "other_key", "test_secret", token_store=path)
+        
+        assert first.get_access_token() == second.get_access_token() == "token-1"
+        assert other.get_access_token() == "token-2"
+        assert minted == ["token-1", "token-2"]
+        assert oct(os.stat(path).st_mode & 0o777) == oct(0o600)
+    
+    def test_refresh_replaces_only_stale_token(self, tmp_path):
+        """Test that a refresh mints once and later callers pick up its token."""
+        store = TokenStore(str(tmp_path / "tokens.db"))
+        key = TokenStore.make_key("https://test.qbench.com", "test_key")
+        fetch = Mock(side_effect=[("a", time.time() + 60), ("b", time.time() + 60)])
+        
+        assert store.get(key) is None
+        assert store.refresh(key, fetch)[0] == "a"
+        assert store.refresh(key, fetch)[0] == "a"
+        assert store.refresh(key, fetch, stale_token="a")[0] == "b"
+        assert store.refresh(key, fetch, stale_token="a")[0] == "b"
+        assert fetch.call_count == 2
+    
+    def test_failed_fetch_leaves_store_unchanged(self, tmp_path):
+        """Test that a failed mint rolls back and releases the lock."""
+        store = TokenStore(str(tmp_path / "tokens.db"), timeout=0.1)
+        key = TokenStore.make_key("https://test.qbench.com", "test_key")
+        
+        with pytest.raises(QBenchAuthError):
+            store.refresh(key, Mock(side_effect=QBenchAuthError("denied")))
+        assert store.get(key) is None
+        assert store.refresh(key, lambda: ("c", time.time() + 60))[0] == "c"
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
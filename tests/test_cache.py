@@ -0,0 +1,214 @@
+"""Tests for QBench response cache."""
+
+import pytest
+from unittest.mock import patch
+from qbench.cache import DiskCache, ResponseCache
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache class."""
+    
+    def test_key_ignores_parameter_order(self):
+        """Test that equivalent requests share a cache key."""
+        key_a = ResponseCache.make_key('get_samples', False, {}, {'a': 1, 'b': 2})
+        key_b = ResponseCache.make_key('get_samples', False, {}, {'b': 2, 'a': 1})
+        
+        assert key_a == key_b
+        assert key_a != ResponseCache.make_key('get_samples', True, {}, {'a': 1, 'b': 2})
+    
+    def test_hit_miss_and_stats(self):
+        """Test lookups and the statistics they produce."""
+        cache = ResponseCache()
+        key = ResponseCache.make_key('get_assay', False, {'id': 1}, {})
+        
+        assert cache.get(key) == (False, None)
+        cache.set(key, {'id': 1})
+        assert cache.get(key) == (True, {'id': 1})
+        
+        stats = cache.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        assert stats['size'] == 1 and stats['hit_rate'] == 0.5
+    
+    def test_entries_expire_per_endpoint_ttl(self):
+        """Test that each endpoint's TTL is applied."""
+        cache = ResponseCache(ttl=10, endpoint_ttls={'get_user': 100})
+        assay = ResponseCache.make_key('get_assay', False, {'id': 1}, {})
+        user = ResponseCache.make_key('get_user', False, {'id': 1}, {})
+        
+        with patch('qbench.cache.time.monotonic', return_value=1000.0):
+            cache.set(assay, 'assay')
+            cache.set(user, 'user')
+        with patch('qbench.cache.time.monotonic', return_value=1050.0):
+            assert cache.get(assay) == (False, None)
+            assert cache.get(user) == (True, 'user')
+    
+    def test_zero_ttl_disables_endpoint(self):
+        """Test that a TTL of 0 keeps an endpoint out of the cache."""
+        cache = ResponseCache(ttl=0, endpoint_ttls={'get_user': 60})
+        key = ResponseCache.make_key('get_sample', False, {'id': 1}, {})
+        cache.set(key, 'sample')
+        
+        assert not cache.caches('get_sample')
+        assert cache.caches('get_user')
+        assert len(cache) == 0
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResponseCache(max_size=2)
+        keys = [ResponseCache.make_key('get_assay', False, {'id': i}, {}) for i in range(3)]
+        cache.set(keys[0], 0)
+        cache.set(keys[1], 1)
+        cache.get(keys[0])  # 0 is now more recent than 1
+        cache.set(keys[2], 2)
+        
+        assert cache.get(keys[1]) == (False, None)
+        assert cache.get(keys[0]) == (True, 0)
+        assert cache.stats()['evictions'] == 1
+    
+    def test_values_are_copied(self):
+        """Test that modifying a returned value doesn't change the cache."""
+        cache = ResponseCache()
+        key = ResponseCache.make_key('get_assay', False, {'id': 1}, {})
+        value = {'tags': ['a']}
+        cache.set(key, value)
+        value['tags'].append('b')
+        
+        _, cached = cache.get(key)
+        cached['tags'].append('c')
+        
+        assert cache.get(key) == (True, {'tags': ['a']})
+    
+    def test_invalidate_endpoint(self):
+        """Test dropping one endpoint's entries."""
+        cache = ResponseCache()
+        cache.set(ResponseCache.make_key('get_assay', False, {'id': 1}, {}), 1)
+        cache.set(ResponseCache.make_key('get_user', False, {'id': 1}, {}), 1)
+        
+        assert cache.invalidate('get_assay') == 1
+        assert len(cache) == 1
+
+    
+    @staticmethod
+    def _primed_cache():
+        """Build a cache holding samples, a sample list and a customer."""
+        cache = ResponseCache()
+        key = ResponseCache.make_key
+        cache.set(key('get_sample', False, {'id': 1}, {'include_metadata': False}), {'id': 1, 'v': 1})
+        cache.set(key('get_sample', False, {'id': 2}, {'include_metadata': True}), {'data': {'id': 2, 'v': 1}})
+        cache.set(key('get_sample', False, {'id': 3}, {'include_metadata': False}), {'id': 3, 'v': 1})
+        cache.set(key('get_samples', False, {}, {'include_metadata': False, 'page_limit': None}), [])
+        cache.set(key('get_order_samples', False, {'id': 9}, {'include_metadata': False, 'page_limit': None}), [])
+        cache.set(key('get_customer', False, {'id': 1}, {'include_metadata': False}), {'id': 1})
+        return cache
+    
+    def test_write_updates_entities_in_place(self):
+        """Test that returned entities replace cached ones and lists are evicted."""
+        cache = self._primed_cache()
+        response = {'data': [{'id': 1, 'v': 2}, {'id': 2, 'v': 2}]}
+        
+        assert cache.apply_write('update_samples', False, {}, response) == (2, 2)
+        key = ResponseCache.make_key
+        assert cache.get(key('get_sample', False, {'id': 1}, {'include_metadata': False})) == (True, {'id': 1, 'v': 2})
+        assert cache.get(key('get_sample', False, {'id': 2}, {'include_metadata': True})) == (True, {'data': {'id': 2, 'v': 2}})
+        assert cache.get(key('get_sample', False, {'id': 3}, {'include_metadata': False}))[0]
+        assert not cache.get(key('get_samples', False, {}, {'include_metadata': False, 'page_limit': None}))[0]
+        assert cache.get(key('get_customer', False, {'id': 1}, {'include_metadata': False}))[0]
+    
+    def test_delete_evicts_only_that_entity(self):
+        """Test that a delete evicts its entity and the resource's lists."""
+        cache = self._primed_cache()
+        
+        assert cache.apply_write('delete_sample', False, {'id': 3}, {}) == (0, 3)
+        assert len(cache) == 3
+    
+    def test_unknown_write_outcome_evicts_resource(self):
+        """Test that a failed write evicts everything of the resource."""
+        cache = self._primed_cache()
+        
+        assert cache.apply_write('update_samples', False, {}, None) == (0, 5)
+        assert len(cache) == 1
+
+    def test_not_found_remembered_until_create(self):
+        """Test that 404s of single-entity GETs are kept until a create."""
+        cache = ResponseCache(ttl=0, not_found_ttl=30)
+        cache.set_not_found('get_sample', False, {'id': 9}, {'error': 'gone'})
+        cache.set_not_found('get_samples', False, {}, None)
+        cache.set_not_found('get_customer', False, {'id': 9}, None)
+        
+        assert cache.get_not_found('get_sample', False, {'id': 9}) == (True, {'error': 'gone'})
+        assert cache.get_not_found('get_sample', False, {'id': 8}) == (False, None)
+        assert cache.stats()['not_found'] == 2
+        stats = cache.stats()
+        assert (stats['not_found_hits'], stats['not_found_misses']) == (1, 1)
+        assert stats['hits'] == 0 and stats['hit_rate'] == 0.0
+        
+        cache.apply_write('update_samples', False, {}, None)
+        assert cache.get_not_found('get_sample', False, {'id': 9})[0]
+        cache.apply_write('create_samples', False, {}, {'data': [{'id': 10}]})
+        assert not cache.get_not_found('get_sample', False, {'id': 9})[0]
+        assert cache.get_not_found('get_customer', False, {'id': 9})[0]
+    
+    def test_not_found_expires_and_is_off_by_default(self):
+        """Test that remembered 404s expire and are not kept without a TTL."""
+        ResponseCache().set_not_found('get_sample', False, {'id': 9})
+        assert ResponseCache().get_not_found('get_sample', False, {'id': 9}) == (False, None)
+        
+        cache = ResponseCache(not_found_ttl=5)
+        with patch('qbench.cache.time.monotonic', return_value=100.0):
+            cache.set_not_found('get_sample', False, {'id': 9})
+        with patch('qbench.cache.time.monotonic', return_value=106.0):
+            assert not cache.get_not_found('get_sample', False, {'id': 9})[0]
+        assert len(cache._not_found) == 0
+
+
+class TestDiskCache:
+    """Test cases for DiskCache."""
+    
+    def test_replace_merge_and_reload(self, tmp_path):
+        """Test that deltas update entities in place and survive reopening."""
+        path = str(tmp_path / "cache.db")
+        cache = DiskCache(path, overlap=10)
+        key = DiskCache.make_key('get_assays', False, {}, {})
+        assert cache.state(key) is None
+        
+        cache.replace(key, 'get_assays', [{'id': 1, 'v': 1}, {'id': 2, 'v': 1}], {'total_count': 2}, 1000.0)
+        cache.merge(key, [{'id': 2, 'v': 2}, {'id': 3, 'v': 1}], 2000.0)
+        cache.close()
+        
+        reopened = DiskCache(path)
+        assert reopened.load(key) == (
+            [{'id': 1, 'v': 1}, {'id': 2, 'v': 2}, {'id': 3, 'v': 1}], {'total_count': 2}
+        )
+        assert reopened.state(key) == {'watermark': 1990.0, 'refreshed': 2000.0, 'full_refreshed': 1000.0}
+        reopened.close()
+    
+    def test_merge_skips_entities_without_id(self, tmp_path, caplog):
+        """Test that a delta's id-less entities do not overwrite one another."""
+        cache = DiskCache(str(tmp_path / "cache.db"))
+        key = DiskCache.make_key('get_assays', False, {}, {})
+        cache.replace(key, 'get_assays', [{'id': 1, 'v': 1}], {}, 1000.0)
+        
+        with caplog.at_level('WARNING', logger='qbench.cache'):
+            cache.merge(key, [{'v': 2}, {'v': 3}, {'id': 1, 'v': 2}], 2000.0)
+        
+        assert cache.load(key)[0] == [{'id': 1, 'v': 2}]
+        assert "Skipped 2 entities without an ID" in caplog.text
+        cache.close()
+    
+    def test_apply_write_drops_related_collections(self, tmp_path):
+        """Test that a write drops the collections of its resource only."""
+        cache = DiskCache(str(tmp_path / "cache.db"), endpoints=['get_assays', 'get_customers'])
+        assert cache.caches('get_assays') and not cache.caches('get_samples')
+        assays = DiskCache.make_key('get_assays', False, {}, {})
+        customers = DiskCache.make_key('get_customers', False, {}, {})
+        cache.replace(assays, 'get_assays', [{'id': 1}], {}, 1000.0)
+        cache.replace(customers, 'get_customers', [{'id': 1}], {}, 1000.0)
+        
+        assert cache.apply_write('create_assays') == 1
+        assert cache.state(assays) is None
+        assert cache.load(customers)[0] == [{'id': 1}]
+        cache.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,123 @@
+"""Tests for QBench circuit breaker."""
+
+import pickle
+import pytest
+from unittest.mock import patch
+from qbench.circuit import CircuitBreaker
+from qbench.exceptions import (
+    QBenchAPIError,
+    QBenchCircuitOpenError,
+    QBenchTimeoutError,
+    QBenchValidationError
+)
+
+KEY = "https://test.qbench.net"
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the threshold and then fails fast."""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+
+        with patch('qbench.circuit.time.monotonic', return_value=100.0):
+            for _ in range(3):
+                breaker.before_request(KEY)
+                breaker.record(KEY, QBenchTimeoutError("timeout"))
+
+            assert breaker.state(KEY) == 'open'
+            with pytest.raises(QBenchCircuitOpenError) as exc_info:
+                breaker.before_request(KEY)
+
+        assert exc_info.value.circuit == KEY
+        assert exc_info.value.retry_after == pytest.approx(10)
+        assert breaker.stats()[KEY]['trips'] == 1
+
+    def test_success_resets_failure_count(self):
+        """Test that only consecutive failures count towards opening."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record(KEY, QBenchAPIError("busy", 503))
+        breaker.record(KEY, QBenchAPIError("missing", 404))
+        breaker.record(KEY, QBenchAPIError("busy", 503))
+
+        assert breaker.state(KEY) == 'closed'
+        assert breaker.stats()[KEY]['failures'] == 1
+
+    def test_rate_limiting_is_not_a_failure(self):
+        """Test that 429s neither open nor close a circuit."""
+        breaker = CircuitBreaker(failure_threshold=1)
+
+        breaker.record(KEY, QBenchAPIError("slow down", 429))
+        assert breaker.stats() == {}
+
+    def test_half_open_allows_limited_probes(self):
+        """Test that after the recovery timeout only probe requests go through."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, half_open_max_calls=1)
+
+        with patch('qbench.circuit.time.monotonic', return_value=100.0):
+            breaker.record(KEY, QBenchTimeoutError("timeout"))
+        with patch('qbench.circuit.time.monotonic', return_value=111.0):
+            assert breaker.state(KEY) == 'half_open'
+            breaker.before_request(KEY)
+            with pytest.raises(QBenchCircuitOpenError):
+                breaker.before_request(KEY)
+
+            breaker.record(KEY)
+            assert breaker.state(KEY) == 'closed'
+            breaker.before_request(KEY)
+            breaker.before_request(KEY)
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing probe opens the circuit for another timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+
+        with patch('qbench.circuit.time.monotonic', return_value=100.0):
+            breaker.record(KEY, QBenchTimeoutError("timeout"))
+        with patch('qbench.circuit.time.monotonic', return_value=111.0):
+            breaker.before_request(KEY)
+            breaker.record(KEY, QBenchAPIError("down", 502))
+            assert breaker.state(KEY) == 'open'
+            with pytest.raises(QBenchCircuitOpenError):
+                breaker.before_request(KEY)
+
+        assert breaker.stats()[KEY]['trips'] == 2
+
+    def test_cancelled_probe_frees_its_slot(self):
+        """Test that a probe that ends without an answer lets another probe in."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+
+        with patch('qbench.circuit.time.monotonic', return_value=100.0):
+            breaker.record(KEY, QBenchTimeoutError("timeout"))
+        with patch('qbench.circuit.time.monotonic', return_value=111.0):
+            breaker.before_request(KEY)
+            breaker.record(KEY, KeyboardInterrupt())
+            breaker.before_request(KEY)
+            assert breaker.state(KEY) == 'half_open'
+
+    def test_keys(self):
+        """Test circuits per instance and per endpoint group."""
+        url = "https://test.qbench.net/qbench/api/v2/samples/12/tests"
+
+        assert CircuitBreaker().key_for(url) == KEY
+        assert CircuitBreaker(per_endpoint=True).key_for(url) == f"{KEY}/samples"
+
+    def test_pickles_settings_without_state(self):
+        """Test that a breaker sent to a worker process starts closed."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, per_endpoint=True)
+        breaker.record(KEY, QBenchTimeoutError("timeout"))
+
+        copy = pickle.loads(pickle.dumps(breaker))
+
+        assert copy.failure_threshold == 1
+        assert copy.recovery_timeout == 5
+        assert copy.per_endpoint
+        assert copy.state(KEY) == 'closed'
+
+    def test_invalid_settings(self):
+        """Test that invalid settings are rejected."""
+        with pytest.raises(QBenchValidationError):
+            CircuitBreaker(failure_threshold=0)
+        with pytest.raises(QBenchValidationError):
+            CircuitBreaker(recovery_timeout=0)
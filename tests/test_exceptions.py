@@ -70,3 +70,12 @@ class TestQBenchExceptions:
         for exc in exceptions:
             assert isinstance(exc, QBenchError)
             assert isinstance(exc, Exception)
+    
+    def test_api_error_pickles_with_status(self):
+        """Test that errors raised in worker processes keep their details."""
+        import pickle
+        error = pickle.loads(pickle.dumps(QBenchAPIError("Rate limited", 429, {"retry": 1})))
+        
+        assert error.status_code == 429
+        assert error.response_data == {"retry": 1}
+        assert str(error) == "HTTP 429: Rate limited"
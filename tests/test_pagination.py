@@ -0,0 +1,152 @@
+"""Tests for QBench pagination helpers."""
+
+import pytest
+from qbench.exceptions import QBenchValidationError
+from qbench.pagination import (
+    AdaptivePageSize, PaginationCheckpoint, split_id_range, split_page_range
+)
+
+
+class TestAdaptivePageSize:
+    """Test cases for AdaptivePageSize class."""
+    
+    def test_probes_with_max_size_first(self):
+        """Test that an unseen endpoint is probed with max_size."""
+        tuner = AdaptivePageSize(max_size=500)
+        
+        assert tuner.page_size('get_samples') == 500
+    
+    def test_record_first_page_detects_server_cap(self):
+        """Test that a short first page reveals the server's cap."""
+        tuner = AdaptivePageSize(max_size=500)
+        page = {'data': [{}] * 100, 'total_count': 1000}
+        
+        assert tuner.record_first_page('get_samples', 500, page) == 100
+        assert tuner.page_size('get_samples') == 100
+    
+    def test_record_first_page_small_collection(self):
+        """Test that a collection smaller than the page isn't mistaken for a cap."""
+        tuner = AdaptivePageSize(max_size=500)
+        page = {'data': [{}] * 7, 'total_count': 7}
+        
+        assert tuner.record_first_page('get_assays', 500, page) == 500
+    
+    def test_observe_shrinks_on_slow_or_heavy_pages(self):
+        """Test that slow or large pages halve the next scan's size."""
+        tuner = AdaptivePageSize(max_size=400, target_latency=1.0, max_payload_bytes=1000)
+        tuner.record_first_page('get_samples', 400, {'data': [], 'total_count': 0})
+        
+        tuner.observe('get_samples', 400, latency=3.0, payload_bytes=10)
+        assert tuner.page_size('get_samples') == 200
+        
+        # A fast page later in the same scan doesn't undo the shrink
+        tuner.observe('get_samples', 400, latency=0.1, payload_bytes=10)
+        assert tuner.page_size('get_samples') == 200
+        
+        tuner.observe('get_samples', 200, latency=0.1, payload_bytes=5000)
+        assert tuner.page_size('get_samples') == 100
+    
+    def test_observe_grows_up_to_limit(self):
+        """Test that fast, light pages double the size up to the learned limit."""
+        tuner = AdaptivePageSize(min_size=10, max_size=1000, target_latency=1.0)
+        tuner.record_first_page('get_samples', 1000, {'data': [{}] * 300, 'total_count': 5000})
+        tuner.observe('get_samples', 300, latency=5.0, payload_bytes=10)
+        assert tuner.page_size('get_samples') == 150
+        
+        tuner.observe('get_samples', 150, latency=0.1, payload_bytes=10)
+        assert tuner.page_size('get_samples') == 300
+        tuner.observe('get_samples', 300, latency=0.1, payload_bytes=10)
+        assert tuner.page_size('get_samples') == 300
+    
+    def test_probe_rejected_and_reset(self):
+        """Test fallback to initial_size and forgetting learned sizes."""
+        tuner = AdaptivePageSize(initial_size=50, max_size=1000)
+        
+        assert tuner.record_probe_rejected('get_tests') == 50
+        assert tuner.page_size('get_tests') == 50
+        
+        tuner.reset('get_tests')
+        assert tuner.page_size('get_tests') == 1000
+
+
+class TestPaginationCheckpoint:
+    """Test cases for PaginationCheckpoint class."""
+    
+    def test_bind_rejects_other_fetches(self):
+        """Test that a checkpoint can only resume the fetch it recorded."""
+        checkpoint = PaginationCheckpoint()
+        checkpoint.bind('get_samples', {'status': 'active'})
+        checkpoint.bind('get_samples', {'status': 'active'})
+        
+        with pytest.raises(QBenchValidationError):
+            checkpoint.bind('get_samples', {'status': 'pending'})
+        with pytest.raises(QBenchValidationError):
+            checkpoint.bind('get_orders', {'status': 'active'})
+    
+    def test_entities_in_page_order(self):
+        """Test that kept entities come back in page order."""
+        checkpoint = PaginationCheckpoint()
+        checkpoint.keep_results = True
+        checkpoint.mark_done(2, [{'id': 3}, {'id': 4}])
+        checkpoint.mark_done(1, [{'id': 1}, {'id': 2}])
+        
+        assert [e['id'] for e in checkpoint.entities()] == [1, 2, 3, 4]
+    
+    def test_streaming_keeps_only_page_numbers(self):
+        """Test that entities aren't kept unless collecting."""
+        checkpoint = PaginationCheckpoint()
+        checkpoint.mark_done(1, [{'id': 1}])
+        
+        assert checkpoint.is_done(1)
+        assert checkpoint.entities() == []
+    
+    def test_round_trip(self):
+        """Test serializing progress and restoring it."""
+        checkpoint = PaginationCheckpoint()
+        checkpoint.bind('get_samples', {'status': 'active'})
+        checkpoint.record_first_page({'data': [], 'total_pages': 9, 'total_count': 90}, 10)
+        checkpoint.mark_done(1)
+        checkpoint.mark_done(4)
+        
+        restored = PaginationCheckpoint.from_dict(checkpoint.to_dict())
+        
+        assert restored.started
+        assert restored.total_pages == 9
+        assert restored.page_size == 10
+        assert restored.completed_pages == {1, 4}
+        assert restored.metadata == {'total_pages': 9, 'total_count': 90}
+        restored.bind('get_samples', {'status': 'active'})
+    
+    def test_keyset_round_trip(self):
+        """Test that keyset progress survives serialization and keeps its mode."""
+        checkpoint = PaginationCheckpoint()
+        checkpoint.bind('get_samples', {}, mode='keyset')
+        checkpoint.last_id = 1234
+        
+        restored = PaginationCheckpoint.from_dict(checkpoint.to_dict())
+        
+        assert restored.last_id == 1234
+        restored.bind('get_samples', {}, mode='keyset')
+        with pytest.raises(QBenchValidationError):
+            restored.bind('get_samples', {})
+
+
+class TestShardSplitting:
+    """Test cases for partitioned scan shard helpers."""
+    
+    def test_split_id_range_covers_range_once(self):
+        """Test that ID shards are contiguous and cover every ID."""
+        bounds = split_id_range(3, 55, 4)
+        
+        assert bounds[0][0] == 3 and bounds[-1][1] == 56
+        assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+        assert len(bounds) == 4
+    
+    def test_split_id_range_fewer_ids_than_shards(self):
+        """Test that a tiny range isn't split into empty shards."""
+        assert split_id_range(5, 6, 8) == [(5, 6), (6, 7)]
+    
+    def test_split_page_range(self):
+        """Test that page blocks are balanced and in page order."""
+        assert split_page_range(10, 3) == [(1, 4), (5, 7), (8, 10)]
+        assert split_page_range(2, 5) == [(1, 1), (2, 2)]
@@ -0,0 +1,114 @@
+"""Tests for QBench retry policy."""
+
+import email.utils
+import time
+import pytest
+from unittest.mock import patch
+from qbench.exceptions import (
+    QBenchAPIError,
+    QBenchConnectionError,
+    QBenchTimeoutError,
+    QBenchValidationError,
+)
+from qbench.retry import RetryPolicy, parse_retry_after
+
+
+class TestParseRetryAfter:
+    """Test cases for parse_retry_after."""
+
+    def test_delay_seconds(self):
+        """Test that a delay in seconds is returned as is."""
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(" 1.5 ") == 1.5
+
+    def test_http_date(self):
+        """Test that an HTTP date is turned into seconds from now."""
+        when = email.utils.formatdate(time.time() + 30, usegmt=True)
+        assert parse_retry_after(when) == pytest.approx(30, abs=2)
+
+    def test_past_date_and_garbage(self):
+        """Test that past dates don't wait and unparseable values are ignored."""
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    def test_retries_transient_errors_of_idempotent_methods(self):
+        """Test which errors and methods are retried by default."""
+        policy = RetryPolicy()
+
+        assert policy.is_retryable("GET", QBenchTimeoutError("timeout"))
+        assert policy.is_retryable("DELETE", QBenchConnectionError("refused"))
+        assert policy.is_retryable("PUT", QBenchAPIError("busy", 503))
+        assert policy.is_retryable("GET", QBenchAPIError("slow down", 429))
+        assert not policy.is_retryable("GET", QBenchAPIError("missing", 404))
+        assert not policy.is_retryable("POST", QBenchTimeoutError("timeout"))
+        assert not policy.is_retryable("PATCH", QBenchAPIError("busy", 503))
+
+    def test_resolve_overrides(self):
+        """Test the per-call override forms."""
+        policy = RetryPolicy(max_attempts=4)
+        custom = RetryPolicy(max_attempts=2)
+
+        assert policy.resolve(None) is policy
+        assert policy.resolve(custom) is custom
+        assert policy.resolve(False).max_attempts == 1
+        assert policy.resolve(3).max_attempts == 3
+        assert policy.resolve(True).retry_non_idempotent
+        assert policy.resolve(True).max_attempts == 4
+        assert policy.resolve(True).is_retryable("POST", QBenchTimeoutError("timeout"))
+
+    def test_invalid_attempts(self):
+        """Test that a policy needs at least one attempt."""
+        with pytest.raises(QBenchValidationError):
+            RetryPolicy(max_attempts=0)
+
+    def test_delay_uses_full_jitter(self):
+        """Test that backoff is random up to a doubling, capped ceiling."""
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+
+        with patch(
+            "qbench.retry.random.uniform", side_effect=lambda low, high: high
+        ) as mock_uniform:
+            assert [policy.delay(attempt) for attempt in (1, 2, 3, 4)] == [
+                1.0,
+                2.0,
+                4.0,
+                5.0,
+            ]
+        assert all(call.args[0] == 0 for call in mock_uniform.call_args_list)
+
+    def test_delay_honours_retry_after(self):
+        """Test that Retry-After sets the wait, up to max_retry_after."""
+        policy = RetryPolicy(max_retry_after=60)
+
+        assert policy.delay(1, QBenchAPIError("slow down", 429, retry_after=12)) == 12
+        assert policy.delay(1, QBenchAPIError("slow down", 429, retry_after=600)) == 60
+
+    def test_retrying_stops_after_max_attempts(self):
+        """Test that the sync retrier re-raises the last error."""
+        policy = RetryPolicy(max_attempts=3, backoff_base=0)
+        calls = []
+
+        with pytest.raises(QBenchTimeoutError):
+            for attempt in policy.retrying("GET"):
+                with attempt:
+                    calls.append(1)
+                    raise QBenchTimeoutError("timeout")
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_async_retrying_succeeds_after_transient_error(self):
+        """Test that the async retrier repeats a request until it succeeds."""
+        policy = RetryPolicy(backoff_base=0)
+        calls = []
+
+        async for attempt in policy.async_retrying("GET"):
+            with attempt:
+                calls.append(1)
+                if len(calls) < 2:
+                    raise QBenchAPIError("busy", 502)
+        assert len(calls) == 2
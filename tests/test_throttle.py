@@ -0,0 +1,156 @@
+"""Tests for QBench request throttling."""
+
+import asyncio
+import pytest
+import threading
+from unittest.mock import patch
+from qbench.exceptions import QBenchValidationError
+from qbench.throttle import AdaptiveConcurrency, TokenBucket
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_paced(self):
+        """Test that a full bucket allows a burst and then paces requests."""
+        with patch("qbench.throttle.time.monotonic", return_value=100.0), patch(
+            "qbench.throttle.time.sleep"
+        ) as mock_sleep:
+            bucket = TokenBucket(rate=10, burst=3)
+            waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3:] == pytest.approx([0.1, 0.2])
+        assert [call.args[0] for call in mock_sleep.call_args_list] == pytest.approx(
+            [0.1, 0.2]
+        )
+        assert bucket.stats()["acquired"] == 5
+
+    def test_refills_over_time(self):
+        """Test that tokens refill at the configured rate, up to the burst size."""
+        with patch(
+            "qbench.throttle.time.monotonic",
+            side_effect=[0.0, 0.0, 0.0, 0.0, 0.5, 100.0, 100.0, 100.0],
+        ), patch("qbench.throttle.time.sleep"):
+            bucket = TokenBucket(rate=2, burst=2)
+            assert bucket.acquire() == 0.0
+            assert bucket.acquire() == 0.0
+            assert bucket.acquire() == pytest.approx(0.5)
+            # Waited for its reserved token, so the bucket is empty again
+            assert bucket.acquire() == pytest.approx(0.5)
+            # A long pause refills only up to the burst
+            assert bucket.acquire() == 0.0
+            assert bucket.acquire() == 0.0
+            assert bucket.acquire() == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_async_and_threads_share_one_quota(self):
+        """Test that sync threads and tasks draw from the same bucket."""
+        bucket = TokenBucket(rate=200, burst=1)
+        thread = threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)])
+        thread.start()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+        thread.join()
+
+        stats = bucket.stats()
+        assert stats["acquired"] == 10
+        assert stats["waited"] > 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_returns_its_token(self):
+        """Test that a task cancelled while waiting gives its token back."""
+        bucket = TokenBucket(rate=1, burst=1)
+        await bucket.acquire_async()
+        waiter = asyncio.ensure_future(bucket.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert bucket.stats()["acquired"] == 1
+
+    def test_rejects_non_positive_rate(self):
+        """Test that the rate and burst must be positive."""
+        with pytest.raises(QBenchValidationError):
+            TokenBucket(rate=0)
+        with pytest.raises(QBenchValidationError):
+            TokenBucket(rate=5, burst=0)
+
+
+class TestAdaptiveConcurrency:
+    """Test cases for AdaptiveConcurrency."""
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """Test that healthy requests grow the limit and overload halves it."""
+        limiter = AdaptiveConcurrency(initial_limit=4, min_limit=1, max_limit=6)
+        with patch("qbench.throttle.time.monotonic", return_value=100.0):
+            for _ in range(8):
+                limiter._in_flight += 1
+                limiter.release(0.1)
+            assert limiter.limit == 5
+
+            limiter._in_flight += 1
+            limiter.release(0.1, overloaded=True)
+            assert limiter.limit == 2
+
+            # A request sent before that cut doesn't cut again
+            limiter._in_flight += 1
+            limiter.release(0.5, overloaded=True)
+            assert limiter.limit == 2
+
+        with patch("qbench.throttle.time.monotonic", return_value=200.0):
+            for _ in range(100):
+                limiter._in_flight += 1
+                limiter.release(0.1)
+        assert limiter.limit == 6
+        assert limiter.stats()["cuts"] == 1
+
+    def test_latency_spike_counts_as_overload(self):
+        """Test that latency far above the best seen shrinks the limit."""
+        limiter = AdaptiveConcurrency(initial_limit=8, latency_tolerance=2.0)
+        with patch("qbench.throttle.time.monotonic", return_value=100.0):
+            limiter._in_flight = 3
+            limiter.release(0.2)
+            limiter.release(0.3)
+            assert limiter.limit == 8
+            limiter.release(1.0)
+        assert limiter.limit == 4
+        assert limiter.stats()["baseline_latency"] == pytest.approx(0.201)
+
+    @pytest.mark.asyncio
+    async def test_waiters_get_slots_in_order(self):
+        """Test that requests beyond the limit wait for a released slot."""
+        limiter = AdaptiveConcurrency(initial_limit=1, max_limit=1)
+        order = []
+
+        async def request(name):
+            await limiter.acquire()
+            order.append(name)
+            await asyncio.sleep(0.01)
+            limiter.release(0.01)
+
+        await asyncio.gather(*(request(i) for i in range(4)))
+        assert order == [0, 1, 2, 3]
+        assert limiter.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_no_slot_taken(self):
+        """Test that cancelling a waiting request doesn't leak a slot."""
+        limiter = AdaptiveConcurrency(initial_limit=1, max_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter.release(0.01)
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.stats()["in_flight"] == 0
+        await asyncio.wait_for(limiter.acquire(), 1)
+
+    def test_rejects_inconsistent_limits(self):
+        """Test that the initial limit must lie within the bounds."""
+        with pytest.raises(QBenchValidationError):
+            AdaptiveConcurrency(initial_limit=10, max_limit=5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])